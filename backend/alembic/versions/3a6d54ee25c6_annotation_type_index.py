@@ -0,0 +1,32 @@
+"""annotation type index
+
+Revision ID: 3a6d54ee25c6
+Revises: 404fded62571
+Create Date: 2026-10-18 20:45:54.683668
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3a6d54ee25c6'
+down_revision: Union[str, None] = '404fded62571'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The annotation list filters on the type
+    with op.batch_alter_table('annotation', schema=None) as batch_op:
+        batch_op.create_index('ix_annotation_annotation_type', ['annotation_type'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('annotation', schema=None) as batch_op:
+        batch_op.drop_index('ix_annotation_annotation_type')
@@ -0,0 +1,32 @@
+"""scale plan type label index
+
+Revision ID: 404fded62571
+Revises: f6a2c8e4d1b9
+Create Date: 2026-10-18 20:47:35.477705
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = '404fded62571'
+down_revision: Union[str, None] = 'f6a2c8e4d1b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The summaries' entry plan is the first by label; with id last, no sort
+    with op.batch_alter_table('scale_plan', schema=None) as batch_op:
+        batch_op.create_index('ix_scale_plan_trade_id_plan_type_label', ['trade_id', 'plan_type', 'label', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('scale_plan', schema=None) as batch_op:
+        batch_op.drop_index('ix_scale_plan_trade_id_plan_type_label')
@@ -0,0 +1,58 @@
+"""composite indexes
+
+Revision ID: b7d3e9a05c14
+Revises: e4a1f6c2b8d5
+Create Date: 2026-10-18 16:03:27.518842
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d3e9a05c14'
+down_revision: Union[str, None] = 'e4a1f6c2b8d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('trade', schema=None) as batch_op:
+        batch_op.create_index('ix_trade_enter_date_id', ['enter_date', 'id'], unique=False)
+        batch_op.create_index('ix_trade_status_enter_date_id', ['status', 'enter_date', 'id'], unique=False)
+
+    with op.batch_alter_table('annotation', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_annotation_trade_id'), ['trade_id'], unique=False)
+
+    # The composites lead with trade_id, so the single-column indexes are redundant
+    with op.batch_alter_table('scale_plan', schema=None) as batch_op:
+        batch_op.create_index('ix_scale_plan_trade_id_status_label', ['trade_id', 'status', 'label'], unique=False)
+        batch_op.drop_index(batch_op.f('ix_scale_plan_trade_id'))
+
+    with op.batch_alter_table('trade_execution', schema=None) as batch_op:
+        batch_op.create_index('ix_trade_execution_trade_id_executed_at', ['trade_id', 'executed_at'], unique=False)
+        batch_op.create_index(batch_op.f('ix_trade_execution_scale_plan_id'), ['scale_plan_id'], unique=False)
+        batch_op.drop_index(batch_op.f('ix_trade_execution_trade_id'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('trade_execution', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_trade_execution_trade_id'), ['trade_id'], unique=False)
+        batch_op.drop_index(batch_op.f('ix_trade_execution_scale_plan_id'))
+        batch_op.drop_index('ix_trade_execution_trade_id_executed_at')
+
+    with op.batch_alter_table('scale_plan', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_scale_plan_trade_id'), ['trade_id'], unique=False)
+        batch_op.drop_index('ix_scale_plan_trade_id_status_label')
+
+    with op.batch_alter_table('annotation', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_annotation_trade_id'))
+
+    with op.batch_alter_table('trade', schema=None) as batch_op:
+        batch_op.drop_index('ix_trade_status_enter_date_id')
+        batch_op.drop_index('ix_trade_enter_date_id')
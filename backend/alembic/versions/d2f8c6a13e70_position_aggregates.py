@@ -0,0 +1,118 @@
+"""position aggregates
+
+Revision ID: d2f8c6a13e70
+Revises: b7d3e9a05c14
+Create Date: 2026-10-18 17:20:51.904377
+
+Existing executions are replayed in fill order to fill in each trade's
+position, the same way `python -m domain.execution.execution_aggregates`
+repairs them.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from database.models import Side
+from database.types import UtcDateTime
+from domain.execution.execution_aggregates import REPLAY_BATCH, Position
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2f8c6a13e70'
+down_revision: Union[str, None] = 'b7d3e9a05c14'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+_execution = sa.table(
+    'trade_execution',
+    sa.column('id', sa.String),
+    sa.column('trade_id', sa.String),
+    sa.column('side', sa.Enum(Side)),
+    sa.column('qty', sa.Float),
+    sa.column('price', sa.Float),
+    sa.column('commission', sa.Float),
+    sa.column('executed_at', UtcDateTime),
+)
+_trade = sa.table(
+    'trade',
+    sa.column('id', sa.String),
+    sa.column('net_qty', sa.Float),
+    sa.column('avg_entry_price', sa.Float),
+    sa.column('realized_pnl', sa.Float),
+    sa.column('last_executed_at', UtcDateTime),
+)
+
+
+def _replay_positions(bind) -> None:
+    """Store each trade's position, replaying its executions in fill order."""
+    e = _execution.c
+    trade_ids = bind.execute(
+        sa.select(e.trade_id).distinct().order_by(e.trade_id)
+    ).scalars().all()
+    positions: dict[str, Position] = {}
+    # A batch of trades at a time: a server-side cursor left open by
+    # yield_per would block the DDL of later revisions on PostgreSQL
+    for i in range(0, len(trade_ids), REPLAY_BATCH):
+        rows = bind.execute(
+            sa.select(e.trade_id, e.side, e.qty, e.price, e.commission, e.executed_at)
+            .where(e.trade_id.in_(trade_ids[i : i + REPLAY_BATCH]))
+            .order_by(e.trade_id, e.executed_at, e.id)
+        )
+        for trade_id, *fill in rows:
+            positions.setdefault(trade_id, Position()).fill(*fill)
+    if not positions:
+        return
+    bind.execute(
+        _trade.update()
+        .where(_trade.c.id == sa.bindparam('trade_id'))
+        .values(
+            net_qty=sa.bindparam('net_qty'),
+            avg_entry_price=sa.bindparam('avg_entry_price'),
+            realized_pnl=sa.bindparam('realized_pnl'),
+            last_executed_at=sa.bindparam('last_executed_at'),
+        ),
+        [
+            {
+                'trade_id': trade_id,
+                'net_qty': position.net_qty,
+                'avg_entry_price': position.avg_entry_price,
+                'realized_pnl': position.realized_pnl,
+                'last_executed_at': position.last_executed_at,
+            }
+            for trade_id, position in positions.items()
+        ],
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('scale_plan', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('filled_qty', sa.Float(), nullable=False, server_default='0'))
+
+    with op.batch_alter_table('trade', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('net_qty', sa.Float(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('avg_entry_price', sa.Float(), nullable=True))
+        batch_op.add_column(sa.Column('realized_pnl', sa.Float(), nullable=False, server_default='0'))
+        batch_op.add_column(sa.Column('last_executed_at', sa.DateTime(timezone=True), nullable=True))
+
+    op.execute(
+        "UPDATE scale_plan SET filled_qty = COALESCE(("
+        "SELECT SUM(qty) FROM trade_execution"
+        " WHERE trade_execution.scale_plan_id = scale_plan.id), 0)"
+    )
+    _replay_positions(op.get_bind())
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('trade', schema=None) as batch_op:
+        batch_op.drop_column('last_executed_at')
+        batch_op.drop_column('realized_pnl')
+        batch_op.drop_column('avg_entry_price')
+        batch_op.drop_column('net_qty')
+
+    with op.batch_alter_table('scale_plan', schema=None) as batch_op:
+        batch_op.drop_column('filled_qty')
@@ -0,0 +1,52 @@
+"""timestamps with time zone
+
+Revision ID: e4a1f6c2b8d5
+Revises: c81d5e7a2f93
+Create Date: 2026-10-18 15:12:44.209318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e4a1f6c2b8d5'
+down_revision: Union[str, None] = 'c81d5e7a2f93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Stored values are UTC wall-clock times
+TIMESTAMP_COLUMNS = {
+    'trade': ('idea_date', 'enter_date', 'exit_date'),
+    'annotation': ('date',),
+    'scale_plan': ('good_till',),
+    'trade_execution': ('executed_at',),
+    'company_profile': ('refreshed_at',),
+}
+
+
+def _alter(timezone: bool) -> None:
+    # SQLite keeps the same text either way; only PostgreSQL has a distinct type
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    for table, columns in TIMESTAMP_COLUMNS.items():
+        for column in columns:
+            op.alter_column(
+                table,
+                column,
+                type_=sa.DateTime(timezone=timezone),
+                postgresql_using=f"\"{column}\" AT TIME ZONE 'UTC'",
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    _alter(timezone=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    _alter(timezone=False)
@@ -0,0 +1,34 @@
+"""execution fill order index
+
+Revision ID: f6a2c8e4d1b9
+Revises: d2f8c6a13e70
+Create Date: 2026-10-18 20:41:09.215306
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6a2c8e4d1b9'
+down_revision: Union[str, None] = 'd2f8c6a13e70'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # With id last, replaying fills in (trade_id, executed_at, id) order needs no sort
+    with op.batch_alter_table('trade_execution', schema=None) as batch_op:
+        batch_op.create_index('ix_trade_execution_fill_order', ['trade_id', 'executed_at', 'id'], unique=False)
+        batch_op.drop_index('ix_trade_execution_trade_id_executed_at')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('trade_execution', schema=None) as batch_op:
+        batch_op.create_index('ix_trade_execution_trade_id_executed_at', ['trade_id', 'executed_at'], unique=False)
+        batch_op.drop_index('ix_trade_execution_fill_order')
@@ -0,0 +1,286 @@
+"""Repository parity and concurrent write throughput, SQLite against PostgreSQL.
+
+Seeds the same trades into a fresh SQLite file and into the database at
+`--url` (default `DATABASE_URL`), runs the repositories' list, page,
+summary and candle upsert queries on both and fails if any result differs.
+Then writers record executions concurrently for `--seconds` on each backend.
+The PostgreSQL schema is dropped and recreated, so point it at a scratch
+database. The parity checks also run in the test suite (tests/test_db_parity.py)
+when TEST_POSTGRES_URL is set. Usage:
+
+    python -m benchmarks.db_parity --url postgresql://localhost/trading_parity
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database.db import (
+    database_url,
+    is_sqlite,
+    make_engine,
+    pool_options,
+    sqlite_pragmas,
+)
+from database.models import (
+    Annotation,
+    AnnotationType,
+    PlanType,
+    ScalePlan,
+    Side,
+    Trade,
+    TradeExecution,
+    TradeStatus,
+)
+from domain.candle.candle_repo import CandleRepo
+from domain.trade.trade_repo import TradeCursor, TradeRepo
+from domain.trade.trade_schema import TradeFilter
+from domain.trade.trade_service import _validate_trade
+
+EPOCH = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+FILTERS = {
+    "all": TradeFilter(),
+    "open": TradeFilter(status=[TradeStatus.OPEN]),
+    "symbol": TradeFilter(symbol="sym003"),
+    "entered": TradeFilter(
+        entered_from=EPOCH + timedelta(days=10),
+        entered_to=EPOCH + timedelta(days=40),
+    ),
+    "rating": TradeFilter(min_rating=2, max_rating=4),
+}
+
+
+def build_trades(count: int) -> list[Trade]:
+    rng = random.Random(7)
+    statuses = list(TradeStatus)
+    trades = []
+    for i in range(count):
+        trade = Trade(
+            id=f"trade-{i:05d}",
+            symbol=f"SYM{i % 20:03d}",
+            setup="parity",
+            rating=rng.randint(1, 5),
+            status=statuses[i % len(statuses)],
+            idea_date=EPOCH + timedelta(hours=i),
+            # Every fifth trade was never entered; some share an entry time
+            enter_date=None if i % 5 == 0 else EPOCH + timedelta(days=i // 3),
+        )
+        entry = ScalePlan(
+            id=f"plan-{i:05d}-e",
+            plan_type=PlanType.ENTRY,
+            qty=10,
+            limit_price=100 + i % 9,
+            stop_price=95 + i % 9,
+        )
+        trade.scale_plans.extend(
+            [
+                entry,
+                ScalePlan(
+                    id=f"plan-{i:05d}-t",
+                    plan_type=PlanType.TARGET,
+                    qty=10,
+                    target_price=110 + i % 13,
+                ),
+            ]
+        )
+        trade.executions.append(
+            TradeExecution(
+                id=f"exec-{i:05d}",
+                scale_plan=entry,
+                side=Side.BUY,
+                qty=10,
+                price=100.25,
+                executed_at=EPOCH + timedelta(minutes=i),
+            )
+        )
+        trade.annotations.append(
+            Annotation(
+                id=f"note-{i:05d}",
+                content="parity",
+                annotation_type=AnnotationType.note,
+                date=EPOCH,
+            )
+        )
+        trades.append(trade)
+    return trades
+
+
+def _normalize(value):
+    """Order-insensitive, float-tolerant form of a query result."""
+    if isinstance(value, dict):
+        return {key: _normalize(item) for key, item in value.items()}
+    if isinstance(value, list):
+        items = [_normalize(item) for item in value]
+        if items and all(isinstance(item, dict) and "id" in item for item in items):
+            items.sort(key=lambda item: item["id"])
+        return items
+    if isinstance(value, float):
+        return round(value, 9)
+    return value
+
+
+async def snapshot(factory, trades: int) -> dict:
+    """Results of the repositories' read paths, as plain JSON-able data."""
+    result = {}
+    async with factory() as session:
+        repo = TradeRepo(session)
+        for name, filters in FILTERS.items():
+            pages, after = [], None
+            while True:
+                ids = await repo.get_trade_ids(filters, after=after, limit=25)
+                if not ids:
+                    break
+                pages.append(ids)
+                last = await session.get(Trade, ids[-1])
+                after = TradeCursor.after(last)
+            result[f"pages:{name}"] = pages
+
+        ids = [f"trade-{i:05d}" for i in range(0, trades, 7)]
+        loaded = await repo.get_trades_by_ids(ids)
+        result["trades"] = _normalize(
+            [_validate_trade(trade).model_dump(mode="json") for trade in loaded]
+        )
+        summaries = await repo.get_trade_summaries(ids)
+        result["summaries"] = _normalize(
+            [
+                {key: _jsonable(value) for key, value in row._asdict().items()}
+                for row in summaries
+            ]
+        )
+
+        candles = CandleRepo(session)
+        start = int(EPOCH.timestamp())
+        bars = [(start + i * 60, 1.0, 2.0, 0.5, 1.5, 100.0) for i in range(50)]
+        await candles.save_bars("SYM000", "1m", bars, [(start, start + 3000)])
+        # The second save overlaps and must update rows in place
+        bars = [(start + i * 60, 1.0, 3.0, 0.5, 2.5, 200.0) for i in range(25, 75)]
+        await candles.save_bars("SYM000", "1m", bars, [(start, start + 4500)])
+        result["candles"] = [
+            list(bar)
+            for bar in await candles.get_bars("SYM000", "1m", start, start + 4500)
+        ]
+        result["coverage"] = [
+            list(span) for span in await candles.get_coverage("SYM000", "1m")
+        ]
+    return result
+
+
+def _jsonable(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return getattr(value, "value", value)
+
+
+async def write_throughput(
+    factory, trades: int, writers: int, seconds: float
+) -> dict:
+    ops, errors = 0, 0
+    deadline = time.perf_counter() + seconds
+
+    async def writer(seed: int) -> None:
+        nonlocal ops, errors
+        rng = random.Random(seed)
+        while time.perf_counter() < deadline:
+            try:
+                async with factory() as session:
+                    session.add(
+                        TradeExecution(
+                            trade_id=f"trade-{rng.randrange(trades):05d}",
+                            side=Side.SELL,
+                            qty=rng.randint(1, 10),
+                            price=101,
+                        )
+                    )
+                    await session.commit()
+            except OperationalError:
+                # SQLite's "database is locked" once the busy timeout runs out
+                errors += 1
+                continue
+            ops += 1
+
+    await asyncio.gather(*(writer(i) for i in range(writers)))
+    return {"ops_per_s": round(ops / seconds, 1), "errors": errors}
+
+
+async def run_backend(url: str, args) -> tuple[dict, dict]:
+    if is_sqlite(url):
+        engine = make_engine(url, pragmas=sqlite_pragmas("production"))
+    else:
+        engine = make_engine(url, **pool_options(url))
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.run_sync(SQLModel.metadata.create_all)
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    async with factory() as session:
+        session.add_all(build_trades(args.trades))
+        await session.commit()
+
+    try:
+        result = await snapshot(factory, args.trades)
+        throughput = await write_throughput(
+            factory, args.trades, args.writers, args.seconds
+        )
+    finally:
+        await engine.dispose()
+    return result, throughput
+
+
+def diff(left: dict, right: dict) -> list[str]:
+    def dump(value) -> str:
+        return json.dumps(value, sort_keys=True)
+
+    return [key for key in left if dump(left[key]) != dump(right.get(key))]
+
+
+async def run(args) -> dict:
+    url = database_url(args.url)
+    if is_sqlite(url):
+        raise SystemExit("--url or DATABASE_URL must point at a PostgreSQL database")
+    with tempfile.TemporaryDirectory() as tmp:
+        sqlite_url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'parity.db')}"
+        sqlite_result, sqlite_writes = await run_backend(sqlite_url, args)
+    postgres_result, postgres_writes = await run_backend(url, args)
+
+    mismatched = diff(sqlite_result, postgres_result)
+    result = {
+        "trades": args.trades,
+        "writers": args.writers,
+        "seconds": args.seconds,
+        "checks": len(sqlite_result),
+        "mismatched": mismatched,
+        "sqlite": sqlite_writes,
+        "postgresql": postgres_writes,
+    }
+    if sqlite_writes["ops_per_s"]:
+        result["write_speedup"] = round(
+            postgres_writes["ops_per_s"] / sqlite_writes["ops_per_s"], 2
+        )
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default=None)
+    parser.add_argument("--trades", type=int, default=300)
+    parser.add_argument("--writers", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print(json.dumps(result, indent=2))
+    return 1 if result["mismatched"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
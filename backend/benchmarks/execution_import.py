@@ -0,0 +1,149 @@
+"""Bulk execution import throughput against creating executions one at a time.
+
+Seeds trades into a fresh SQLite file, records `--baseline` fills through
+`ExecutionService.create_execution` (a flush, reload and commit each), then
+streams a generated CSV statement of `--rows` fills through the import.
+With `--trace-memory` the import's peak Python heap is measured as well,
+which slows it down several times. Usage:
+
+    python -m benchmarks.execution_import --rows 100000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database.db import make_engine, sqlite_pragmas
+from database.models import ExecSource, PlanType, ScalePlan, Side, Trade
+from domain.execution.execution_import import read_records
+from domain.execution.execution_repo import ExecutionRepo
+from domain.execution.execution_schema import ExecutionCreate
+from domain.execution.execution_service import ExecutionService
+from domain.scale_plan.scale_plan_repo import ScalePlanRepo
+from domain.trade.trade_repo import TradeRepo
+
+EPOCH = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+
+def service(session) -> ExecutionService:
+    return ExecutionService(
+        ExecutionRepo(session), ScalePlanRepo(session), TradeRepo(session)
+    )
+
+
+async def seed(factory, trades: int) -> list[tuple[str, str]]:
+    """(trade id, entry plan id) for each seeded trade."""
+    ids = []
+    async with factory() as session:
+        for i in range(trades):
+            trade = Trade(symbol=f"SYM{i:03d}", setup="benchmark", rating=3)
+            plan = ScalePlan(plan_type=PlanType.ENTRY, qty=10**9, limit_price=100)
+            trade.scale_plans.append(plan)
+            session.add(trade)
+            ids.append((trade.id, plan.id))
+        await session.commit()
+    return ids
+
+
+async def statement(rows: int, ids: list[tuple[str, str]]):
+    """A CSV statement of `rows` fills, spread over the trades, in chunks."""
+    yield b"Trade ID,Plan ID,Action,Quantity,Price,Commission,Date/Time\n"
+    lines = []
+    for i in range(rows):
+        trade_id, plan_id = ids[i % len(ids)]
+        side = "BOT" if i % 3 else "SLD"
+        executed_at = (EPOCH + timedelta(seconds=i)).isoformat()
+        lines.append(
+            f"{trade_id},{plan_id},{side},{1 + i % 5},{100 + i % 7},0.35,{executed_at}\n"
+        )
+        if len(lines) == 1000:
+            yield "".join(lines).encode()
+            lines = []
+    yield "".join(lines).encode()
+
+
+async def one_at_a_time(factory, rows: int, ids: list[tuple[str, str]]) -> dict:
+    start = time.perf_counter()
+    for i in range(rows):
+        trade_id, plan_id = ids[i % len(ids)]
+        async with factory() as session:
+            await service(session).create_execution(
+                ExecutionCreate(
+                    trade_id=trade_id,
+                    scale_plan_id=plan_id,
+                    side=Side.BUY if i % 3 else Side.SELL,
+                    qty=1 + i % 5,
+                    price=100 + i % 7,
+                    commission=0.35,
+                    source=ExecSource.MANUAL,
+                )
+            )
+    seconds = time.perf_counter() - start
+    return {"rows": rows, "rows_per_s": round(rows / seconds, 1) if rows else 0}
+
+
+async def bulk(factory, rows: int, ids: list[tuple[str, str]], trace: bool) -> dict:
+    if trace:
+        tracemalloc.start()
+    async with factory() as session:
+        report = await service(session).import_executions(
+            read_records(statement(rows, ids), "csv")
+        )
+    result = {
+        "rows": report.imported,
+        "rows_per_s": report.rows_per_second,
+        "trades": report.trades,
+        "scale_plans": report.scale_plans,
+    }
+    if trace:
+        result["peak_heap_mb"] = round(tracemalloc.get_traced_memory()[1] / 2**20, 1)
+        tracemalloc.stop()
+    return result
+
+
+async def run(args) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'import.db')}"
+        engine = make_engine(url, pragmas=sqlite_pragmas("production"))
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.create_all)
+        factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        try:
+            ids = await seed(factory, args.trades)
+            result = {
+                "trades": args.trades,
+                "one_at_a_time": await one_at_a_time(factory, args.baseline, ids),
+                "import": await bulk(factory, args.rows, ids, args.trace_memory),
+            }
+        finally:
+            await engine.dispose()
+    before = result["one_at_a_time"]["rows_per_s"]
+    if before:
+        result["speedup"] = round(result["import"]["rows_per_s"] / before, 1)
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--baseline", type=int, default=500)
+    parser.add_argument("--trades", type=int, default=50)
+    parser.add_argument("--trace-memory", action="store_true")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
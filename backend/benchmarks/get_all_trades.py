@@ -0,0 +1,191 @@
+"""Repeatable benchmark of TradeService.get_all_trades against replayed market data.
+
+Seeds a throwaway SQLite database with trades, serves quotes and profiles from
+a RecordReplayProvider (synthetic recordings unless --recordings points at a
+captured directory) and times enrichment end to end. Usage:
+
+    python -m benchmarks.get_all_trades --trades 200 --latency-ms 80 --jitter-ms 20
+    python -m benchmarks.get_all_trades --save-baseline baseline.json
+    python -m benchmarks.get_all_trades --compare baseline.json --tolerance 0.2
+
+With --compare the exit status is 1 when the p50 is more than `tolerance`
+slower than the baseline.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import zlib
+
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.inmemory import InMemoryBackend
+from sqlalchemy.ext.asyncio.engine import AsyncEngine
+from sqlmodel import SQLModel, create_engine
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from core.stock_price.quote_book import quote_book
+from core.stock_price.record_replay_provider import RecordReplayProvider
+from database.models import ScalePlan, Trade, TradeStatus
+from domain.annotation.annotation_repo import AnnotationRepo
+from domain.trade.trade_repo import TradeRepo
+from domain.trade.trade_service import TradeService
+
+
+def write_synthetic_recordings(directory: str, symbols: list[str]) -> None:
+    quotes, profiles = {}, {}
+    for symbol in symbols:
+        price = 10 + zlib.crc32(symbol.encode()) % 490
+        quotes[symbol] = {
+            "s": symbol,
+            "c": price,
+            "d": 1.0,
+            "dp": round(100 / (price - 1), 4),
+            "h": price + 2,
+            "l": price - 2,
+            "o": price - 0.5,
+            "pc": price - 1,
+            "t": 1_700_000_000,
+        }
+        profiles[symbol] = {
+            "country": "US",
+            "currency": "USD",
+            "exchange": "NASDAQ",
+            "cap": price * 1000.0,
+            "name": f"{symbol} Inc",
+            "symbol": symbol,
+            "weburl": f"https://example.com/{symbol.lower()}",
+            "logo": "",
+            "industry": "Technology",
+        }
+    for kind, data in (("quotes", quotes), ("profiles", profiles)):
+        with open(os.path.join(directory, f"{kind}.json"), "w") as f:
+            json.dump(data, f)
+
+
+def recorded_symbols(directory: str) -> list[str]:
+    with open(os.path.join(directory, "quotes.json")) as f:
+        return sorted(json.load(f))
+
+
+async def seed(engine: AsyncEngine, symbols: list[str], count: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    statuses = [TradeStatus.WATCHING, TradeStatus.OPEN, TradeStatus.CLOSED]
+    async with AsyncSession(engine) as session:
+        for i in range(count):
+            trade = Trade(
+                symbol=symbols[i % len(symbols)],
+                setup="benchmark",
+                rating=3,
+                status=statuses[i % len(statuses)],
+            )
+            trade.scale_plans.append(ScalePlan(qty=10, target_price=100 + i % 7))
+            session.add(trade)
+        await session.commit()
+
+
+async def run(args) -> dict:
+    FastAPICache.init(InMemoryBackend(), enable=False)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = args.recordings
+        if directory:
+            symbols = recorded_symbols(directory)
+        else:
+            directory = tmp
+            symbols = [f"SYM{i:03d}" for i in range(args.symbols)]
+            write_synthetic_recordings(directory, symbols)
+
+        provider = RecordReplayProvider(
+            directory,
+            latency=args.latency_ms / 1000,
+            jitter=args.jitter_ms / 1000,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        )
+        engine = AsyncEngine(
+            create_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}")
+        )
+        await seed(engine, symbols, args.trades)
+        # The list reads prices from the quote book, which the background
+        # refresher fills in production
+        for quote in await provider.get_stock_price_batch(symbols):
+            quote_book.update_from_quote(quote)
+
+        timings = []
+        for i in range(args.warmup + args.iterations):
+            async with AsyncSession(engine, expire_on_commit=False) as session:
+                service = TradeService(
+                    repo=TradeRepo(session=session),
+                    annotation_repo=AnnotationRepo(session=session),
+                    market_data=provider,
+                )
+                start = time.perf_counter()
+                trades = await service.get_all_trades()
+                elapsed = time.perf_counter() - start
+            if i >= args.warmup:
+                timings.append(elapsed * 1000)
+        await engine.dispose()
+
+    timings.sort()
+    return {
+        "trades": len(trades),
+        "symbols": len(symbols),
+        "iterations": len(timings),
+        "latency_ms": args.latency_ms,
+        "jitter_ms": args.jitter_ms,
+        "error_rate": args.error_rate,
+        "p50_ms": round(statistics.median(timings), 2),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+        "mean_ms": round(statistics.fmean(timings), 2),
+        "min_ms": round(timings[0], 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trades", type=int, default=200)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--latency-ms", type=float, default=50.0)
+    parser.add_argument("--jitter-ms", type=float, default=10.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--recordings", help="directory captured with MARKET_DATA_PROVIDER=record"
+    )
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--compare", metavar="PATH")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    result = asyncio.run(run(args))
+    print(json.dumps(result, indent=2))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(result, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        ratio = result["p50_ms"] / baseline["p50_ms"]
+        print(
+            f"p50 {result['p50_ms']}ms vs baseline {baseline['p50_ms']}ms "
+            f"({ratio:.2f}x)"
+        )
+        if ratio > 1 + args.tolerance:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
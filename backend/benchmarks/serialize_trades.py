@@ -0,0 +1,204 @@
+"""Per-trade cost of turning enriched trades into the JSON list response.
+
+Compares the previous pipeline (validate the ORM row, dump it to a dict,
+merge market data, validate the dict again, then let FastAPI validate and
+encode it against the route's `response_model`) with the single pass used
+now (validate once, copy the market fields in, serialize with a prebuilt
+TypeAdapter). No database or network is involved. Usage:
+
+    python -m benchmarks.serialize_trades --trades 200 --iterations 50
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import TypeAdapter
+
+from core.json_response import AdapterJSONResponse
+from core.stock_price.finnhub_schema import CompanyProfile
+from core.stock_price.quote_book import BookQuote
+from database.models import (
+    Annotation,
+    AnnotationType,
+    PlanType,
+    ScalePlan,
+    Side,
+    Trade,
+    TradeExecution,
+    TradeStatus,
+)
+from domain.trade.trade_schema import TradeResponse, TradeSummary
+from domain.trade.trade_service import TradeService
+
+
+def build_trades(count: int, symbols: int) -> list[Trade]:
+    trades = []
+    for i in range(count):
+        trade = Trade(
+            symbol=f"SYM{i % symbols:03d}",
+            setup="benchmark",
+            rating=3,
+            status=TradeStatus.OPEN,
+        )
+        # Rows are never flushed, so foreign keys are set by hand
+        entry = ScalePlan(
+            trade_id=trade.id,
+            plan_type=PlanType.ENTRY,
+            qty=10,
+            limit_price=100,
+            stop_price=95,
+        )
+        trade.scale_plans.extend(
+            [
+                entry,
+                ScalePlan(
+                    trade_id=trade.id,
+                    plan_type=PlanType.TARGET,
+                    qty=5,
+                    target_price=110,
+                ),
+                ScalePlan(
+                    trade_id=trade.id,
+                    plan_type=PlanType.TARGET,
+                    qty=5,
+                    target_price=120,
+                ),
+            ]
+        )
+        trade.executions.append(
+            TradeExecution(
+                trade_id=trade.id,
+                scale_plan_id=entry.id,
+                side=Side.BUY,
+                qty=10,
+                price=100,
+            )
+        )
+        trade.annotations.append(
+            Annotation(
+                trade_id=trade.id, content="note", annotation_type=AnnotationType.note
+            )
+        )
+        trades.append(trade)
+    return trades
+
+
+def market_maps(symbols: int) -> tuple[dict, dict]:
+    now = time.time()
+    price_map, profile_map = {}, {}
+    for i in range(symbols):
+        symbol = f"SYM{i:03d}"
+        price_map[symbol] = BookQuote(
+            symbol, 101.0, 1.0, 1.0, 102.0, 99.0, 100.5, 100.0, int(now), now
+        )
+        profile_map[symbol] = CompanyProfile(
+            country="US",
+            currency="USD",
+            exchange="NASDAQ",
+            cap=1000.0,
+            name=f"{symbol} Inc",
+            symbol=symbol,
+            weburl="https://example.com",
+            logo="",
+            industry="Technology",
+        )
+    return price_map, profile_map
+
+
+def legacy_enrich(trade: Trade, price_map: dict, profile_map: dict) -> TradeResponse:
+    trade_data = TradeResponse.model_validate(trade).model_dump()
+    trade_data["rr_ratio"] = TradeService._calculate_rr_ratio(trade.scale_plans)
+    trade_data.update(TradeService._market_data(trade.symbol, price_map))
+    profile = profile_map[trade.symbol]
+    trade_data.update(
+        {
+            "country": profile.country,
+            "currency": profile.currency,
+            "exchange": profile.exchange,
+            "name": profile.name,
+            "industry": profile.finnhubIndustry,
+            "logo": profile.logo,
+            "cap": profile.marketCapitalization,
+        }
+    )
+    return TradeResponse.model_validate(trade_data)
+
+
+async def legacy(trades, price_map, profile_map, field) -> bytes:
+    models = [legacy_enrich(trade, price_map, profile_map) for trade in trades]
+    content = await serialize_response(field=field, response_content=models)
+    return JSONResponse(content).body
+
+
+def single_pass(service, trades, price_map, profile_map, adapter) -> bytes:
+    models = [
+        service._enrich_trade(trade, price_map, profile_map) for trade in trades
+    ]
+    return AdapterJSONResponse(adapter, models).body
+
+
+def per_trade_us(timings: list[float], count: int) -> dict:
+    timings.sort()
+    return {
+        "p50_us": round(statistics.median(timings) / count * 1e6, 2),
+        "min_us": round(timings[0] / count * 1e6, 2),
+    }
+
+
+async def run(args) -> dict:
+    trades = build_trades(args.trades, args.symbols)
+    price_map, profile_map = market_maps(args.symbols)
+    # Same response_model as GET /api/trades
+    field = create_model_field(
+        "Response", list[TradeResponse] | list[TradeSummary], mode="serialization"
+    )
+    adapter = TypeAdapter(list[TradeResponse])
+    service = TradeService(repo=None, annotation_repo=None, market_data=None)
+
+    before, after = [], []
+    for i in range(args.warmup + args.iterations):
+        start = time.perf_counter()
+        old_body = await legacy(trades, price_map, profile_map, field)
+        middle = time.perf_counter()
+        new_body = single_pass(service, trades, price_map, profile_map, adapter)
+        end = time.perf_counter()
+        if i >= args.warmup:
+            before.append(middle - start)
+            after.append(end - middle)
+
+    if json.loads(old_body) != json.loads(new_body):
+        raise SystemExit("The two pipelines produced different JSON")
+
+    result = {
+        "trades": args.trades,
+        "iterations": args.iterations,
+        "before": per_trade_us(before, args.trades),
+        "after": per_trade_us(after, args.trades),
+    }
+    result["speedup"] = round(
+        result["before"]["p50_us"] / result["after"]["p50_us"], 2
+    )
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trades", type=int, default=200)
+    parser.add_argument("--symbols", type=int, default=50)
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
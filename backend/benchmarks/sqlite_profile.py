@@ -0,0 +1,177 @@
+"""Read and write throughput of the SQLite engine profiles under concurrent requests.
+
+Runs the same workload against a fresh database twice: once configured as
+before (SQLite defaults, SQL echo on, a sessionmaker built per request) and
+once with the production profile from `database.db` (WAL and the other
+pragmas, echo off, one session factory). Readers load pages of trades with
+their children while writers update ratings and add executions. Usage:
+
+    python -m benchmarks.sqlite_profile --seconds 5 --readers 16 --writers 4
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database.db import make_engine, sqlite_pragmas
+from database.models import ScalePlan, Side, Trade, TradeExecution, TradeStatus
+from domain.trade.trade_repo import TradeRepo
+
+PROFILES = {
+    "before": {"echo": True, "pragmas": {}, "factory_per_request": True},
+    "after": {"echo": False, "pragmas": None, "factory_per_request": False},
+}
+
+
+async def seed(engine, count: int) -> list[str]:
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.create_all)
+    ids = []
+    async with AsyncSession(engine) as session:
+        for i in range(count):
+            trade = Trade(
+                symbol=f"SYM{i % 50:03d}",
+                setup="benchmark",
+                rating=3,
+                status=TradeStatus.OPEN,
+            )
+            trade.scale_plans.append(ScalePlan(qty=10, target_price=100 + i % 7))
+            session.add(trade)
+            ids.append(trade.id)
+        await session.commit()
+    return ids
+
+
+class Workload:
+    def __init__(self, engine, trade_ids: list[str], factory_per_request: bool):
+        self.engine = engine
+        self.trade_ids = trade_ids
+        self.factory_per_request = factory_per_request
+        self.factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        self.latencies = {"read": [], "write": []}
+        self.errors = {"read": 0, "write": 0}
+
+    def session(self) -> AsyncSession:
+        factory = self.factory
+        if self.factory_per_request:
+            factory = sessionmaker(
+                self.engine, class_=AsyncSession, expire_on_commit=False
+            )
+        return factory()
+
+    async def read(self, rng: random.Random) -> None:
+        async with self.session() as session:
+            await TradeRepo(session).get_trades_by_ids(rng.sample(self.trade_ids, 20))
+
+    async def write(self, rng: random.Random) -> None:
+        async with self.session() as session:
+            trade_id = rng.choice(self.trade_ids)
+            trade = await session.get(Trade, trade_id)
+            trade.rating = rng.randint(1, 5)
+            session.add(
+                TradeExecution(
+                    trade_id=trade_id,
+                    side=Side.BUY,
+                    qty=rng.randint(1, 10),
+                    price=100,
+                )
+            )
+            await session.commit()
+
+    async def worker(self, kind: str, deadline: float, seed: int) -> None:
+        rng = random.Random(seed)
+        operation = self.read if kind == "read" else self.write
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                await operation(rng)
+            except OperationalError:
+                # "database is locked" once the busy timeout runs out
+                self.errors[kind] += 1
+                continue
+            self.latencies[kind].append(time.perf_counter() - start)
+
+
+def summarize(latencies: list[float], errors: int, seconds: float) -> dict:
+    if not latencies:
+        return {"ops_per_s": 0, "errors": errors}
+    latencies.sort()
+    return {
+        "ops_per_s": round(len(latencies) / seconds, 1),
+        "p50_ms": round(statistics.median(latencies) * 1000, 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)] * 1000, 2),
+        "errors": errors,
+    }
+
+
+async def run_profile(name: str, args) -> dict:
+    config = PROFILES[name]
+    pragmas = sqlite_pragmas("production") if config["pragmas"] is None else {}
+    with tempfile.TemporaryDirectory() as tmp, open(os.devnull, "w") as devnull:
+        url = f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}"
+        # echo's handler writes to the stdout of the moment it is created
+        with contextlib.redirect_stdout(devnull):
+            engine = make_engine(url, echo=config["echo"], pragmas=pragmas)
+        trade_ids = await seed(engine, args.trades)
+        workload = Workload(engine, trade_ids, config["factory_per_request"])
+
+        deadline = time.perf_counter() + args.seconds
+        await asyncio.gather(
+            *(workload.worker("read", deadline, i) for i in range(args.readers)),
+            *(
+                workload.worker("write", deadline, 1000 + i)
+                for i in range(args.writers)
+            ),
+        )
+        await engine.dispose()
+
+    return {
+        kind: summarize(workload.latencies[kind], workload.errors[kind], args.seconds)
+        for kind in ("read", "write")
+    }
+
+
+async def run(args) -> dict:
+    result = {
+        "trades": args.trades,
+        "readers": args.readers,
+        "writers": args.writers,
+        "seconds": args.seconds,
+    }
+    for name in PROFILES:
+        result[name] = await run_profile(name, args)
+    for kind in ("read", "write"):
+        before = result["before"][kind]["ops_per_s"]
+        if before:
+            result[f"{kind}_speedup"] = round(
+                result["after"][kind]["ops_per_s"] / before, 2
+            )
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trades", type=int, default=500)
+    parser.add_argument("--readers", type=int, default=16)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
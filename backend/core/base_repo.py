@@ -1,4 +1,5 @@
 from typing import TypeVar, Generic, List, Optional, Type
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlmodel import SQLModel, select
 from database.session import SessionDep
 from fastapi import HTTPException, status
@@ -82,6 +83,12 @@ class BaseRepo(Generic[T]):
         except Exception as e:
             raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
+    def _insert(self, model: Type[SQLModel]):
+        """INSERT for the session's dialect, with `on_conflict_do_update` on both."""
+        if self.session.bind.dialect.name == "postgresql":
+            return postgresql.insert(model)
+        return sqlite.insert(model)
+
     async def _save(self, instance: T) -> T:
         """Save instance to database and refresh."""
         self.session.add(instance)
@@ -0,0 +1,109 @@
+import logging
+import os
+from typing import Optional
+
+from aiomcache import Client
+from dotenv import load_dotenv
+from fastapi_cache import FastAPICache
+from fastapi_cache.backends.memcached import MemcachedBackend
+from fastapi_cache.coder import PickleCoder
+
+from core.data_version import data_versions
+from core.env import env_size
+
+from .memory_backend import DEFAULT_MAX_BYTES, BoundedMemoryBackend
+from .sqlite_backend import DEFAULT_CACHE_PATH, SqliteBackend
+from .version_store import (
+    LocalVersionStore,
+    MemcachedVersionStore,
+    SqliteVersionStore,
+)
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+CACHE_BACKENDS = ("memory", "memcached", "sqlite")
+
+
+def cache_backend_kind() -> str:
+    kind = os.getenv("CACHE_BACKEND", "memory").strip().lower()
+    if kind not in CACHE_BACKENDS:
+        raise ValueError(f"CACHE_BACKEND must be one of {', '.join(CACHE_BACKENDS)}")
+    return kind
+
+
+def is_shared_cache() -> bool:
+    """Whether the cache is shared with other worker processes."""
+    return cache_backend_kind() != "memory"
+
+
+class CountingMemcachedBackend(MemcachedBackend):
+    """fastapi-cache's memcached backend with hit/miss counters for stats."""
+
+    def __init__(self, mcache: Client):
+        super().__init__(mcache)
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[bytes]:
+        value = await super().get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def snapshot(self) -> dict:
+        return {
+            "backend": "memcached",
+            "hits": self.hits,
+            "misses": self.misses,
+            # memcached evicts on its own and does not report it per client
+            "evictions": 0,
+        }
+
+
+_memcached: Client | None = None
+
+
+def init_cache(prefix: str) -> None:
+    """Set up FastAPICache and the data-version store from `CACHE_BACKEND`.
+
+    `memory` keeps both in this process. `sqlite` and `memcached` share them
+    between workers, so entries are cached once and a write in any worker
+    invalidates the others.
+    """
+    global _memcached
+    kind = cache_backend_kind()
+    if kind == "memcached":
+        _memcached = Client(
+            os.getenv("CACHE_MEMCACHED_HOST", "127.0.0.1"),
+            int(os.getenv("CACHE_MEMCACHED_PORT", 11211)),
+            pool_size=int(os.getenv("CACHE_MEMCACHED_POOL_SIZE", 4)),
+        )
+        backend = CountingMemcachedBackend(_memcached)
+        store = MemcachedVersionStore(_memcached, prefix=f"{prefix}:versions")
+    elif kind == "sqlite":
+        path = os.getenv("CACHE_SQLITE_PATH", DEFAULT_CACHE_PATH)
+        backend = SqliteBackend(
+            path, max_bytes=env_size("CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+        )
+        store = SqliteVersionStore(path)
+    else:
+        backend = BoundedMemoryBackend.from_env(prefix=prefix)
+        store = LocalVersionStore()
+
+    FastAPICache.init(backend, prefix=prefix, coder=PickleCoder)
+    data_versions.use(store)
+    logger.info(f"Using {kind} cache backend")
+
+
+async def close_cache() -> None:
+    global _memcached
+    backend = FastAPICache.get_backend()
+    if isinstance(backend, SqliteBackend):
+        backend.close()
+    if _memcached is not None:
+        await _memcached.close()
+        _memcached = None
@@ -0,0 +1,239 @@
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+
+from dotenv import load_dotenv
+from fastapi_cache.types import Backend
+
+from core.env import env_size, parse_size
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024**2
+DEFAULT_QUOTAS = "trades=48M"
+EVICTION_POLICIES = ("lru", "lfu")
+# Rough per-entry bookkeeping cost on top of the key and the encoded value
+ENTRY_OVERHEAD = 128
+# Entries compared per LFU eviction, taken from the least recently used end
+LFU_SAMPLE = 16
+
+
+@dataclass
+class _Entry:
+    data: bytes
+    expires_at: float
+    size: int
+    used_at: float
+    hits: int = 0
+
+
+@dataclass
+class _Namespace:
+    quota: int | None
+    entries: "OrderedDict[str, _Entry]" = field(default_factory=OrderedDict)
+    bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expired: int = 0
+    rejected: int = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "quota": self.quota,
+            "bytes": self.bytes,
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expired": self.expired,
+            "rejected": self.rejected,
+        }
+
+
+def parse_quotas(value: str) -> Dict[str, int]:
+    """Parse `trades=48M,profiles=4M` into byte quotas per namespace."""
+    quotas = {}
+    for item in value.split(","):
+        if item.strip():
+            name, size = item.split("=", 1)
+            quotas[name.strip()] = parse_size(size)
+    return quotas
+
+
+class BoundedMemoryBackend(Backend):
+    """In-process fastapi-cache backend held under a byte budget.
+
+    Sizes are measured on the encoded values. Each namespace (the key segment
+    after `prefix`) may have its own quota; when a namespace exceeds its quota
+    or the cache exceeds `max_bytes`, entries are evicted least recently used
+    first, or with `policy="lfu"` the least used among the oldest few.
+    Expired entries are dropped when read or when they reach the eviction end.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        *,
+        quotas: Dict[str, int] | None = None,
+        policy: str = "lru",
+        prefix: str = "",
+    ):
+        if policy not in EVICTION_POLICIES:
+            raise ValueError(f"Unknown cache eviction policy {policy!r}")
+        self.max_bytes = max_bytes
+        self.quotas = quotas or {}
+        self.policy = policy
+        self.prefix = f"{prefix}:" if prefix else ""
+        self.bytes = 0
+        self._namespaces: Dict[str, _Namespace] = {}
+
+    @classmethod
+    def from_env(cls, prefix: str = "") -> "BoundedMemoryBackend":
+        return cls(
+            env_size("CACHE_MAX_BYTES", DEFAULT_MAX_BYTES),
+            quotas=parse_quotas(os.getenv("CACHE_QUOTAS", DEFAULT_QUOTAS)),
+            policy=os.getenv("CACHE_EVICTION", "lru").lower(),
+            prefix=prefix,
+        )
+
+    def _namespace_of(self, key: str) -> str:
+        if self.prefix and key.startswith(self.prefix):
+            key = key[len(self.prefix) :]
+        return key.split(":", 1)[0]
+
+    def _namespace(self, name: str) -> _Namespace:
+        if name not in self._namespaces:
+            self._namespaces[name] = _Namespace(self.quotas.get(name))
+        return self._namespaces[name]
+
+    def _remove(self, ns: _Namespace, key: str) -> _Entry | None:
+        entry = ns.entries.pop(key, None)
+        if entry is not None:
+            ns.bytes -= entry.size
+            self.bytes -= entry.size
+        return entry
+
+    def _lookup(self, key: str) -> _Entry | None:
+        ns = self._namespace(self._namespace_of(key))
+        entry = ns.entries.get(key)
+        if entry is not None and entry.expires_at <= time.monotonic():
+            self._remove(ns, key)
+            ns.expired += 1
+            entry = None
+        if entry is None:
+            ns.misses += 1
+            return None
+
+        ns.hits += 1
+        entry.hits += 1
+        entry.used_at = time.monotonic()
+        ns.entries.move_to_end(key)
+        return entry
+
+    def _victim(self, ns: _Namespace, keep: str) -> str:
+        """The entry to evict; never `keep`, the one being stored."""
+        keys = (key for key in ns.entries if key != keep)
+        if self.policy == "lru":
+            return next(keys)
+
+        now = time.monotonic()
+        sample = []
+        for key in keys:
+            entry = ns.entries[key]
+            if entry.expires_at <= now:
+                return key
+            # Ties go to the older entry
+            sample.append((entry.hits, len(sample), key))
+            if len(sample) == LFU_SAMPLE:
+                break
+        return min(sample)[2]
+
+    def _evict(self, ns: _Namespace, keep: str) -> None:
+        key = self._victim(ns, keep)
+        if ns.entries[key].expires_at <= time.monotonic():
+            ns.expired += 1
+        else:
+            ns.evictions += 1
+        self._remove(ns, key)
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        entry = self._lookup(key)
+        if entry is None:
+            return 0, None
+        if entry.expires_at == float("inf"):
+            return -1, entry.data
+        return int(entry.expires_at - time.monotonic()), entry.data
+
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._lookup(key)
+        return entry.data if entry else None
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        ns = self._namespace(self._namespace_of(key))
+        self._remove(ns, key)
+
+        size = len(key) + len(value) + ENTRY_OVERHEAD
+        limit = min(self.max_bytes, ns.quota or self.max_bytes)
+        if size > limit:
+            ns.rejected += 1
+            logger.debug(f"Not caching {key}: {size} bytes exceeds {limit}")
+            return
+
+        now = time.monotonic()
+        expires_at = now + expire if expire else float("inf")
+        ns.entries[key] = _Entry(value, expires_at, size, now)
+        ns.bytes += size
+        self.bytes += size
+
+        while ns.quota and ns.bytes > ns.quota:
+            self._evict(ns, key)
+        while self.bytes > self.max_bytes:
+            # Over the global budget: evict from the namespace holding the
+            # least recently used entry
+            self._evict(
+                min(
+                    (
+                        n
+                        for n in self._namespaces.values()
+                        if len(n.entries) > (key in n.entries)
+                    ),
+                    key=lambda n: next(iter(n.entries.values())).used_at,
+                ),
+                key,
+            )
+
+    async def clear(
+        self, namespace: Optional[str] = None, key: Optional[str] = None
+    ) -> int:
+        if key:
+            ns = self._namespace(self._namespace_of(key))
+            return 1 if self._remove(ns, key) else 0
+
+        count = 0
+        for ns in self._namespaces.values():
+            for stored in [k for k in ns.entries if k.startswith(namespace or "")]:
+                self._remove(ns, stored)
+                count += 1
+        return count
+
+    def snapshot(self) -> dict:
+        namespaces = {
+            name: ns.snapshot() for name, ns in sorted(self._namespaces.items())
+        }
+        return {
+            "backend": "memory",
+            "policy": self.policy,
+            "max_bytes": self.max_bytes,
+            "bytes": self.bytes,
+            "entries": sum(ns["entries"] for ns in namespaces.values()),
+            "hits": sum(ns["hits"] for ns in namespaces.values()),
+            "misses": sum(ns["misses"] for ns in namespaces.values()),
+            "evictions": sum(ns["evictions"] for ns in namespaces.values()),
+            "namespaces": namespaces,
+        }
@@ -0,0 +1,149 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from fastapi_cache.types import Backend
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_PATH = "cache.db"
+# Expired rows are purged and the byte budget enforced every this many writes
+PRUNE_EVERY = 100
+
+
+class SqliteBackend(Backend):
+    """fastapi-cache backend in a SQLite file shared by the workers on one host.
+
+    Runs in WAL mode so readers in other processes are not blocked by a
+    writer. Expired rows are dropped when read and swept periodically; past
+    `max_bytes` the oldest rows are removed first.
+    """
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int | None = None):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._writes = 0
+        self._conn = sqlite3.connect(
+            path, timeout=10, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entry ("
+            "key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL, "
+            "size INTEGER NOT NULL, stored_at REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_cache_entry_stored_at "
+            "ON cache_entry (stored_at)"
+        )
+        self._lock = threading.Lock()
+
+    def _get(self, key: str) -> Tuple[float | None, bytes | None]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache_entry WHERE key = ?", (key,)
+            ).fetchone()
+            if row and row[1] is not None and row[1] <= time.time():
+                self._conn.execute("DELETE FROM cache_entry WHERE key = ?", (key,))
+                row = None
+        if row is None:
+            self.misses += 1
+            return None, None
+        self.hits += 1
+        return row[1], row[0]
+
+    def _set(self, key: str, value: bytes, expire: int | None) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entry "
+                "(key, value, expires_at, size, stored_at) VALUES (?, ?, ?, ?, ?)",
+                (key, value, now + expire if expire else None, len(value), now),
+            )
+            self._writes += 1
+            if self._writes % PRUNE_EVERY == 0:
+                self._prune(now)
+
+    def _prune(self, now: float) -> None:
+        self._conn.execute("DELETE FROM cache_entry WHERE expires_at <= ?", (now,))
+        if not self.max_bytes:
+            return
+        (total,) = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entry"
+        ).fetchone()
+        if total <= self.max_bytes:
+            return
+        # Walk rows oldest first until enough bytes are released
+        excess, cutoff, evicted = total - self.max_bytes, None, 0
+        for stored_at, size in self._conn.execute(
+            "SELECT stored_at, size FROM cache_entry ORDER BY stored_at"
+        ):
+            excess -= size
+            evicted += 1
+            cutoff = stored_at
+            if excess <= 0:
+                break
+        self._conn.execute("DELETE FROM cache_entry WHERE stored_at <= ?", (cutoff,))
+        self.evictions += evicted
+
+    def _clear(self, namespace: str | None, key: str | None) -> int:
+        with self._lock:
+            if key:
+                cursor = self._conn.execute(
+                    "DELETE FROM cache_entry WHERE key = ?", (key,)
+                )
+            else:
+                cursor = self._conn.execute(
+                    "DELETE FROM cache_entry WHERE key LIKE ? ESCAPE '\\'",
+                    (_like_prefix(namespace or ""),),
+                )
+            return cursor.rowcount
+
+    async def get_with_ttl(self, key: str) -> Tuple[int, Optional[bytes]]:
+        expires_at, value = await asyncio.to_thread(self._get, key)
+        if value is None:
+            return 0, None
+        if expires_at is None:
+            return -1, value
+        return int(expires_at - time.time()), value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return (await asyncio.to_thread(self._get, key))[1]
+
+    async def set(self, key: str, value: bytes, expire: Optional[int] = None) -> None:
+        await asyncio.to_thread(self._set, key, value, expire)
+
+    async def clear(
+        self, namespace: Optional[str] = None, key: Optional[str] = None
+    ) -> int:
+        return await asyncio.to_thread(self._clear, namespace, key)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entry"
+            ).fetchone()
+        return {
+            "backend": "sqlite",
+            "max_bytes": self.max_bytes,
+            "bytes": size,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+def _like_prefix(prefix: str) -> str:
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{escaped}%"
@@ -0,0 +1,155 @@
+import asyncio
+import random
+import sqlite3
+import threading
+from typing import Dict, List, Protocol
+
+from aiomcache import Client
+
+
+class VersionStore(Protocol):
+    """Where the data-version counters live.
+
+    `incr` must be atomic across every process sharing the store and return
+    the new values, so two processes never hand out the same version.
+    `epoch` is a random value that changes whenever the counters may have
+    restarted from zero, so old versions are never mistaken for new ones.
+    """
+
+    async def get(self, names: List[str]) -> Dict[str, int]: ...
+
+    async def incr(self, names: List[str]) -> Dict[str, int]: ...
+
+    async def epoch(self) -> int: ...
+
+
+def _new_epoch() -> int:
+    return random.getrandbits(62)
+
+
+class LocalVersionStore:
+    """Counters held in this process only; for a single worker."""
+
+    def __init__(self):
+        self._values: Dict[str, int] = {}
+        self._epoch = _new_epoch()
+
+    async def get(self, names: List[str]) -> Dict[str, int]:
+        return {name: self._values.get(name, 0) for name in names}
+
+    async def incr(self, names: List[str]) -> Dict[str, int]:
+        for name in names:
+            self._values[name] = self._values.get(name, 0) + 1
+        return await self.get(names)
+
+    async def epoch(self) -> int:
+        return self._epoch
+
+
+class SqliteVersionStore:
+    """Counters in a SQLite file shared by the workers on one host."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn = sqlite3.connect(
+            path, timeout=10, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS data_version "
+            "(name TEXT PRIMARY KEY, value INTEGER NOT NULL) WITHOUT ROWID"
+        )
+        self._lock = threading.Lock()
+
+    def _get_locked(self, names: List[str]) -> Dict[str, int]:
+        values = dict.fromkeys(names, 0)
+        for start in range(0, len(names), 500):
+            chunk = names[start : start + 500]
+            rows = self._conn.execute(
+                "SELECT name, value FROM data_version WHERE name IN "
+                f"({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            values.update(rows)
+        return values
+
+    def _get(self, names: List[str]) -> Dict[str, int]:
+        with self._lock:
+            return self._get_locked(names)
+
+    def _incr(self, names: List[str]) -> Dict[str, int]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    "INSERT INTO data_version (name, value) VALUES (?, 1) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + 1",
+                    [(name,) for name in names],
+                )
+                values = self._get_locked(names)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return values
+
+    def _epoch(self) -> int:
+        with self._lock:
+            # Kept with the counters, so a new file gets a new epoch
+            self._conn.execute(
+                "INSERT OR IGNORE INTO data_version (name, value) VALUES ('epoch', ?)",
+                (_new_epoch(),),
+            )
+            return self._get_locked(["epoch"])["epoch"]
+
+    async def get(self, names: List[str]) -> Dict[str, int]:
+        return await asyncio.to_thread(self._get, names)
+
+    async def incr(self, names: List[str]) -> Dict[str, int]:
+        return await asyncio.to_thread(self._incr, names)
+
+    async def epoch(self) -> int:
+        return await asyncio.to_thread(self._epoch)
+
+
+class MemcachedVersionStore:
+    """Counters in memcached, shared by every process using the same server."""
+
+    def __init__(self, client: Client, prefix: str = "versions"):
+        self.client = client
+        self.prefix = prefix
+
+    def _key(self, name: str) -> bytes:
+        return f"{self.prefix}:{name}".encode()
+
+    async def get(self, names: List[str]) -> Dict[str, int]:
+        if not names:
+            return {}
+        values = await self.client.multi_get(*(self._key(name) for name in names))
+        return {
+            name: int(value) if value is not None else 0
+            for name, value in zip(names, values)
+        }
+
+    async def _incr_one(self, name: str) -> int:
+        key = self._key(name)
+        value = await self.client.incr(key)
+        # A missing counter is created at 1; if another process created it
+        # first, add fails and the increment is retried
+        if value is None and not await self.client.add(key, b"1"):
+            value = await self.client.incr(key)
+        return 1 if value is None else value
+
+    async def incr(self, names: List[str]) -> Dict[str, int]:
+        values = await asyncio.gather(*(self._incr_one(name) for name in names))
+        return dict(zip(names, values))
+
+    async def epoch(self) -> int:
+        # Read every time: a memcached restart or eviction drops the counters
+        # and the epoch together, and the next caller stores a new one
+        key = self._key("epoch")
+        value = await self.client.get(key)
+        if value is None:
+            await self.client.add(key, str(_new_epoch()).encode())
+            value = await self.client.get(key)
+        return int(value) if value is not None else 0
@@ -0,0 +1,141 @@
+import asyncio
+import logging
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session
+
+from core.cache.version_store import LocalVersionStore, VersionStore
+from database.models import Trade
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "data_version_pending"
+_MEMBERSHIP_KEY = "data_version_membership"
+
+
+def _trade_name(trade_id: str) -> str:
+    return f"trade:{trade_id}"
+
+
+class DataVersions:
+    """Version counters for cached trade data.
+
+    `version` moves on every committed change to any trade or its children,
+    `list_version` only when trades are added, removed or re-ordered, and each
+    trade has its own counter. Cache keys embed these numbers, so a write
+    makes the affected entries unreachable instead of deleting them.
+
+    The counters live in a `VersionStore`; with a shared store a write in one
+    worker invalidates the cache entries of all of them. Increments run in
+    the background and every read waits for this process's pending ones, so
+    a client always reads its own writes.
+    """
+
+    def __init__(self, store: VersionStore | None = None):
+        self.store = store or LocalVersionStore()
+        # Last values seen, for stats
+        self.version = 0
+        self.list_version = 0
+        self._trades: Dict[str, int] = {}
+        self._pending: Set[asyncio.Task] = set()
+
+    def use(self, store: VersionStore) -> None:
+        self.store = store
+
+    async def _settle(self) -> None:
+        if self._pending:
+            await asyncio.gather(*self._pending, return_exceptions=True)
+
+    def _remember(self, values: Dict[str, int]) -> None:
+        for name, value in values.items():
+            if name == "version":
+                self.version = value
+            elif name == "list_version":
+                self.list_version = value
+            else:
+                self._trades[name] = value
+
+    async def current(self) -> Tuple[int, int]:
+        """The global and list versions."""
+        await self._settle()
+        values = await self.store.get(["version", "list_version"])
+        self._remember(values)
+        return values["version"], values["list_version"]
+
+    async def epoch(self) -> int:
+        return await self.store.epoch()
+
+    async def trade_versions(self, trade_ids: List[str]) -> Dict[str, int]:
+        await self._settle()
+        names = [_trade_name(trade_id) for trade_id in trade_ids]
+        values = await self.store.get(names)
+        self._remember(values)
+        return {trade_id: values[name] for trade_id, name in zip(trade_ids, names)}
+
+    async def _incr(self, names: List[str]) -> None:
+        try:
+            self._remember(await self.store.incr(names))
+        except Exception as e:
+            logger.error(f"Failed to bump data versions {names}: {e}")
+
+    def bump(self, trade_ids: Iterable[str], membership: bool = False) -> None:
+        names = [_trade_name(trade_id) for trade_id in trade_ids]
+        if membership:
+            names.append("list_version")
+        names.append("version")
+        task = asyncio.get_running_loop().create_task(self._incr(names))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def snapshot(self) -> dict:
+        return {
+            "version": self.version,
+            "list_version": self.list_version,
+            "trades": len(self._trades),
+        }
+
+
+data_versions = DataVersions()
+
+
+def mark_changed(session, trade_ids: Iterable[str], membership: bool = False) -> None:
+    """Record trades changed by statements the ORM does not track (bulk deletes).
+
+    The versions move once the session commits.
+    """
+    session = getattr(session, "sync_session", session)
+    session.info.setdefault(_PENDING_KEY, set()).update(trade_ids)
+    if membership:
+        session.info[_MEMBERSHIP_KEY] = True
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_changes(session: Session, flush_context, instances) -> None:
+    pending = session.info.setdefault(_PENDING_KEY, set())
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if isinstance(obj, Trade):
+            pending.add(obj.id)
+            # The list is ordered by enter_date, so moving it re-orders the list
+            if (
+                obj in session.new
+                or obj in session.deleted
+                or inspect(obj).attrs.enter_date.history.has_changes()
+            ):
+                session.info[_MEMBERSHIP_KEY] = True
+        elif trade_id := getattr(obj, "trade_id", None):
+            pending.add(trade_id)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_changes(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    membership = session.info.pop(_MEMBERSHIP_KEY, False)
+    if pending or membership:
+        data_versions.bump(pending or (), membership)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(session: Session, previous_transaction) -> None:
+    session.info.pop(_PENDING_KEY, None)
+    session.info.pop(_MEMBERSHIP_KEY, None)
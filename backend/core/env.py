@@ -0,0 +1,25 @@
+import os
+
+
+def env_flag(name: str, default: bool = False) -> bool:
+    """Read a boolean feature flag such as `true`/`1`/`on` from the environment."""
+    value = os.getenv(name)
+    if value is None:
+        return default
+    return value.strip().lower() in {"1", "true", "yes", "on"}
+
+
+_SIZE_UNITS = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3}
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte size such as `65536`, `512K`, `64MB` or `1G`."""
+    text = value.strip().upper().removesuffix("B").removesuffix("I")
+    unit = text[-1] if text and text[-1] in _SIZE_UNITS else ""
+    return int(float(text[: len(text) - len(unit)]) * _SIZE_UNITS[unit])
+
+
+def env_size(name: str, default: int) -> int:
+    """Read a byte size (see `parse_size`) from the environment."""
+    value = os.getenv(name)
+    return default if value is None else parse_size(value)
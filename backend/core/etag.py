@@ -0,0 +1,66 @@
+import hashlib
+from typing import Iterable
+
+from fastapi import Request, Response
+
+from core.data_version import data_versions
+from core.stock_price.quote_book import STALE_QUOTE_AFTER, BookQuote
+
+
+def make_etag(*parts: object) -> str:
+    digest = hashlib.sha1("|".join(map(str, parts)).encode()).hexdigest()
+    return f'"{digest[:24]}"'
+
+
+def market_data_version(quotes: Iterable[BookQuote], now: float) -> str:
+    """The market data's own validator, for the quotes being returned.
+
+    Moves when one of them updates, and when one turns stale without an
+    update arriving (a stalled feed), so the stale flags are re-sent. It is
+    built from the quotes alone, so workers holding the same quotes agree.
+    """
+    return ",".join(
+        f"{quote.symbol}@{quote.updated_at!r}"
+        f"{'~' if now - quote.updated_at > STALE_QUOTE_AFTER else ''}"
+        for quote in quotes
+    )
+
+
+def _query(request: Request) -> str:
+    return "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+
+
+async def data_etag(
+    request: Request, resource: str, trade_id: str | None = None
+) -> str:
+    """Strong ETag for a list built from trade data.
+
+    Built from the data version (of one trade when `trade_id` is given) and
+    the query string only, so it is known before anything is loaded. Price
+    ticks never move it; live prices have their own validator on /api/quotes.
+    """
+    epoch = await data_versions.epoch()
+    if trade_id:
+        version = (await data_versions.trade_versions([trade_id]))[trade_id]
+    else:
+        version, _ = await data_versions.current()
+    return make_etag(resource, epoch, version, _query(request))
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison, so W/ prefixes are ignored
+    return any(tag.strip().removeprefix("W/") == etag for tag in header.split(","))
+
+
+def etag_headers(etag: str) -> dict:
+    # no-cache lets clients keep the body but revalidate it on every use
+    return {"ETag": etag, "Cache-Control": "no-cache"}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers=etag_headers(etag))
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Any, AsyncIterator, Set
+
+from pydantic import BaseModel
+from starlette.requests import Request
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_SECONDS = 15.0
+
+
+def _encode(data: Any) -> str:
+    if isinstance(data, BaseModel):
+        return data.model_dump_json(by_alias=True)
+    return json.dumps(data, default=str)
+
+
+class EventHub:
+    """In-process fan-out of server-sent events.
+
+    Each event is encoded once when published and the same bytes are handed
+    to every subscriber queue, so a connected client costs one queue slot per
+    event. Slow clients lose their oldest events rather than blocking the
+    publisher.
+    """
+
+    def __init__(self, queue_size: int = 256):
+        self.queue_size = queue_size
+        self._subscribers: Set[asyncio.Queue] = set()
+        self.published = 0
+        self.dropped = 0
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscribers)
+
+    def publish(self, event: str, data: Any) -> None:
+        """Send `data` to every subscriber as an SSE `event`.
+
+        Does nothing (and skips encoding) when nobody is listening.
+        """
+        if not self._subscribers:
+            return
+
+        frame = f"event: {event}\ndata: {_encode(data)}\n\n".encode()
+        self.published += 1
+        for queue in self._subscribers:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(frame)
+
+    def publish_model(self, event: str, schema: type[BaseModel], obj: Any) -> None:
+        """Validate `obj` against `schema` and publish it, only if anyone listens."""
+        if not self._subscribers:
+            return
+        try:
+            self.publish(event, schema.model_validate(obj))
+        except Exception as e:
+            # A notification failure must never fail the mutation that caused it
+            logger.warning(f"Failed to publish {event}: {e}")
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._subscribers.discard(queue)
+
+    async def stream(self, request: Request) -> AsyncIterator[bytes]:
+        """Yield SSE frames for one client until it disconnects."""
+        queue = self.subscribe()
+        try:
+            yield b"retry: 3000\n\n"
+            while not await request.is_disconnected():
+                try:
+                    yield await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    yield b": keep-alive\n\n"
+        finally:
+            self.unsubscribe(queue)
+
+    def snapshot(self) -> dict:
+        return {
+            "subscribers": len(self._subscribers),
+            "published": self.published,
+            "dropped": self.dropped,
+        }
+
+
+event_hub = EventHub(queue_size=int(os.getenv("EVENT_QUEUE_SIZE", 256)))
@@ -0,0 +1,29 @@
+from typing import Any, Mapping
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+class AdapterJSONResponse(Response):
+    """JSON body written by a prebuilt pydantic `TypeAdapter` in one pass.
+
+    Returning a `Response` skips FastAPI's `response_model` handling, which
+    would validate the already-built models again and encode them through
+    `jsonable_encoder`. pydantic-core serializes straight to bytes instead.
+    Keep `response_model` on the route for the OpenAPI schema.
+    """
+
+    media_type = "application/json"
+
+    def __init__(
+        self,
+        adapter: TypeAdapter,
+        content: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+    ):
+        super().__init__(
+            adapter.dump_json(content, by_alias=True),
+            status_code=status_code,
+            headers=headers,
+        )
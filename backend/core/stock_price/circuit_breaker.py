@@ -0,0 +1,91 @@
+import logging
+import time
+from enum import Enum
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitState(str, Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of calling an upstream whose circuit is open."""
+
+
+class CircuitBreaker:
+    """Stops calling an upstream after `failure_threshold` consecutive failures.
+
+    While open, calls are rejected immediately. After `reset_timeout` seconds
+    one trial call is let through (half-open); its outcome closes the circuit
+    again or re-opens it for another `reset_timeout`.
+    """
+
+    def __init__(
+        self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+        self.transitions = {state.value: 0 for state in CircuitState}
+        self.rejected = 0
+
+    def _set_state(self, state: CircuitState) -> None:
+        if state != self.state:
+            logger.warning(
+                f"Circuit for {self.name}: {self.state.value} -> {state.value}"
+            )
+            self.state = state
+            self.transitions[state.value] += 1
+
+    def allow(self) -> bool:
+        """Whether a call may go out now. Counts a rejection when it may not."""
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                return False
+            self._set_state(CircuitState.HALF_OPEN)
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._trial_in_flight:
+                self.rejected += 1
+                return False
+            self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self._trial_in_flight = False
+        self._set_state(CircuitState.CLOSED)
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self.failures >= self.failure_threshold
+        ):
+            self.opened_at = time.monotonic()
+            self._set_state(CircuitState.OPEN)
+
+    def release(self) -> None:
+        """Forget a call that ended without an outcome (e.g. it was cancelled)."""
+        self._trial_in_flight = False
+
+    def snapshot(self) -> dict:
+        return {
+            "state": self.state.value,
+            "failures": self.failures,
+            "opened": self.transitions[CircuitState.OPEN.value],
+            "half_opened": self.transitions[CircuitState.HALF_OPEN.value],
+            "closed": self.transitions[CircuitState.CLOSED.value],
+            "rejected": self.rejected,
+        }
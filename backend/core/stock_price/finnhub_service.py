@@ -1,6 +1,5 @@
 from dotenv import load_dotenv
 from fastapi import HTTPException
-from fastapi_cache.decorator import cache
 from fastapi_cache import FastAPICache
 import logging
 import os
@@ -11,7 +10,16 @@ from typing import List, cast
 
 from pydantic import ValidationError
 
+from .circuit_breaker import CircuitOpenError
 from .finnhub_schema import StockQuote, CompanyProfile
+from .market_data_client import (
+    MarketDataClient,
+    close_market_data_client,
+    get_market_data_client,
+)
+from .profile_store import profile_store
+from .quote_book import quote_book
+from .quote_cache import quote_cache
 
 
 load_dotenv()
@@ -19,45 +27,16 @@ logging.basicConfig(level=logging.INFO)
 
 logger = logging.getLogger(__name__)
 
-ONE_DAY = 86400
-
-
-@cache(expire=ONE_DAY)
-async def _fetch_company_profile(url: str) -> dict | None:
-    """Cached function to fetch company profile data."""
-    api_key = os.getenv("FINHUB_API_KEY")
-    headers = {"Content-Type": "application/json", "X-Finnhub-Token": api_key}
-
-    logger.info(f"🔥 CACHE MISS: Fetching {url} from Finnhub API")
-    start_time = time.time()
-
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.get(url, headers=headers, timeout=10)
-            response.raise_for_status()
-            data = response.json()
-            end_time = time.time()
-            logger.info(f"✅ API call took {end_time - start_time:.2f} seconds")
-
-            # Check if the response is empty or invalid (Finnhub returns {} for invalid tickers)
-            if not data or not isinstance(data, dict) or not data.get("name"):
-                logger.warning(f"Invalid or empty response from Finnhub API: {data}")
-                return None
-
-            return data
-        except httpx.HTTPError as e:
-            logger.error(f"Error fetching company profile: {e}")
-            return None
-
 
 class FinnhubService:
-    def __init__(self):
+    """Finnhub implementation of `MarketDataProvider`."""
+
+    def __init__(self, client: MarketDataClient | None = None):
         self.api_key = os.getenv("FINHUB_API_KEY")
         self.base_url = os.getenv("FINHUB_BASE_URL")
         self._validate_config()
 
-        headers = {"Content-Type": "application/json", "X-Finnhub-Token": self.api_key}
-        self.client = httpx.AsyncClient(headers=headers)
+        self.client = client or get_market_data_client()
 
     def _validate_config(self):
         """Validate API configuration on initialization."""
@@ -66,20 +45,31 @@ class FinnhubService:
         if not self.base_url:
             raise ValueError("FINHUB_BASE_URL not found in environment variables")
 
-    async def close(self):
-        await self.client.aclose()
-
     async def get_stock_price(self, symbol: str) -> StockQuote:
-        """Fetch current stock price for a given symbol."""
+        """Fetch current stock price for a given symbol.
+
+        Served from the shared quote cache; concurrent misses for the same
+        symbol are coalesced into a single upstream call. While the upstream
+        circuit is open the last known quote is returned instead.
+        """
+        try:
+            return await quote_cache.get_or_fetch(symbol, self._fetch_stock_price)
+        except CircuitOpenError:
+            if quote := quote_cache.last_known(symbol):
+                return quote
+            raise
 
+    async def _fetch_stock_price(self, symbol: str) -> StockQuote:
         url = f"{self.base_url}/quote?symbol={symbol.upper()}"
 
         try:
-            response = await self.client.get(url, timeout=10)
+            response = await self.client.get(url)
             response.raise_for_status()
             data = response.json()
             data["symbol"] = symbol
-            return StockQuote(**data)
+            quote = StockQuote(**data)
+            quote_book.update_from_quote(quote)
+            return quote
         except httpx.HTTPError as e:
             logger.error(f"Error fetching stock price: {e}")
             raise
@@ -92,18 +82,44 @@ class FinnhubService:
         quotes: List[StockQuote] = []
         for symbol, result in zip(symbols, results):
             if isinstance(result, Exception):
-                print(f"Error fetching price for {symbol}: {result}")
+                logger.warning(f"Error fetching price for {symbol}: {result}")
                 continue
 
             quotes.append(result)
         return quotes
 
-    async def get_company_profile(self, symbol: str) -> CompanyProfile | None:
-        """Fetch company profile for a given symbol."""
+    async def _fetch_company_profile(self, symbol: str) -> dict | None:
         url = f"{self.base_url}/stock/profile2?symbol={symbol.upper()}"
+        logger.info(f"🔥 PROFILE MISS: Fetching {url} from Finnhub API")
+        start_time = time.time()
+
+        try:
+            response = await self.client.get(url)
+            response.raise_for_status()
+            data = response.json()
+            end_time = time.time()
+            logger.info(f"✅ API call took {end_time - start_time:.2f} seconds")
+
+            # Check if the response is empty or invalid (Finnhub returns {} for invalid tickers)
+            if not data or not isinstance(data, dict) or not data.get("name"):
+                logger.warning(f"Invalid or empty response from Finnhub API: {data}")
+                return None
+
+            return data
+        except httpx.HTTPError as e:
+            logger.error(f"Error fetching company profile: {e}")
+            return None
 
+    async def get_company_profile(self, symbol: str) -> CompanyProfile | None:
+        """Fetch company profile for a given symbol.
+
+        Served from the persistent profile store; only symbols never seen
+        before go to the network.
+        """
         try:
-            data = await _fetch_company_profile(url)
+            data = await profile_store.get_or_fetch(
+                symbol, self._fetch_company_profile
+            )
             if data is None:
                 raise HTTPException(
                     status_code=404,
@@ -128,19 +144,53 @@ class FinnhubService:
     async def get_company_profile_batch(
         self, symbols: List[str]
     ) -> List[CompanyProfile]:
-        """Fetch company profiles for a list of symbols using individual API calls."""
+        """Fetch company profiles for a list of symbols, going to the API only for unknown ones."""
         tasks = [self.get_company_profile(symbol) for symbol in symbols]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         profiles: List[CompanyProfile] = []
         for symbol, result in zip(symbols, results):
             if isinstance(result, Exception):
-                print(f"Error fetching profile for {symbol}: {result}")
+                logger.warning(f"Error fetching profile for {symbol}: {result}")
                 continue
 
             if result is not None:
                 profiles.append(cast(CompanyProfile, result))
         return profiles
 
+    async def get_symbol_list(self, exchange: str = "US") -> List[dict]:
+        """Fetch every symbol listed on `exchange` (one large response)."""
+        url = f"{self.base_url}/stock/symbol"
+        response = await self.client.get(
+            url, params={"exchange": exchange}, timeout=60.0
+        )
+        response.raise_for_status()
+        data = response.json()
+        return data if isinstance(data, list) else []
+
+    async def get_candles(
+        self, symbol: str, resolution: str, start: int, end: int
+    ) -> dict:
+        """Fetch OHLCV bars between two unix timestamps.
+
+        Returns Finnhub's columnar payload (`t`, `o`, `h`, `l`, `c`, `v`
+        arrays); all arrays are empty when there is no data in the range.
+        """
+        url = f"{self.base_url}/stock/candle"
+        response = await self.client.get(
+            url,
+            params={
+                "symbol": symbol.upper(),
+                "resolution": resolution,
+                "from": start,
+                "to": end,
+            },
+        )
+        response.raise_for_status()
+        data = response.json()
+        if data.get("s") != "ok":
+            return {key: [] for key in ("t", "o", "h", "l", "c", "v")}
+        return data
+
 
 # Usage example
 async def main():
@@ -156,7 +206,7 @@ async def main():
             print(f"Percent change: {quote.percent_change}%")
             print(f"Day range: ${quote.low} - ${quote.high}")
         print(f"Previous close: ${quote.previous_close}")
-        await stock_price_service.close()
+        await close_market_data_client()
     except Exception as e:
         print(f"Failed to get price: {e}")
 
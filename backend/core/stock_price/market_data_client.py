@@ -0,0 +1,291 @@
+import asyncio
+import importlib.util
+import logging
+import os
+import time
+from collections import deque
+from typing import Deque, Dict
+
+import httpx
+from dotenv import load_dotenv
+
+from core.env import env_flag
+
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .rate_scheduler import Priority, RateScheduler
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+def _retry_after(response: httpx.Response) -> float | None:
+    try:
+        return float(response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None
+
+
+# Latency samples kept per host, and how many are needed before hedging
+LATENCY_WINDOW = 200
+MIN_HEDGE_SAMPLES = 20
+
+
+class MarketDataClient:
+    """Pooled HTTP client shared by every market-data call in the process.
+
+    Keeps connections alive between requests, paces calls through the rate
+    scheduler and caps how many calls may be in flight against a single
+    upstream host at once. A per-host circuit breaker fails calls fast while
+    the upstream keeps erroring, and with `hedge` enabled a second attempt is
+    sent once a call has run longer than the host's recent p95 latency.
+    """
+
+    def __init__(
+        self,
+        headers: dict | None = None,
+        *,
+        scheduler: RateScheduler | None = None,
+        max_connections: int = 20,
+        max_keepalive_connections: int = 10,
+        keepalive_expiry: float = 30.0,
+        http2: bool = False,
+        max_concurrency_per_host: int = 8,
+        timeout: float = 10.0,
+        connect_timeout: float = 5.0,
+        breaker_failure_threshold: int = 5,
+        breaker_reset_timeout: float = 30.0,
+        hedge: bool = False,
+        hedge_min_delay: float = 0.05,
+        transport: httpx.AsyncBaseTransport | None = None,
+    ):
+        if http2 and importlib.util.find_spec("h2") is None:
+            logger.warning("HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+            http2 = False
+
+        self.scheduler = scheduler
+        self.max_concurrency_per_host = max_concurrency_per_host
+        self._host_semaphores: Dict[str, asyncio.Semaphore] = {}
+        self.breaker_failure_threshold = breaker_failure_threshold
+        self.breaker_reset_timeout = breaker_reset_timeout
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self.hedge = hedge
+        self.hedge_min_delay = hedge_min_delay
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.hedges_sent = 0
+        self.hedge_wins = 0
+        self._client = httpx.AsyncClient(
+            headers=headers,
+            http2=http2,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_keepalive_connections,
+                keepalive_expiry=keepalive_expiry,
+            ),
+            timeout=httpx.Timeout(timeout, connect=connect_timeout),
+            transport=transport,
+        )
+
+    @classmethod
+    def from_env(cls) -> "MarketDataClient":
+        headers = {"Content-Type": "application/json"}
+        if api_key := os.getenv("FINHUB_API_KEY"):
+            headers["X-Finnhub-Token"] = api_key
+
+        return cls(
+            headers=headers,
+            scheduler=RateScheduler.from_env(),
+            max_connections=int(os.getenv("MARKET_DATA_MAX_CONNECTIONS", 20)),
+            max_keepalive_connections=int(
+                os.getenv("MARKET_DATA_MAX_KEEPALIVE_CONNECTIONS", 10)
+            ),
+            keepalive_expiry=float(os.getenv("MARKET_DATA_KEEPALIVE_EXPIRY", 30)),
+            http2=env_flag("MARKET_DATA_HTTP2"),
+            max_concurrency_per_host=int(
+                os.getenv("MARKET_DATA_MAX_CONCURRENCY_PER_HOST", 8)
+            ),
+            timeout=float(os.getenv("MARKET_DATA_TIMEOUT", 10)),
+            connect_timeout=float(os.getenv("MARKET_DATA_CONNECT_TIMEOUT", 5)),
+            breaker_failure_threshold=int(
+                os.getenv("MARKET_DATA_BREAKER_FAILURES", 5)
+            ),
+            breaker_reset_timeout=float(os.getenv("MARKET_DATA_BREAKER_RESET", 30)),
+            hedge=env_flag("MARKET_DATA_HEDGE"),
+            hedge_min_delay=float(os.getenv("MARKET_DATA_HEDGE_MIN_DELAY_MS", 50))
+            / 1000,
+        )
+
+    @property
+    def is_closed(self) -> bool:
+        return self._client.is_closed
+
+    def _semaphore_for(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = asyncio.Semaphore(
+                self.max_concurrency_per_host
+            )
+        return self._host_semaphores[host]
+
+    def _breaker_for(self, host: str) -> CircuitBreaker:
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(
+                host, self.breaker_failure_threshold, self.breaker_reset_timeout
+            )
+        return self._breakers[host]
+
+    def _hedge_delay(self, host: str) -> float | None:
+        """p95 of the host's recent latencies, or None until enough are known."""
+        samples = self._latencies.get(host)
+        if not self.hedge or not samples or len(samples) < MIN_HEDGE_SAMPLES:
+            return None
+        ordered = sorted(samples)
+        return max(self.hedge_min_delay, ordered[int(len(ordered) * 0.95)])
+
+    async def get(
+        self,
+        url: str,
+        *,
+        params: dict | None = None,
+        timeout: float | None = None,
+        priority: Priority | None = None,
+    ) -> httpx.Response:
+        """GET `url` through the shared pool.
+
+        Waits for a rate-limit token at `priority` (defaults to the calling
+        context's priority) and for a slot on the per-host semaphore. A 429
+        response drains the bucket and the call is retried once. Raises
+        `CircuitOpenError` without calling out while the host's circuit is open.
+        """
+        host = httpx.URL(url).host
+        breaker = self._breaker_for(host)
+        if not breaker.allow():
+            raise CircuitOpenError(f"Circuit open for {host}")
+
+        try:
+            response = await self._get(host, url, params, timeout, priority)
+        except httpx.TransportError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.release()
+            raise
+
+        if response.status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+        return response
+
+    async def _get(
+        self,
+        host: str,
+        url: str,
+        params: dict | None,
+        timeout: float | None,
+        priority: Priority | None,
+    ) -> httpx.Response:
+        for attempt in range(2):
+            if self.scheduler:
+                await self.scheduler.acquire(priority)
+            response = await self._send(host, url, params, timeout, priority)
+
+            if response.status_code != 429 or not self.scheduler or attempt:
+                return response
+            self.scheduler.penalize(_retry_after(response))
+        return response
+
+    async def _attempt(
+        self, host: str, url: str, params: dict | None, timeout: float | None
+    ) -> httpx.Response:
+        request_timeout = timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT
+        async with self._semaphore_for(host):
+            started = time.monotonic()
+            response = await self._client.get(
+                url, params=params, timeout=request_timeout
+            )
+        samples = self._latencies.setdefault(host, deque(maxlen=LATENCY_WINDOW))
+        samples.append(time.monotonic() - started)
+        return response
+
+    async def _send(
+        self,
+        host: str,
+        url: str,
+        params: dict | None,
+        timeout: float | None,
+        priority: Priority | None,
+    ) -> httpx.Response:
+        delay = self._hedge_delay(host)
+        if delay is None:
+            return await self._attempt(host, url, params, timeout)
+
+        first = asyncio.ensure_future(self._attempt(host, url, params, timeout))
+        done, _ = await asyncio.wait({first}, timeout=delay)
+        # Only hedge with a spare token, so hedges never delay queued calls
+        if done or (self.scheduler and not self.scheduler.try_acquire(priority)):
+            return await first
+
+        self.hedges_sent += 1
+        second = asyncio.ensure_future(self._attempt(host, url, params, timeout))
+        pending = {first, second}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is second:
+                            self.hedge_wins += 1
+                        return task.result()
+            # Both attempts failed; surface the original one's error
+            return first.result()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "scheduler": self.scheduler.snapshot() if self.scheduler else None,
+            "breakers": {
+                host: breaker.snapshot() for host, breaker in self._breakers.items()
+            },
+            "hedging": {
+                "enabled": self.hedge,
+                "sent": self.hedges_sent,
+                "wins": self.hedge_wins,
+                "delays": {
+                    host: round(delay, 4)
+                    for host in self._latencies
+                    if (delay := self._hedge_delay(host)) is not None
+                },
+            },
+        }
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+_market_data_client: MarketDataClient | None = None
+
+
+def init_market_data_client() -> MarketDataClient:
+    """Create the process-wide client. Called from the app lifespan."""
+    global _market_data_client
+    if _market_data_client is None or _market_data_client.is_closed:
+        _market_data_client = MarketDataClient.from_env()
+    return _market_data_client
+
+
+def get_market_data_client() -> MarketDataClient:
+    """Return the process-wide client, creating it lazily outside the app."""
+    if _market_data_client is None or _market_data_client.is_closed:
+        return init_market_data_client()
+    return _market_data_client
+
+
+async def close_market_data_client() -> None:
+    global _market_data_client
+    if _market_data_client is not None:
+        await _market_data_client.aclose()
+        _market_data_client = None
@@ -0,0 +1,77 @@
+import logging
+import os
+from typing import List, Protocol, runtime_checkable
+
+from dotenv import load_dotenv
+
+from .finnhub_schema import CompanyProfile, StockQuote
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+@runtime_checkable
+class MarketDataProvider(Protocol):
+    """Everything the domain services need from a market-data source.
+
+    `FinnhubService` is the production implementation; `RecordReplayProvider`
+    captures its responses to disk and serves them back offline.
+    """
+
+    async def get_stock_price(self, symbol: str) -> StockQuote: ...
+
+    async def get_stock_price_batch(self, symbols: List[str]) -> List[StockQuote]: ...
+
+    async def get_company_profile(self, symbol: str) -> CompanyProfile | None: ...
+
+    async def get_company_profile_batch(
+        self, symbols: List[str]
+    ) -> List[CompanyProfile]: ...
+
+    async def get_candles(
+        self, symbol: str, resolution: str, start: int, end: int
+    ) -> dict: ...
+
+    async def get_symbol_list(self, exchange: str = "US") -> List[dict]: ...
+
+
+_provider: MarketDataProvider | None = None
+
+
+def create_market_data_provider() -> MarketDataProvider:
+    """Build the provider selected by MARKET_DATA_PROVIDER (finnhub, record or replay)."""
+    from .finnhub_service import FinnhubService
+    from .record_replay_provider import RecordReplayProvider
+
+    kind = os.getenv("MARKET_DATA_PROVIDER", "finnhub").strip().lower()
+    if kind == "finnhub":
+        return FinnhubService()
+    if kind == "record":
+        return RecordReplayProvider.from_env(inner=FinnhubService())
+    if kind == "replay":
+        return RecordReplayProvider.from_env()
+    raise ValueError(f"Unknown MARKET_DATA_PROVIDER {kind!r}")
+
+
+def get_market_data_provider() -> MarketDataProvider:
+    """Process-wide provider, created on first use."""
+    global _provider
+    if _provider is None:
+        _provider = create_market_data_provider()
+        logger.info(f"Using market data provider {type(_provider).__name__}")
+    return _provider
+
+
+async def close_market_data_provider() -> None:
+    """Let the process-wide provider finish up, e.g. write out recordings."""
+    global _provider
+    if close := getattr(_provider, "close", None):
+        await close()
+    _provider = None
+
+
+def set_market_data_provider(provider: MarketDataProvider | None) -> None:
+    """Swap the process-wide provider, e.g. for a benchmark run."""
+    global _provider
+    _provider = provider
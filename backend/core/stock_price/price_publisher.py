@@ -0,0 +1,59 @@
+import asyncio
+import logging
+
+from core.event_hub import EventHub
+
+from .quote_book import QuoteBook
+
+logger = logging.getLogger(__name__)
+
+
+class PricePublisher:
+    """Turns quote-book updates into batched `price` events on the event hub.
+
+    Runs as a single shared producer: every `interval` seconds it drains the
+    symbols that changed and publishes one event per symbol, however many
+    ticks arrived in between.
+    """
+
+    def __init__(self, book: QuoteBook, hub: EventHub, interval: float = 1.0):
+        self.book = book
+        self.hub = hub
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                changes = self.book.drain_changes()
+                if not self.hub.has_subscribers:
+                    continue
+                for quote in changes:
+                    self.hub.publish(
+                        "price",
+                        {
+                            "symbol": quote.symbol,
+                            "currentPrice": quote.current_price,
+                            "priceChange": quote.change,
+                            "percentChange": quote.percent_change,
+                            "openPrice": quote.open_price,
+                            "previousClose": quote.previous_close,
+                            "timestamp": quote.timestamp,
+                        },
+                    )
+            except Exception as e:
+                logger.warning(f"Failed to publish price changes: {e}")
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Tuple
+
+from dotenv import load_dotenv
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database.db import engine
+from database.models import CompanyProfileRecord
+
+from .rate_scheduler import Priority, prioritized
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PROFILE_MAX_AGE = 7 * 86400
+
+ProfileFetcher = Callable[[str], Awaitable[dict | None]]
+
+
+@dataclass
+class ProfileStoreStats:
+    hits: int = 0
+    misses: int = 0
+    refreshes: int = 0
+    failures: int = 0
+
+
+def _epoch(value: datetime) -> float:
+    # SQLite hands back naive datetimes; they were written as UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class ProfileStore:
+    """Company profiles persisted in the `company_profile` table and mirrored in memory.
+
+    `load()` reads every stored profile at startup so lookups after a restart
+    need no network call. Profiles older than `max_age` are still served, and
+    a background refresh is started for them.
+    """
+
+    def __init__(self, max_age: float = DEFAULT_PROFILE_MAX_AGE):
+        self.max_age = max_age
+        self.stats = ProfileStoreStats()
+        self._profiles: Dict[str, Tuple[float, dict]] = {}
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._profiles)
+
+    async def load(self) -> int:
+        """Replace the in-memory copy with the contents of the table."""
+        async with AsyncSession(engine) as session:
+            records = (await session.exec(select(CompanyProfileRecord))).all()
+        self._profiles = {
+            record.symbol: (_epoch(record.refreshed_at), record.data)
+            for record in records
+        }
+        logger.info(f"Loaded {len(self._profiles)} company profiles")
+        return len(self._profiles)
+
+    def is_stale(self, symbol: str) -> bool:
+        entry = self._profiles.get(symbol.upper())
+        return entry is None or time.time() - entry[0] > self.max_age
+
+    async def get_or_fetch(self, symbol: str, fetch: ProfileFetcher) -> dict | None:
+        """Return the stored profile for `symbol`, fetching it only if never seen."""
+        key = symbol.upper()
+
+        if entry := self._profiles.get(key):
+            self.stats.hits += 1
+            if self.is_stale(key) and key not in self._in_flight:
+                self.stats.refreshes += 1
+                with prioritized(Priority.BULK):
+                    self._start_fetch(key, fetch)
+            return entry[1]
+
+        self.stats.misses += 1
+        # Shield so a cancelled caller does not abort a fetch others may share
+        return await asyncio.shield(self._start_fetch(key, fetch))
+
+    def _start_fetch(self, key: str, fetch: ProfileFetcher) -> asyncio.Task:
+        if pending := self._in_flight.get(key):
+            return pending
+        task = asyncio.create_task(self._fetch_and_store(key, fetch))
+        # Retrieve the outcome even if nobody awaits a background refresh
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._in_flight[key] = task
+        return task
+
+    async def _load_one(self, key: str) -> dict | None:
+        async with AsyncSession(engine) as session:
+            record = await session.get(CompanyProfileRecord, key)
+        if record is None or time.time() - _epoch(record.refreshed_at) > self.max_age:
+            return None
+        self._profiles[key] = (_epoch(record.refreshed_at), record.data)
+        return record.data
+
+    async def _fetch_and_store(self, key: str, fetch: ProfileFetcher) -> dict | None:
+        try:
+            # Another worker sharing the database may have stored it already
+            if key not in self._profiles and (data := await self._load_one(key)):
+                return data
+
+            data = await fetch(key)
+            if data is None:
+                # Keep serving whatever we had before rather than forgetting it
+                entry = self._profiles.get(key)
+                return entry[1] if entry else None
+
+            refreshed_at = datetime.now(timezone.utc)
+            self._profiles[key] = (refreshed_at.timestamp(), data)
+            await self._persist(key, data, refreshed_at)
+            return data
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def _persist(self, key: str, data: dict, refreshed_at: datetime) -> None:
+        try:
+            async with AsyncSession(engine) as session:
+                await session.merge(
+                    CompanyProfileRecord(
+                        symbol=key, data=data, refreshed_at=refreshed_at
+                    )
+                )
+                await session.commit()
+        except Exception as e:
+            self.stats.failures += 1
+            logger.warning(f"Failed to persist company profile for {key}: {e}")
+
+    async def close(self) -> None:
+        """Cancel background refreshes that are still running."""
+        tasks = list(self._in_flight.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def snapshot(self) -> dict:
+        return {
+            "max_age": self.max_age,
+            "size": len(self._profiles),
+            "in_flight": len(self._in_flight),
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "refreshes": self.stats.refreshes,
+            "failures": self.stats.failures,
+        }
+
+
+profile_store = ProfileStore(
+    max_age=float(os.getenv("PROFILE_MAX_AGE", DEFAULT_PROFILE_MAX_AGE))
+)
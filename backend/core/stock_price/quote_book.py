@@ -0,0 +1,184 @@
+import math
+import os
+import time
+from array import array
+from typing import Dict, Iterable, List, NamedTuple, Set
+
+from dotenv import load_dotenv
+
+from .finnhub_schema import StockQuote
+
+load_dotenv()
+
+NAN = float("nan")
+# Quotes older than this are flagged as stale in responses
+STALE_QUOTE_AFTER = float(os.getenv("STALE_QUOTE_AFTER", 180))
+
+
+class BookQuote(NamedTuple):
+    """Read-only view of one row of the quote book.
+
+    Attribute names mirror StockQuote so callers can use either interchangeably.
+    """
+
+    symbol: str
+    current_price: float
+    change: float
+    percent_change: float
+    high: float
+    low: float
+    open_price: float
+    previous_close: float
+    timestamp: int
+    updated_at: float
+
+
+def _optional(value: float) -> float | None:
+    return None if math.isnan(value) else value
+
+
+class QuoteBook:
+    """Array-backed in-memory store of the latest quote per symbol.
+
+    Each field lives in its own `array('d')` column indexed by a per-symbol
+    slot, so a tick update is a handful of float writes rather than a new
+    pydantic object.
+    """
+
+    def __init__(self):
+        self._slots: Dict[str, int] = {}
+        self._symbols: List[str] = []
+        self._price = array("d")
+        self._high = array("d")
+        self._low = array("d")
+        self._open = array("d")
+        self._prev_close = array("d")
+        self._timestamp = array("d")
+        self._updated_at = array("d")
+        self._dirty: Set[int] = set()
+        self.version = 0
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.upper() in self._slots
+
+    def _slot(self, symbol: str) -> int:
+        key = symbol.upper()
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = len(self._symbols)
+            self._slots[key] = slot
+            self._symbols.append(key)
+            for column in (
+                self._price,
+                self._high,
+                self._low,
+                self._open,
+                self._prev_close,
+                self._timestamp,
+                self._updated_at,
+            ):
+                column.append(NAN)
+        return slot
+
+    def update_from_quote(self, quote: StockQuote) -> None:
+        """Store a full REST snapshot for the symbol."""
+        slot = self._slot(quote.symbol)
+        self._price[slot] = quote.current_price
+        self._high[slot] = quote.high
+        self._low[slot] = quote.low
+        self._open[slot] = quote.open_price
+        self._prev_close[slot] = quote.previous_close
+        self._timestamp[slot] = quote.timestamp
+        self._updated_at[slot] = time.time()
+        self._dirty.add(slot)
+        self.version += 1
+
+    def apply_tick(self, symbol: str, price: float, timestamp: float) -> bool:
+        """Apply a last-trade tick. Returns True if the stored price changed."""
+        slot = self._slot(symbol)
+        if self._timestamp[slot] > timestamp:
+            return False  # out-of-order tick
+
+        changed = self._price[slot] != price
+        self._price[slot] = price
+        if math.isnan(self._high[slot]) or price > self._high[slot]:
+            self._high[slot] = price
+        if math.isnan(self._low[slot]) or price < self._low[slot]:
+            self._low[slot] = price
+        self._timestamp[slot] = timestamp
+        self._updated_at[slot] = time.time()
+        if changed:
+            self._dirty.add(slot)
+            self.version += 1
+        return changed
+
+    def get(self, symbol: str) -> BookQuote | None:
+        slot = self._slots.get(symbol.upper())
+        if slot is None or math.isnan(self._price[slot]):
+            return None
+
+        price = self._price[slot]
+        prev_close = self._prev_close[slot]
+        change = price - prev_close if not math.isnan(prev_close) else NAN
+        percent_change = (
+            change / prev_close * 100 if prev_close and not math.isnan(change) else NAN
+        )
+        timestamp = self._timestamp[slot]
+        return BookQuote(
+            symbol=self._symbols[slot],
+            current_price=price,
+            change=_optional(change),
+            percent_change=_optional(percent_change),
+            high=_optional(self._high[slot]),
+            low=_optional(self._low[slot]),
+            open_price=_optional(self._open[slot]),
+            previous_close=_optional(prev_close),
+            timestamp=0 if math.isnan(timestamp) else int(timestamp),
+            updated_at=self._updated_at[slot],
+        )
+
+    def apply_quote(self, quote: BookQuote) -> bool:
+        """Copy a row read from another book if it is newer than ours."""
+        slot = self._slot(quote.symbol)
+        if self._updated_at[slot] >= quote.updated_at:
+            return False
+
+        changed = self._price[slot] != quote.current_price
+        self._price[slot] = quote.current_price
+        self._high[slot] = NAN if quote.high is None else quote.high
+        self._low[slot] = NAN if quote.low is None else quote.low
+        self._open[slot] = NAN if quote.open_price is None else quote.open_price
+        self._prev_close[slot] = (
+            NAN if quote.previous_close is None else quote.previous_close
+        )
+        self._timestamp[slot] = quote.timestamp
+        self._updated_at[slot] = quote.updated_at
+        if changed:
+            self._dirty.add(slot)
+            self.version += 1
+        return changed
+
+    def price_map(self, symbols: Iterable[str]) -> Dict[str, BookQuote]:
+        """Latest quotes for `symbols`, keyed by the symbol as given."""
+        quotes: Dict[str, BookQuote] = {}
+        for symbol in symbols:
+            if quote := self.get(symbol):
+                quotes[symbol] = quote
+        return quotes
+
+    def drain_changes(self) -> List[BookQuote]:
+        """Quotes updated since the previous call, for change notifications."""
+        dirty, self._dirty = self._dirty, set()
+        return [quote for slot in dirty if (quote := self.get(self._symbols[slot]))]
+
+    def symbols(self) -> List[str]:
+        return list(self._symbols)
+
+    def quotes(self) -> List[BookQuote]:
+        return [quote for symbol in self._symbols if (quote := self.get(symbol))]
+
+
+quote_book = QuoteBook()
@@ -0,0 +1,105 @@
+import asyncio
+import logging
+import os
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable, Dict, Tuple
+
+from dotenv import load_dotenv
+
+from .finnhub_schema import StockQuote
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUOTE_TTL = 5.0
+
+
+@dataclass
+class QuoteCacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+
+
+class QuoteCache:
+    """Process-wide TTL cache for stock quotes with single-flight fetching.
+
+    Concurrent lookups for the same symbol share one pending upstream call
+    instead of each issuing their own.
+    """
+
+    def __init__(self, ttl: float = DEFAULT_QUOTE_TTL):
+        self.ttl = ttl
+        self.stats = QuoteCacheStats()
+        self._entries: Dict[str, Tuple[float, StockQuote]] = {}
+        self._in_flight: Dict[str, asyncio.Future] = {}
+
+    def peek(self, symbol: str) -> StockQuote | None:
+        """Return the cached quote if it is still fresh, without fetching."""
+        entry = self._entries.get(symbol.upper())
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def last_known(self, symbol: str) -> StockQuote | None:
+        """Return the most recent cached quote, however old it is."""
+        entry = self._entries.get(symbol.upper())
+        return entry[1] if entry else None
+
+    def put(self, quote: StockQuote) -> None:
+        self._entries[quote.symbol.upper()] = (time.monotonic() + self.ttl, quote)
+
+    def invalidate(self, symbol: str | None = None) -> None:
+        if symbol is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(symbol.upper(), None)
+
+    async def get_or_fetch(
+        self, symbol: str, fetch: Callable[[str], Awaitable[StockQuote]]
+    ) -> StockQuote:
+        """Return a fresh quote for `symbol`, fetching it at most once at a time."""
+        key = symbol.upper()
+
+        if quote := self.peek(key):
+            self.stats.hits += 1
+            return quote
+
+        if pending := self._in_flight.get(key):
+            self.stats.coalesced += 1
+            # Shield so one cancelled waiter does not cancel the shared fetch
+            return await asyncio.shield(pending)
+
+        self.stats.misses += 1
+        # Run the fetch as its own task so a cancelled caller does not abort it
+        # for everyone else waiting on the same symbol
+        task = asyncio.ensure_future(self._fetch_and_store(key, symbol, fetch))
+        # Retrieve the outcome even if every waiter was cancelled
+        task.add_done_callback(lambda t: t.cancelled() or t.exception())
+        self._in_flight[key] = task
+        return await asyncio.shield(task)
+
+    async def _fetch_and_store(
+        self, key: str, symbol: str, fetch: Callable[[str], Awaitable[StockQuote]]
+    ) -> StockQuote:
+        try:
+            quote = await fetch(symbol)
+            self.put(quote)
+            return quote
+        finally:
+            self._in_flight.pop(key, None)
+
+    def snapshot(self) -> dict:
+        return {
+            "ttl": self.ttl,
+            "size": len(self._entries),
+            "in_flight": len(self._in_flight),
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "coalesced": self.stats.coalesced,
+        }
+
+
+quote_cache = QuoteCache(ttl=float(os.getenv("QUOTE_CACHE_TTL", DEFAULT_QUOTE_TTL)))
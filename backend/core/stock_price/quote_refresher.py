@@ -0,0 +1,209 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Set
+
+from dotenv import load_dotenv
+
+from .market_data_provider import MarketDataProvider
+from .quote_book import QuoteBook
+from .quote_share import get_quote_share
+from .rate_scheduler import Priority, prioritized
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+SymbolSource = Callable[[], Awaitable[Set[str]]]
+ProviderSource = Callable[[], MarketDataProvider]
+
+
+class QuoteRefresher:
+    """Keeps the quote book fresh for every active trade symbol in the background.
+
+    Each symbol is refreshed every `interval` seconds, or every `hot_interval`
+    seconds while it has been viewed within the last `hot_window` seconds.
+    Request handlers read the book and never wait on the provider.
+    """
+
+    def __init__(
+        self,
+        book: QuoteBook,
+        symbol_source: SymbolSource,
+        provider: ProviderSource,
+        *,
+        interval: float = 60.0,
+        hot_interval: float = 15.0,
+        hot_window: float = 300.0,
+    ):
+        self.book = book
+        self.symbol_source = symbol_source
+        self.provider = provider
+        self.interval = interval
+        self.hot_interval = hot_interval
+        self.hot_window = hot_window
+        self.symbols: Set[str] = set()
+        self.refreshes = 0
+        self.failures = 0
+        self._refreshed: Dict[str, float] = {}
+        self._viewed: Dict[str, float] = {}
+        self._resync = True
+        self._synced_at = 0.0
+        self._wake = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_env(
+        cls, book: QuoteBook, symbol_source: SymbolSource, provider: ProviderSource
+    ) -> "QuoteRefresher":
+        return cls(
+            book,
+            symbol_source,
+            provider,
+            interval=float(os.getenv("QUOTE_REFRESH_INTERVAL", 60)),
+            hot_interval=float(os.getenv("QUOTE_REFRESH_HOT_INTERVAL", 15)),
+            hot_window=float(os.getenv("QUOTE_REFRESH_HOT_WINDOW", 300)),
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def request_resync(self) -> None:
+        """Re-read the active symbol set before the next refresh."""
+        self._resync = True
+        self._wake.set()
+
+    def mark_viewed(self, symbols: Iterable[str]) -> None:
+        """Refresh `symbols` on the hot interval for the next `hot_window` seconds.
+
+        Symbols outside the active set are ignored, so arbitrary symbols
+        from requests cannot grow the map.
+        """
+        now = time.monotonic()
+        for symbol in symbols:
+            key = symbol.upper()
+            if key not in self.symbols:
+                continue
+            was_hot = self._is_hot(key, now)
+            self._viewed[key] = now
+            if not was_hot:
+                self._wake.set()
+
+    def _is_hot(self, symbol: str, now: float) -> bool:
+        viewed = self._viewed.get(symbol)
+        return viewed is not None and now - viewed < self.hot_window
+
+    def _period(self, symbol: str, now: float) -> float:
+        return self.hot_interval if self._is_hot(symbol, now) else self.interval
+
+    def _due(self, now: float) -> list[str]:
+        return sorted(
+            symbol
+            for symbol in self.symbols
+            if now - self._refreshed.get(symbol, float("-inf"))
+            >= self._period(symbol, now)
+        )
+
+    def _next_wakeup(self, now: float) -> float:
+        waits = [
+            self._refreshed.get(symbol, now) + self._period(symbol, now) - now
+            for symbol in self.symbols
+        ]
+        # Re-read the symbol set at least once per interval as well
+        waits.append(self._synced_at + self.interval - now)
+        return max(0.5, min(waits))
+
+    async def _sync_symbols(self) -> None:
+        self.symbols = {symbol.upper() for symbol in await self.symbol_source()}
+        self._synced_at = time.monotonic()
+        self._resync = False
+        for symbol in set(self._refreshed) - self.symbols:
+            del self._refreshed[symbol]
+        for symbol in set(self._viewed) - self.symbols:
+            del self._viewed[symbol]
+
+    async def _refresh(self, symbols: list[str]) -> None:
+        with prioritized(Priority.BULK):
+            quotes = await self.provider().get_stock_price_batch(symbols)
+        now = time.monotonic()
+        for quote in quotes:
+            self.book.update_from_quote(quote)
+        # Failed symbols wait for their next period too instead of spinning
+        for symbol in symbols:
+            self._refreshed[symbol] = now
+        self.refreshes += len(quotes)
+        self.failures += len(symbols) - len(quotes)
+
+    async def _run(self) -> None:
+        while True:
+            self._wake.clear()
+            try:
+                if self._resync or time.monotonic() - self._synced_at >= self.interval:
+                    await self._sync_symbols()
+                if due := self._due(time.monotonic()):
+                    await self._refresh(due)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Quote refresh failed: {e}")
+
+            try:
+                await asyncio.wait_for(
+                    self._wake.wait(), self._next_wakeup(time.monotonic())
+                )
+            except asyncio.TimeoutError:
+                pass
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        return {
+            "running": self.running,
+            "symbols": len(self.symbols),
+            "hot": sum(1 for symbol in self.symbols if self._is_hot(symbol, now)),
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+        }
+
+
+_quote_refresher: QuoteRefresher | None = None
+
+
+def set_quote_refresher(refresher: QuoteRefresher | None) -> None:
+    global _quote_refresher
+    _quote_refresher = refresher
+
+
+def get_quote_refresher() -> QuoteRefresher | None:
+    return _quote_refresher
+
+
+# On a worker without a refresher these go to the leading worker instead
+
+
+def mark_symbols_viewed(symbols: Iterable[str]) -> None:
+    if _quote_refresher is not None:
+        _quote_refresher.mark_viewed(symbols)
+    elif share := get_quote_share():
+        share.mark_viewed(symbols)
+
+
+def resync_quote_refresher() -> None:
+    if _quote_refresher is not None:
+        _quote_refresher.request_resync()
+    elif share := get_quote_share():
+        share.symbols_changed()
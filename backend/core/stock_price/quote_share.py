@@ -0,0 +1,172 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Dict, Iterable, Set
+
+from fastapi_cache import FastAPICache
+
+from core.cache.version_store import VersionStore
+
+from .quote_book import BookQuote, QuoteBook
+
+logger = logging.getLogger(__name__)
+
+# Version-store counters moved by followers and watched by the leader
+SYMBOLS_COUNTER = "quotes:symbols"
+VIEWED_COUNTER = "quotes:viewed:"
+
+
+class QuoteShare:
+    """Shares one worker's quote book with the other workers through the cache.
+
+    Only the worker holding the lead (see `try_lead`) talks to the market-data
+    upstream; it publishes its book every `interval` seconds. The others copy
+    newer rows into their own book, and keep trying to take the lead so a
+    replacement starts `on_lead` if the leading worker exits.
+
+    Followers pass symbol-set changes and viewed symbols on to the leader by
+    bumping counters in the shared version store; the leader reads them
+    back each round and calls `on_symbols_changed` / `on_viewed`.
+    """
+
+    def __init__(
+        self,
+        book: QuoteBook,
+        try_lead: Callable[[], bool],
+        on_lead: Callable[[], Awaitable[None]],
+        store: VersionStore,
+        on_symbols_changed: Callable[[], None],
+        on_viewed: Callable[[Iterable[str]], None],
+        *,
+        interval: float = 2.0,
+    ):
+        self.book = book
+        self.try_lead = try_lead
+        self.on_lead = on_lead
+        self.store = store
+        self.on_symbols_changed = on_symbols_changed
+        self.on_viewed = on_viewed
+        self.interval = interval
+        self.leader = False
+        self.published = 0
+        self.applied = 0
+        self.forwarded = 0
+        self.received = 0
+        self._symbols_changed = False
+        self._viewed: Set[str] = set()
+        self._counters: Dict[str, int] | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{FastAPICache.get_prefix()}:quotes:book"
+
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def publish(self) -> None:
+        rows = [tuple(quote) for quote in self.book.quotes()]
+        await FastAPICache.get_backend().set(
+            self.key,
+            FastAPICache.get_coder().encode(rows),
+            # Followers stop trusting the copy if the leader stops refreshing it
+            expire=int(self.interval * 10) + 1,
+        )
+        self.published += 1
+
+    async def pull(self) -> None:
+        cached = await FastAPICache.get_backend().get(self.key)
+        if cached is None:
+            return
+        for row in FastAPICache.get_coder().decode(cached):
+            if self.book.apply_quote(BookQuote(*row)):
+                self.applied += 1
+
+    def symbols_changed(self) -> None:
+        """On a follower, have the leader re-read the active symbol set."""
+        if not self.leader:
+            self._symbols_changed = True
+
+    def mark_viewed(self, symbols: Iterable[str]) -> None:
+        """On a follower, have the leader refresh `symbols` on the hot interval."""
+        if not self.leader:
+            # Symbols the leader does not hold are not refreshed anyway
+            self._viewed.update(key for s in symbols if (key := s.upper()) in self.book)
+
+    async def forward(self) -> None:
+        names = [VIEWED_COUNTER + symbol for symbol in sorted(self._viewed)]
+        if self._symbols_changed:
+            names.append(SYMBOLS_COUNTER)
+        self._viewed, self._symbols_changed = set(), False
+        if names:
+            await self.store.incr(names)
+            self.forwarded += len(names)
+
+    async def receive(self) -> None:
+        names = [SYMBOLS_COUNTER, *(VIEWED_COUNTER + s for s in self.book.symbols())]
+        counters = await self.store.get(names)
+        # The first read only sets the baseline
+        previous, self._counters = self._counters, counters
+        if previous is None:
+            return
+        changed = [name for name in names if counters[name] != previous.get(name, 0)]
+        if not changed:
+            return
+        self.received += len(changed)
+        if SYMBOLS_COUNTER in changed:
+            self.on_symbols_changed()
+        viewed = [n[len(VIEWED_COUNTER) :] for n in changed if n != SYMBOLS_COUNTER]
+        if viewed:
+            self.on_viewed(viewed)
+
+    async def _step(self) -> None:
+        if not self.leader and self.try_lead():
+            self.leader = True
+            logger.info("Taking over market-data refreshes for all workers")
+            await self.on_lead()
+        if self.leader:
+            await self.publish()
+            await self.receive()
+        else:
+            await self.pull()
+            await self.forward()
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._step()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Quote sharing failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    def snapshot(self) -> dict:
+        return {
+            "leader": self.leader,
+            "published": self.published,
+            "applied": self.applied,
+            "forwarded": self.forwarded,
+            "received": self.received,
+        }
+
+
+_quote_share: QuoteShare | None = None
+
+
+def set_quote_share(share: QuoteShare | None) -> None:
+    global _quote_share
+    _quote_share = share
+
+
+def get_quote_share() -> QuoteShare | None:
+    return _quote_share
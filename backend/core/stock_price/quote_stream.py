@@ -0,0 +1,207 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Awaitable, Callable, Set
+
+from dotenv import load_dotenv
+
+from .quote_book import QuoteBook
+from .quote_share import get_quote_share
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WS_URL = "wss://ws.finnhub.io"
+
+SymbolSource = Callable[[], Awaitable[Set[str]]]
+SnapshotLoader = Callable[[list[str]], Awaitable[None]]
+
+
+class QuoteStream:
+    """Keeps the quote book current from a Finnhub-style trade websocket.
+
+    Subscriptions follow the set returned by `symbol_source`; call
+    `request_resync()` whenever that set may have changed. New symbols are
+    seeded with a REST snapshot so open/previous-close are known before the
+    first tick arrives.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        book: QuoteBook,
+        symbol_source: SymbolSource,
+        load_snapshots: SnapshotLoader | None = None,
+        *,
+        reconnect_delay: float = 5.0,
+        resync_debounce: float = 0.5,
+        record_path: str | None = None,
+    ):
+        self.url = url
+        self.book = book
+        self.symbol_source = symbol_source
+        self.load_snapshots = load_snapshots
+        self.reconnect_delay = reconnect_delay
+        self.resync_debounce = resync_debounce
+        self.record_path = record_path
+        self.subscribed: Set[str] = set()
+        self.ticks = 0
+        self.connected = False
+        self._resync = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    @classmethod
+    def from_env(
+        cls,
+        book: QuoteBook,
+        symbol_source: SymbolSource,
+        load_snapshots: SnapshotLoader | None = None,
+    ) -> "QuoteStream":
+        url = os.getenv("FINNHUB_WS_URL", DEFAULT_WS_URL)
+        if token := os.getenv("FINHUB_API_KEY"):
+            url = f"{url}{'&' if '?' in url else '?'}token={token}"
+        return cls(
+            url,
+            book,
+            symbol_source,
+            load_snapshots,
+            reconnect_delay=float(os.getenv("QUOTE_STREAM_RECONNECT_DELAY", 5)),
+            record_path=os.getenv("QUOTE_STREAM_RECORD_PATH"),
+        )
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if not self.running:
+            self._resync.set()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.connected = False
+
+    def request_resync(self) -> None:
+        """Re-read the wanted symbol set and adjust subscriptions."""
+        self._resync.set()
+
+    async def _run(self) -> None:
+        import websockets
+
+        while True:
+            try:
+                async with websockets.connect(self.url) as ws:
+                    self.connected = True
+                    self.subscribed.clear()
+                    self._resync.set()
+                    logger.info("Quote stream connected")
+                    await self._pump(ws)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Quote stream disconnected: {e}")
+            self.connected = False
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _pump(self, ws) -> None:
+        reader = asyncio.create_task(self._read(ws))
+        try:
+            while not reader.done():
+                resync = asyncio.create_task(self._resync.wait())
+                await asyncio.wait({reader, resync}, return_when=asyncio.FIRST_COMPLETED)
+                if resync.done():
+                    await asyncio.sleep(self.resync_debounce)
+                    self._resync.clear()
+                    await self._sync_subscriptions(ws)
+                else:
+                    resync.cancel()
+            reader.result()
+        finally:
+            reader.cancel()
+
+    async def _sync_subscriptions(self, ws) -> None:
+        wanted = {s.upper() for s in await self.symbol_source()}
+        added = wanted - self.subscribed
+        removed = self.subscribed - wanted
+
+        if added and self.load_snapshots:
+            try:
+                await self.load_snapshots(sorted(added))
+            except Exception as e:
+                logger.warning(f"Failed to seed quotes for {sorted(added)}: {e}")
+
+        for symbol in sorted(removed):
+            await ws.send(json.dumps({"type": "unsubscribe", "symbol": symbol}))
+        for symbol in sorted(added):
+            await ws.send(json.dumps({"type": "subscribe", "symbol": symbol}))
+        self.subscribed = wanted
+        if added or removed:
+            logger.info(f"Quote stream subscriptions: +{len(added)} -{len(removed)}")
+
+    async def _read(self, ws) -> None:
+        record = open(self.record_path, "a") if self.record_path else None
+        try:
+            async for raw in ws:
+                if record:
+                    record.write(raw if isinstance(raw, str) else raw.decode())
+                    record.write("\n")
+                self.handle_message(raw)
+        finally:
+            if record:
+                record.close()
+
+    def handle_message(self, raw: str | bytes) -> None:
+        message = json.loads(raw)
+        if message.get("type") != "trade":
+            return
+        # Collapse each batch to the latest tick per symbol before touching the book
+        latest: dict[str, tuple[float, float]] = {}
+        for trade in message.get("data") or []:
+            latest[trade["s"]] = (trade["p"], trade["t"] / 1000)
+        for symbol, (price, timestamp) in latest.items():
+            self.book.apply_tick(symbol, price, timestamp)
+        self.ticks += len(latest)
+
+    def snapshot(self) -> dict:
+        return {
+            "running": self.running,
+            "connected": self.connected,
+            "subscribed": len(self.subscribed),
+            "ticks": self.ticks,
+        }
+
+
+_quote_stream: QuoteStream | None = None
+
+
+def set_quote_stream(stream: QuoteStream | None) -> None:
+    global _quote_stream
+    _quote_stream = stream
+
+
+def get_quote_stream() -> QuoteStream | None:
+    return _quote_stream
+
+
+def is_streaming() -> bool:
+    return _quote_stream is not None and _quote_stream.running
+
+
+def notify_symbols_changed() -> None:
+    """Tell the stream that the set of watched symbols may have changed.
+
+    On a worker without one, the change is passed on to the leading worker.
+    """
+    if _quote_stream is not None:
+        _quote_stream.request_resync()
+    elif share := get_quote_share():
+        share.symbols_changed()
@@ -0,0 +1,199 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from enum import IntEnum
+from typing import Dict, List
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+
+class Priority(IntEnum):
+    """Lower values are served first."""
+
+    INTERACTIVE = 0
+    BULK = 1
+
+
+_current_priority: ContextVar[Priority] = ContextVar(
+    "market_data_priority", default=Priority.BULK
+)
+
+
+@contextlib.contextmanager
+def prioritized(priority: Priority):
+    """Run outbound market-data calls made inside the block at `priority`."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority() -> Priority:
+    return _current_priority.get()
+
+
+@dataclass(order=True)
+class _Waiter:
+    priority: int
+    seq: int
+    enqueued_at: float = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+@dataclass
+class _PriorityStats:
+    granted: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+class RateScheduler:
+    """Token-bucket pacer for outbound calls against a per-minute quota.
+
+    Callers that find the bucket empty are queued and released in priority
+    order as tokens refill, so interactive lookups overtake bulk enrichment.
+    """
+
+    def __init__(self, calls_per_minute: int, burst: int | None = None):
+        self.rate = calls_per_minute / 60.0
+        self.capacity = float(burst if burst is not None else calls_per_minute)
+        self._tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters: List[_Waiter] = []
+        self._seq = itertools.count()
+        self._drain_task: asyncio.Task | None = None
+        self._stats: Dict[Priority, _PriorityStats] = {
+            p: _PriorityStats() for p in Priority
+        }
+        self.throttled = 0
+
+    @classmethod
+    def from_env(cls) -> "RateScheduler":
+        calls_per_minute = int(os.getenv("FINNHUB_CALLS_PER_MINUTE", 60))
+        return cls(
+            calls_per_minute=calls_per_minute,
+            burst=int(os.getenv("FINNHUB_BURST", min(calls_per_minute, 10))),
+        )
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated_at) * self.rate
+        )
+        self._updated_at = now
+
+    def _record(self, priority: Priority, waited: float) -> None:
+        stats = self._stats[priority]
+        stats.granted += 1
+        stats.total_wait += waited
+        stats.max_wait = max(stats.max_wait, waited)
+
+    def try_acquire(self, priority: Priority | None = None) -> bool:
+        """Take a token only if one is free right now and nobody is queued."""
+        priority = current_priority() if priority is None else priority
+        self._refill()
+        if (
+            not self.queue_depth
+            and self._tokens >= 1
+            and time.monotonic() >= self._blocked_until
+        ):
+            self._tokens -= 1
+            self._record(priority, 0.0)
+            return True
+        return False
+
+    async def acquire(self, priority: Priority | None = None) -> None:
+        """Wait until a call may be made at `priority` (defaults to the context's)."""
+        priority = current_priority() if priority is None else priority
+        if self.try_acquire(priority):
+            return
+
+        now = time.monotonic()
+
+        waiter = _Waiter(
+            priority=priority,
+            seq=next(self._seq),
+            enqueued_at=now,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        heapq.heappush(self._waiters, waiter)
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain())
+
+        await waiter.future
+
+    async def _drain(self) -> None:
+        while self._waiters:
+            # Skip waiters whose callers were cancelled while queued
+            while self._waiters and self._waiters[0].future.done():
+                heapq.heappop(self._waiters)
+            if not self._waiters:
+                break
+
+            self._refill()
+            now = time.monotonic()
+            delay = max(
+                self._blocked_until - now,
+                (1 - self._tokens) / self.rate if self._tokens < 1 else 0.0,
+            )
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            waiter = heapq.heappop(self._waiters)
+            if waiter.future.done():
+                continue
+            self._tokens -= 1
+            self._record(Priority(waiter.priority), now - waiter.enqueued_at)
+            waiter.future.set_result(None)
+
+    def penalize(self, retry_after: float | None = None) -> None:
+        """Back off after the upstream rejected a call for exceeding its quota."""
+        self.throttled += 1
+        self._refill()
+        self._tokens = 0.0
+        if retry_after:
+            self._blocked_until = max(
+                self._blocked_until, time.monotonic() + retry_after
+            )
+        logger.warning(f"Upstream rate limit hit; backing off for {retry_after or 0}s")
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for w in self._waiters if not w.future.done())
+
+    def snapshot(self) -> dict:
+        self._refill()
+        queued: Dict[Priority, int] = {p: 0 for p in Priority}
+        for waiter in self._waiters:
+            if not waiter.future.done():
+                queued[Priority(waiter.priority)] += 1
+
+        return {
+            "calls_per_minute": round(self.rate * 60),
+            "burst": int(self.capacity),
+            "tokens": round(self._tokens, 2),
+            "queue_depth": sum(queued.values()),
+            "throttled": self.throttled,
+            "priorities": {
+                p.name.lower(): {
+                    "queued": queued[p],
+                    "granted": s.granted,
+                    "avg_wait": round(s.total_wait / s.granted, 4) if s.granted else 0.0,
+                    "max_wait": round(s.max_wait, 4),
+                }
+                for p, s in self._stats.items()
+            },
+        }
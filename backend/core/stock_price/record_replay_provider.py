@@ -0,0 +1,230 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import random
+from typing import Dict, List, Set, cast
+
+import httpx
+from dotenv import load_dotenv
+from fastapi import HTTPException
+
+from .finnhub_schema import CompanyProfile, StockQuote
+from .market_data_provider import MarketDataProvider
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RECORD_DIR = "recordings"
+# Recordings are written this long after the first unsaved one
+DEFAULT_FLUSH_DELAY = 1.0
+
+_CANDLE_KEYS = ("t", "o", "h", "l", "c", "v")
+
+
+class ReplayMiss(LookupError):
+    """No recording exists for the requested call."""
+
+
+class RecordReplayProvider:
+    """Market-data provider that records another provider's answers or replays them.
+
+    With `inner` set, every call is forwarded and its result kept for one
+    JSON file per kind (quotes, profiles, candles, symbols) in `directory`;
+    the files are rewritten off the event loop at most every `flush_delay`
+    seconds, and by `close()`.
+    Without it, calls are answered from those files. Replayed calls sleep for
+    `latency` ± `jitter` seconds and fail with probability `error_rate`; both
+    are drawn from an RNG seeded with `seed`, so a run is repeatable.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_RECORD_DIR,
+        inner: MarketDataProvider | None = None,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+        flush_delay: float = DEFAULT_FLUSH_DELAY,
+    ):
+        self.directory = directory
+        self.inner = inner
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self._rng = random.Random(seed)
+        self._data: Dict[str, dict] = {}
+        self.flush_delay = flush_delay
+        self._dirty: Set[str] = set()
+        self._flush_task: asyncio.Task | None = None
+
+    @classmethod
+    def from_env(
+        cls, inner: MarketDataProvider | None = None
+    ) -> "RecordReplayProvider":
+        return cls(
+            os.getenv("MARKET_DATA_RECORD_DIR", DEFAULT_RECORD_DIR),
+            inner,
+            latency=float(os.getenv("REPLAY_LATENCY_MS", 0)) / 1000,
+            jitter=float(os.getenv("REPLAY_JITTER_MS", 0)) / 1000,
+            error_rate=float(os.getenv("REPLAY_ERROR_RATE", 0)),
+            seed=int(os.getenv("REPLAY_SEED", 0)),
+            flush_delay=float(os.getenv("RECORD_FLUSH_SECONDS", DEFAULT_FLUSH_DELAY)),
+        )
+
+    @property
+    def recording(self) -> bool:
+        return self.inner is not None
+
+    def _path(self, kind: str) -> str:
+        return os.path.join(self.directory, f"{kind}.json")
+
+    def _load(self, kind: str) -> dict:
+        if kind not in self._data:
+            try:
+                with open(self._path(kind)) as f:
+                    self._data[kind] = json.load(f)
+            except FileNotFoundError:
+                self._data[kind] = {}
+        return self._data[kind]
+
+    def _record(self, kind: str, key: str, value) -> None:
+        self._load(kind)[key] = value
+        self._dirty.add(kind)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self) -> None:
+        await asyncio.sleep(self.flush_delay)
+        await self.flush()
+
+    async def flush(self) -> None:
+        """Write every kind recorded since the last flush."""
+        while self._dirty:
+            kind = self._dirty.pop()
+            # Values are replaced, never changed in place, so a shallow copy
+            # is a stable snapshot for the writer thread
+            await asyncio.to_thread(self._write, kind, dict(self._data[kind]))
+
+    def _write(self, kind: str, data: dict) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{self._path(kind)}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self._path(kind))
+
+    async def close(self) -> None:
+        """Write out pending recordings."""
+        task, self._flush_task = self._flush_task, None
+        if task and not task.done():
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        await self.flush()
+
+    async def _replay(self, kind: str, key: str):
+        if self.latency or self.jitter:
+            delay = self._rng.uniform(-self.jitter, self.jitter)
+            await asyncio.sleep(max(0.0, self.latency + delay))
+        if self.error_rate and self._rng.random() < self.error_rate:
+            raise httpx.TransportError(f"Synthetic replay failure for {kind} {key}")
+
+        data = self._load(kind)
+        if key not in data:
+            raise ReplayMiss(f"No recorded {kind} for {key} in {self.directory}")
+        return data[key]
+
+    async def get_stock_price(self, symbol: str) -> StockQuote:
+        key = symbol.upper()
+        if self.recording:
+            quote = await self.inner.get_stock_price(symbol)
+            self._record("quotes", key, quote.model_dump(by_alias=True))
+            return quote
+
+        data = await self._replay("quotes", key)
+        return StockQuote.model_validate({**data, "s": symbol})
+
+    async def get_stock_price_batch(self, symbols: List[str]) -> List[StockQuote]:
+        results = await asyncio.gather(
+            *(self.get_stock_price(symbol) for symbol in symbols),
+            return_exceptions=True,
+        )
+        quotes: List[StockQuote] = []
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Error fetching price for {symbol}: {result}")
+                continue
+            quotes.append(result)
+        return quotes
+
+    async def get_company_profile(self, symbol: str) -> CompanyProfile | None:
+        key = symbol.upper()
+        if self.recording:
+            try:
+                profile = await self.inner.get_company_profile(symbol)
+            except HTTPException as e:
+                if e.status_code == 404:
+                    self._record("profiles", key, None)
+                raise
+            self._record(
+                "profiles", key, profile.model_dump(by_alias=True) if profile else None
+            )
+            return profile
+
+        data = await self._replay("profiles", key)
+        if data is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f"Company profile not found for symbol {symbol}",
+            )
+        return CompanyProfile.model_validate(data)
+
+    async def get_company_profile_batch(
+        self, symbols: List[str]
+    ) -> List[CompanyProfile]:
+        results = await asyncio.gather(
+            *(self.get_company_profile(symbol) for symbol in symbols),
+            return_exceptions=True,
+        )
+        profiles: List[CompanyProfile] = []
+        for symbol, result in zip(symbols, results):
+            if isinstance(result, Exception):
+                logger.warning(f"Error fetching profile for {symbol}: {result}")
+                continue
+            if result is not None:
+                profiles.append(cast(CompanyProfile, result))
+        return profiles
+
+    async def get_candles(
+        self, symbol: str, resolution: str, start: int, end: int
+    ) -> dict:
+        # Candles are kept as one merged series per symbol and resolution so
+        # replays can answer any sub-range that was recorded
+        key = f"{symbol.upper()}:{resolution}"
+        if self.recording:
+            data = await self.inner.get_candles(symbol, resolution, start, end)
+            series = self._load("candles").get(key) or {k: [] for k in _CANDLE_KEYS}
+            bars = {bar[0]: bar for bar in zip(*(series[k] for k in _CANDLE_KEYS))}
+            bars.update((bar[0], bar) for bar in zip(*(data[k] for k in _CANDLE_KEYS)))
+            merged = [bars[t] for t in sorted(bars)]
+            self._record(
+                "candles",
+                key,
+                {k: [bar[i] for bar in merged] for i, k in enumerate(_CANDLE_KEYS)},
+            )
+            return data
+
+        series = await self._replay("candles", key)
+        rows = [i for i, t in enumerate(series["t"]) if start <= t <= end]
+        return {k: [series[k][i] for i in rows] for k in _CANDLE_KEYS}
+
+    async def get_symbol_list(self, exchange: str = "US") -> List[dict]:
+        if self.recording:
+            rows = await self.inner.get_symbol_list(exchange)
+            self._record("symbols", exchange, rows)
+            return rows
+        return await self._replay("symbols", exchange)
@@ -0,0 +1,276 @@
+import asyncio
+import difflib
+import gzip
+import logging
+import os
+import re
+import time
+from array import array
+from bisect import bisect_left
+from typing import Awaitable, Callable, Dict, Iterable, List, NamedTuple
+
+from dotenv import load_dotenv
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INDEX_PATH = "symbols.tsv.gz"
+DEFAULT_REFRESH_INTERVAL = 86400
+DEFAULT_POLL_INTERVAL = 30
+
+_WORD = re.compile(r"[A-Z0-9]+")
+
+SymbolFetcher = Callable[[], Awaitable[List[dict]]]
+
+
+class SymbolEntry(NamedTuple):
+    symbol: str
+    description: str
+    type: str
+
+
+class SymbolIndex:
+    """In-memory index of the tradable symbol universe.
+
+    Symbols are kept in one sorted list with parallel description/type lists,
+    plus a hash set for existence checks and a sorted word list (with an
+    `array` of row numbers) for matching on company-name words. Prefix
+    lookups are a bisect into the sorted lists.
+    """
+
+    def __init__(self):
+        self._set: frozenset[str] = frozenset()
+        self._symbols: List[str] = []
+        self._descriptions: List[str] = []
+        self._types: List[str] = []
+        self._words: List[str] = []
+        self._word_rows = array("I")
+        self.updated_at: float | None = None
+
+    def __len__(self) -> int:
+        return len(self._symbols)
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol.strip().upper() in self._set
+
+    @property
+    def ready(self) -> bool:
+        return bool(self._symbols)
+
+    def replace(self, entries: Iterable[SymbolEntry], updated_at: float | None = None):
+        """Swap in a new symbol universe in one step."""
+        unique = {e.symbol.upper(): e for e in entries if e.symbol}
+        rows = sorted(e._replace(symbol=symbol) for symbol, e in unique.items())
+        symbols = [e.symbol for e in rows]
+        descriptions = [e.description for e in rows]
+        types = [e.type for e in rows]
+
+        words = sorted(
+            (word, row)
+            for row, description in enumerate(descriptions)
+            for word in set(_WORD.findall(description.upper()))
+        )
+
+        self._symbols, self._descriptions, self._types = symbols, descriptions, types
+        self._set = frozenset(symbols)
+        self._words = [word for word, _ in words]
+        self._word_rows = array("I", (row for _, row in words))
+        self.updated_at = updated_at or time.time()
+
+    def _entry(self, row: int) -> SymbolEntry:
+        return SymbolEntry(self._symbols[row], self._descriptions[row], self._types[row])
+
+    @staticmethod
+    def _prefix_range(keys: List[str], prefix: str) -> range:
+        start = bisect_left(keys, prefix)
+        end = bisect_left(keys, prefix + "\uffff", lo=start)
+        return range(start, end)
+
+    def search(self, query: str, limit: int = 10) -> List[SymbolEntry]:
+        """Symbols matching `query`, best matches first.
+
+        Exact and ticker-prefix matches come first, then company-name word
+        prefixes. Only if neither finds anything are close misspellings of
+        the ticker returned.
+        """
+        q = query.strip().upper()
+        if not q or limit <= 0:
+            return []
+
+        rows: Dict[int, None] = {}  # insertion-ordered set
+
+        for row in self._prefix_range(self._symbols, q):
+            if len(rows) >= limit:
+                break
+            rows[row] = None
+
+        if len(rows) < limit:
+            for i in self._prefix_range(self._words, q):
+                rows.setdefault(self._word_rows[i])
+                if len(rows) >= limit:
+                    break
+
+        if not rows:
+            # Only compare against tickers sharing the first letter to keep this cheap
+            first_letter = self._prefix_range(self._symbols, q[0])
+            candidates = self._symbols[first_letter.start : first_letter.stop]
+            for symbol in difflib.get_close_matches(q, candidates, n=limit, cutoff=0.6):
+                rows.setdefault(bisect_left(self._symbols, symbol))
+                if len(rows) >= limit:
+                    break
+
+        return [self._entry(row) for row in rows]
+
+    def load(self, path: str) -> bool:
+        """Load a snapshot written by `save`. Returns False if there is none.
+
+        Paths ending in `.gz` are read gzipped, anything else as plain text,
+        so a hand-written fixture file works too.
+        """
+        if not os.path.exists(path):
+            return False
+        mtime = os.path.getmtime(path)
+        self.replace(read_snapshot(path), updated_at=mtime)
+        logger.info(f"Loaded {len(self)} symbols from {path}")
+        return True
+
+    def save(self, path: str) -> None:
+        """Write the index as a gzipped `symbol<TAB>description<TAB>type` file."""
+        tmp_path = f"{path}.tmp"
+        with _open(path, "wt", tmp_path) as f:
+            for row in range(len(self._symbols)):
+                f.write("\t".join(self._entry(row)) + "\n")
+        os.replace(tmp_path, path)
+
+    def snapshot(self) -> dict:
+        return {
+            "size": len(self),
+            "updated_at": self.updated_at,
+        }
+
+
+def read_snapshot(path: str) -> List[SymbolEntry]:
+    with _open(path, "rt") as f:
+        return [
+            SymbolEntry(*line.rstrip("\n").split("\t")) for line in f if line.strip()
+        ]
+
+
+def _open(path: str, mode: str, target: str | None = None):
+    opener = gzip.open if path.endswith(".gz") else open
+    return opener(target or path, mode, encoding="utf-8")
+
+
+def _clean(value) -> str:
+    return str(value or "").replace("\t", " ").replace("\n", " ").strip()
+
+
+class SymbolIndexRefresher:
+    """Loads the on-disk snapshot at start and refreshes it from upstream periodically.
+
+    A worker that does not refresh (another one does) instead checks the
+    snapshot file every `poll_interval` seconds and reloads it when it has
+    been rewritten.
+    """
+
+    def __init__(
+        self,
+        index: SymbolIndex,
+        fetch: SymbolFetcher,
+        path: str = DEFAULT_INDEX_PATH,
+        interval: float = DEFAULT_REFRESH_INTERVAL,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ):
+        self.index = index
+        self.fetch = fetch
+        self.path = path
+        self.interval = interval
+        self.poll_interval = poll_interval
+        self.refreshing = False
+        self._task: asyncio.Task | None = None
+
+    def start(self, refresh: bool = True) -> None:
+        """Load the saved snapshot and keep it up to date.
+
+        With `refresh` it is refetched from upstream, otherwise reloaded
+        from the file. A follower that takes over refreshing calls this
+        again with `refresh` to switch.
+        """
+        if not self.index.ready:
+            try:
+                self.index.load(self.path)
+            except Exception as e:
+                logger.warning(f"Failed to load symbol index from {self.path}: {e}")
+        running = self._task is not None and not self._task.done()
+        if refresh and self.interval > 0:
+            if running and self.refreshing:
+                return
+            if running:
+                self._task.cancel()
+            self.refreshing = True
+            self._task = asyncio.create_task(self._run())
+        elif not refresh and not running and self.poll_interval > 0:
+            self._task = asyncio.create_task(self._follow())
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.refreshing = False
+
+    async def reload_if_changed(self) -> bool:
+        """Reload the snapshot if the file is newer than the index."""
+        try:
+            mtime = os.path.getmtime(self.path)
+        except FileNotFoundError:
+            return False
+        if mtime == self.index.updated_at:
+            return False
+        entries = await asyncio.to_thread(read_snapshot, self.path)
+        self.index.replace(entries, updated_at=mtime)
+        logger.info(f"Reloaded {len(self.index)} symbols from {self.path}")
+        return True
+
+    async def refresh(self) -> int:
+        rows = await self.fetch()
+        entries = [
+            SymbolEntry(
+                _clean(row.get("symbol")),
+                _clean(row.get("description")),
+                _clean(row.get("type")),
+            )
+            for row in rows
+        ]
+        if not entries:
+            raise ValueError("upstream returned an empty symbol list")
+        self.index.replace(entries)
+        await asyncio.to_thread(self.index.save, self.path)
+        logger.info(f"Refreshed symbol index: {len(self.index)} symbols")
+        return len(self.index)
+
+    async def _run(self) -> None:
+        while True:
+            age = time.time() - (self.index.updated_at or 0)
+            await asyncio.sleep(max(0.0, self.interval - age))
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.warning(f"Failed to refresh symbol index: {e}")
+                # Try again sooner than a full interval
+                await asyncio.sleep(min(self.interval, 300))
+
+    async def _follow(self) -> None:
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                await self.reload_if_changed()
+            except Exception as e:
+                logger.warning(f"Failed to reload symbol index: {e}")
+
+
+symbol_index = SymbolIndex()
@@ -1,10 +1,117 @@
+import os
+from typing import Dict
+
+from dotenv import load_dotenv
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio.engine import AsyncEngine
 from sqlmodel import SQLModel, create_engine
 
+from core.env import env_flag, env_size
+
+load_dotenv()
+
 sqlite_file_name = "database.db"
 sqlite_url = f"sqlite+aiosqlite:///{sqlite_file_name}"
 
-engine = AsyncEngine(create_engine(sqlite_url, echo=True, future=True))
+# Async drivers for the URL schemes people usually paste
+_ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgres": "postgresql+asyncpg",
+    "postgresql": "postgresql+asyncpg",
+}
+
+# Logs every statement synchronously; for debugging only
+DB_ECHO = env_flag("DB_ECHO")
+SQLITE_PROFILES = ("production", "default")
+
+
+def sqlite_pragmas(profile: str | None = None) -> Dict[str, object]:
+    """Pragmas applied to every new SQLite connection for `SQLITE_PROFILE`.
+
+    `production` (the default) runs in WAL mode so readers never block on
+    the writer, syncs at checkpoints instead of every commit, maps the file
+    into memory and enforces foreign keys; each value can be overridden from
+    the environment. `default` keeps SQLite's own settings.
+    """
+    profile = (profile or os.getenv("SQLITE_PROFILE", "production")).strip().lower()
+    if profile not in SQLITE_PROFILES:
+        raise ValueError(f"SQLITE_PROFILE must be one of {', '.join(SQLITE_PROFILES)}")
+    if profile == "default":
+        return {}
+    return {
+        "journal_mode": os.getenv("SQLITE_JOURNAL_MODE", "WAL"),
+        "synchronous": os.getenv("SQLITE_SYNCHRONOUS", "NORMAL"),
+        "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000)),
+        # A negative cache_size is in KiB rather than pages
+        "cache_size": -(env_size("SQLITE_CACHE_SIZE", 64 * 1024**2) // 1024),
+        "mmap_size": env_size("SQLITE_MMAP_SIZE", 256 * 1024**2),
+        "temp_store": "MEMORY",
+        "foreign_keys": "ON",
+    }
+
+
+def database_url(url: str | None = None) -> str:
+    """`DATABASE_URL` (SQLite's `database.db` by default) with an async driver."""
+    url = url or os.getenv("DATABASE_URL") or sqlite_url
+    scheme, sep, rest = url.partition("://")
+    return f"{_ASYNC_DRIVERS.get(scheme, scheme)}{sep}{rest}"
+
+
+def is_sqlite(url: str) -> bool:
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def pool_options(url: str) -> Dict[str, object]:
+    """Pool and driver settings for server databases; SQLite keeps its defaults.
+
+    asyncpg caches prepared statements per connection; set
+    `DB_STATEMENT_CACHE_SIZE=0` behind PgBouncer in transaction mode.
+    """
+    if is_sqlite(url):
+        return {}
+    statement_cache_size = int(os.getenv("DB_STATEMENT_CACHE_SIZE", 100))
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", 10)),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", 20)),
+        "pool_timeout": float(os.getenv("DB_POOL_TIMEOUT", 30)),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", 1800)),
+        "pool_pre_ping": True,
+        "connect_args": {
+            "timeout": float(os.getenv("DB_CONNECT_TIMEOUT", 10)),
+            "command_timeout": float(os.getenv("DB_COMMAND_TIMEOUT", 30)),
+            "statement_cache_size": statement_cache_size,
+            "prepared_statement_cache_size": statement_cache_size,
+        },
+    }
+
+
+def make_engine(
+    url: str,
+    echo: bool = False,
+    pragmas: Dict[str, object] | None = None,
+    **options,
+) -> AsyncEngine:
+    engine = AsyncEngine(create_engine(url, echo=echo, future=True, **options))
+    if pragmas and is_sqlite(url):
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def _apply_pragmas(dbapi_connection, connection_record) -> None:
+            cursor = dbapi_connection.cursor()
+            for name, value in pragmas.items():
+                cursor.execute(f"PRAGMA {name}={value}")
+            cursor.close()
+
+    return engine
+
+
+DATABASE_URL = database_url()
+engine = make_engine(
+    DATABASE_URL,
+    echo=DB_ECHO,
+    pragmas=sqlite_pragmas() if is_sqlite(DATABASE_URL) else None,
+    **pool_options(DATABASE_URL),
+)
 
 
 async def create_db_and_tables():
@@ -2,9 +2,10 @@ from typing import List, Optional
 from uuid import uuid4
 from datetime import datetime, timezone
 from sqlmodel import Field, Relationship, SQLModel, Column, Enum as SAEnum
-from sqlalchemy import JSON, ForeignKey, CheckConstraint
+from sqlalchemy import JSON, ForeignKey, CheckConstraint, Index
 from enum import Enum
 from database.mixins import RrRatioMixin
+from database.types import UtcDateTime
 
 
 class BaseTrade(SQLModel):
@@ -18,7 +19,10 @@ class BaseTrade(SQLModel):
 
 class BaseNote(SQLModel):
     content: str = Field(nullable=False)
-    date: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    date: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_type=UtcDateTime,
+    )
 
 
 class Account(SQLModel, table=True):
@@ -123,25 +127,38 @@ class Annotation(BaseNote, table=True):
         default_factory=lambda: str(uuid4()), primary_key=True, nullable=False
     )
     content: str = Field(nullable=False)
+    # Filtered on by the annotation list (get_all_annotations)
     annotation_type: AnnotationType = Field(
-        sa_column=Column(SAEnum(AnnotationType), nullable=False)
+        sa_column=Column(SAEnum(AnnotationType), nullable=False, index=True)
     )
     trade_id: str = Field(
-        sa_column=Column(ForeignKey("trade.id", ondelete="CASCADE"), nullable=False)
+        sa_column=Column(
+            ForeignKey("trade.id", ondelete="CASCADE"), nullable=False, index=True
+        )
     )
     trade: "Trade" = Relationship(back_populates="annotations")
 
 
 class ScalePlan(SQLModel, table=True):
     __tablename__ = "scale_plan"
-    __table_args__ = (CheckConstraint("qty > 0", name="ck_scale_plan_qty_positive"),)
+    __table_args__ = (
+        CheckConstraint("qty > 0", name="ck_scale_plan_qty_positive"),
+        # A trade's plans in list order (get_scale_plans_by_trade)
+        Index("ix_scale_plan_trade_id_status_label", "trade_id", "status", "label"),
+        # A trade's plans of one type in label order (get_trade_summaries)
+        Index(
+            "ix_scale_plan_trade_id_plan_type_label",
+            "trade_id",
+            "plan_type",
+            "label",
+            "id",
+        ),
+    )
     id: str = Field(
         default_factory=lambda: str(uuid4()), primary_key=True, nullable=False
     )
     trade_id: str = Field(
-        sa_column=Column(
-            ForeignKey("trade.id", ondelete="CASCADE"), nullable=False, index=True
-        )
+        sa_column=Column(ForeignKey("trade.id", ondelete="CASCADE"), nullable=False)
     )
     status: ScalePlanStatus = Field(
         default=ScalePlanStatus.PLANNED,
@@ -162,9 +179,13 @@ class ScalePlan(SQLModel, table=True):
     qty: float = Field(nullable=False)
     target_price: Optional[float] = Field(nullable=True)
     notes: str = Field(default="")
-    good_till: Optional[datetime] = Field(default=None, nullable=True)
+    good_till: Optional[datetime] = Field(
+        default=None, nullable=True, sa_type=UtcDateTime
+    )
     stop_price: Optional[float] = Field(default=None, nullable=True)
     limit_price: Optional[float] = Field(default=None, nullable=True)
+    # Sum of the executions' qty, kept in step with them
+    filled_qty: float = Field(default=0.0, nullable=False)
     trade: "Trade" = Relationship(back_populates="scale_plans")
     executions: List["TradeExecution"] = Relationship(back_populates="scale_plan")
 
@@ -175,18 +196,18 @@ class TradeExecution(SQLModel, table=True):
         CheckConstraint("qty > 0", name="ck_trade_execution_qty_positive"),
         CheckConstraint("price > 0", name="ck_trade_execution_price_positive"),
         CheckConstraint("commission >= 0", name="ck_trade_execution_commission_nonneg"),
+        # A trade's executions in fill order (get_executions, replay_positions)
+        Index("ix_trade_execution_fill_order", "trade_id", "executed_at", "id"),
     )
     id: str = Field(
         default_factory=lambda: str(uuid4()), primary_key=True, nullable=False
     )
     trade_id: str = Field(
-        sa_column=Column(
-            ForeignKey("trade.id", ondelete="CASCADE"), nullable=False, index=True
-        )
+        sa_column=Column(ForeignKey("trade.id", ondelete="CASCADE"), nullable=False)
     )
     scale_plan_id: Optional[str] = Field(
         sa_column=Column(
-            ForeignKey("scale_plan.id", ondelete="SET NULL"), nullable=True
+            ForeignKey("scale_plan.id", ondelete="SET NULL"), nullable=True, index=True
         ),
     )
     side: Side = Field(
@@ -197,7 +218,9 @@ class TradeExecution(SQLModel, table=True):
     )
     commission: float = Field(default=0.0)
     executed_at: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc), index=True
+        default_factory=lambda: datetime.now(timezone.utc),
+        index=True,
+        sa_type=UtcDateTime,
     )
     qty: int = Field(nullable=False)
     price: float = Field(nullable=False)
@@ -208,14 +231,30 @@ class TradeExecution(SQLModel, table=True):
 
 class Trade(BaseTrade, RrRatioMixin, table=True):
     __tablename__ = "trade"
+    __table_args__ = (
+        # The list's keyset order, with and without a status filter
+        Index("ix_trade_enter_date_id", "enter_date", "id"),
+        Index("ix_trade_status_enter_date_id", "status", "enter_date", "id"),
+    )
     status: TradeStatus = Field(
         default=TradeStatus.WATCHING,
         sa_column=Column(SAEnum(TradeStatus), nullable=False),
     )
-    idea_date: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
-    enter_date: Optional[datetime] = Field(nullable=True)
-    exit_date: Optional[datetime] = Field(nullable=True)
+    idea_date: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        sa_type=UtcDateTime,
+    )
+    enter_date: Optional[datetime] = Field(nullable=True, sa_type=UtcDateTime)
+    exit_date: Optional[datetime] = Field(nullable=True, sa_type=UtcDateTime)
     outcome: Optional[str] = Field(nullable=True)
+    # Position from the executions (average cost), kept in step with them;
+    # net_qty is signed, positive when long
+    net_qty: float = Field(default=0.0, nullable=False)
+    avg_entry_price: Optional[float] = Field(default=None, nullable=True)
+    realized_pnl: float = Field(default=0.0, nullable=False)
+    last_executed_at: Optional[datetime] = Field(
+        default=None, nullable=True, sa_type=UtcDateTime
+    )
     annotations: List[Annotation] = Relationship(
         back_populates="trade",
         sa_relationship_kwargs={
@@ -239,3 +278,43 @@ class Trade(BaseTrade, RrRatioMixin, table=True):
             "passive_deletes": True,
         },
     )
+
+
+class CompanyProfileRecord(SQLModel, table=True):
+    """Last known Finnhub /stock/profile2 payload for a symbol."""
+
+    __tablename__ = "company_profile"
+    symbol: str = Field(primary_key=True, nullable=False)
+    data: dict = Field(sa_column=Column(JSON, nullable=False))
+    refreshed_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        sa_type=UtcDateTime,
+    )
+
+
+class Candle(SQLModel, table=True):
+    """One OHLCV bar; `timeframe` holds a `Timeframe` value and `ts` the bar open in unix seconds."""
+
+    __tablename__ = "candle"
+    # Rows live directly in the primary-key b-tree, so range scans by
+    # (symbol, timeframe, ts) read contiguous pages and no rowid is stored
+    __table_args__ = {"sqlite_with_rowid": False}
+    symbol: str = Field(primary_key=True, nullable=False)
+    timeframe: str = Field(primary_key=True, nullable=False)
+    ts: int = Field(primary_key=True, nullable=False)
+    open: float = Field(nullable=False)
+    high: float = Field(nullable=False)
+    low: float = Field(nullable=False)
+    close: float = Field(nullable=False)
+    volume: float = Field(default=0.0, nullable=False)
+
+
+class CandleCoverage(SQLModel, table=True):
+    """A [start, end) span of unix seconds whose candles are fully stored."""
+
+    __tablename__ = "candle_coverage"
+    symbol: str = Field(primary_key=True, nullable=False)
+    timeframe: str = Field(primary_key=True, nullable=False)
+    start: int = Field(primary_key=True, nullable=False)
+    end: int = Field(nullable=False)
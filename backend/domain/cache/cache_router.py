@@ -0,0 +1,19 @@
+from fastapi import APIRouter, HTTPException, status
+from fastapi_cache import FastAPICache
+
+from core.data_version import data_versions
+from domain.cache.cache_schema import CacheStats
+
+router = APIRouter()
+
+
+@router.get("/stats", response_model=CacheStats)
+async def get_cache_stats():
+    """Byte usage, hit/miss and eviction counters per namespace plus data versions."""
+    backend = FastAPICache.get_backend()
+    if not hasattr(backend, "snapshot"):
+        raise HTTPException(
+            status_code=status.HTTP_501_NOT_IMPLEMENTED,
+            detail=f"{type(backend).__name__} does not report statistics",
+        )
+    return {**backend.snapshot(), "data_versions": data_versions.snapshot()}
@@ -0,0 +1,33 @@
+from typing import Dict, Optional
+
+from core.base_schema import BaseSchema
+
+
+class CacheNamespaceStats(BaseSchema):
+    quota: Optional[int] = None
+    bytes: int
+    entries: int
+    hits: int
+    misses: int
+    evictions: int
+    expired: int
+    rejected: int
+
+
+class DataVersionStats(BaseSchema):
+    version: int
+    list_version: int
+    trades: int
+
+
+class CacheStats(BaseSchema):
+    backend: str
+    policy: Optional[str] = None
+    max_bytes: Optional[int] = None
+    bytes: Optional[int] = None
+    entries: Optional[int] = None
+    hits: int
+    misses: int
+    evictions: int
+    namespaces: Dict[str, CacheNamespaceStats] = {}
+    data_versions: DataVersionStats
@@ -0,0 +1,23 @@
+from typing import Annotated
+
+from fastapi import Depends
+
+from core.stock_price.market_data_provider import MarketDataProvider
+from database.session import SessionDep
+from domain.candle.candle_repo import CandleRepo
+from domain.candle.candle_service import CandleService
+from domain.trade.trade_deps import get_stock_price_service
+
+
+def get_candle_repo(session: SessionDep) -> CandleRepo:
+    return CandleRepo(session=session)
+
+
+def get_candle_service(
+    repo: CandleRepo = Depends(get_candle_repo),
+    market_data: MarketDataProvider = Depends(get_stock_price_service),
+) -> CandleService:
+    return CandleService(repo=repo, market_data=market_data)
+
+
+CandleServiceDep = Annotated[CandleService, Depends(get_candle_service)]
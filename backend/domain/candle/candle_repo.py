@@ -0,0 +1,101 @@
+from typing import List, Sequence, Tuple
+
+from sqlalchemy import delete
+from sqlmodel import select
+
+from core.base_repo import BaseRepo
+from database.models import Candle, CandleCoverage
+from database.session import SessionDep
+
+Bar = Tuple[int, float, float, float, float, float]  # ts, open, high, low, close, volume
+Span = Tuple[int, int]
+
+
+class CandleRepo(BaseRepo[Candle]):
+    def __init__(self, session: SessionDep):
+        super().__init__(session, Candle)
+
+    async def get_bars(
+        self, symbol: str, timeframe: str, start: int, end: int
+    ) -> List[Bar]:
+        """Stored bars with `start <= ts < end`, oldest first."""
+        stmt = (
+            select(
+                Candle.ts,
+                Candle.open,
+                Candle.high,
+                Candle.low,
+                Candle.close,
+                Candle.volume,
+            )
+            .where(
+                Candle.symbol == symbol,
+                Candle.timeframe == timeframe,
+                Candle.ts >= start,
+                Candle.ts < end,
+            )
+            .order_by(Candle.ts)
+        )
+        result = await self.session.exec(stmt)
+        return result.all()
+
+    async def get_coverage(self, symbol: str, timeframe: str) -> List[Span]:
+        stmt = (
+            select(CandleCoverage.start, CandleCoverage.end)
+            .where(
+                CandleCoverage.symbol == symbol,
+                CandleCoverage.timeframe == timeframe,
+            )
+            .order_by(CandleCoverage.start)
+        )
+        result = await self.session.exec(stmt)
+        return result.all()
+
+    async def save_bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        bars: Sequence[Bar],
+        coverage: Sequence[Span],
+    ) -> None:
+        """Upsert `bars` and replace the coverage spans in one transaction."""
+        if bars:
+            stmt = self._insert(Candle)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Candle.symbol, Candle.timeframe, Candle.ts],
+                set_={
+                    "open": stmt.excluded.open,
+                    "high": stmt.excluded.high,
+                    "low": stmt.excluded.low,
+                    "close": stmt.excluded.close,
+                    "volume": stmt.excluded.volume,
+                },
+            )
+            await self.session.exec(
+                stmt,
+                params=[
+                    {
+                        "symbol": symbol,
+                        "timeframe": timeframe,
+                        "ts": ts,
+                        "open": o,
+                        "high": h,
+                        "low": l,
+                        "close": c,
+                        "volume": v,
+                    }
+                    for ts, o, h, l, c, v in bars
+                ],
+            )
+
+        await self.session.exec(
+            delete(CandleCoverage).where(
+                CandleCoverage.symbol == symbol,
+                CandleCoverage.timeframe == timeframe,
+            )
+        )
+        self.session.add_all(
+            CandleCoverage(symbol=symbol, timeframe=timeframe, start=start, end=end)
+            for start, end in coverage
+        )
+        await self.session.commit()
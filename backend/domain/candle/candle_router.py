@@ -0,0 +1,31 @@
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, status
+
+from database.models import Timeframe
+from domain.candle.candle_deps import CandleServiceDep
+from domain.candle.candle_schema import CandleSeries
+
+router = APIRouter()
+
+
+@router.get("/{symbol}", response_model=CandleSeries, status_code=status.HTTP_200_OK)
+async def get_candles(
+    service: CandleServiceDep,
+    symbol: str,
+    timeframe: Timeframe = Timeframe.ONE_DAY,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+):
+    """OHLCV history for `symbol`; only uncovered parts of the range are fetched upstream.
+
+    `start`/`end` accept ISO datetimes or unix seconds and default to the
+    last 200 bars.
+    """
+    return await service.get_candles(
+        symbol,
+        timeframe,
+        int(start.timestamp()) if start else None,
+        int(end.timestamp()) if end else None,
+    )
@@ -0,0 +1,19 @@
+from typing import List, Tuple
+
+from core.base_schema import BaseSchema
+from database.models import Timeframe
+
+
+class CandleSeries(BaseSchema):
+    """OHLCV bars in columnar form: index i of every list is one bar."""
+
+    symbol: str
+    timeframe: Timeframe
+    timestamps: List[int]
+    open: List[float]
+    high: List[float]
+    low: List[float]
+    close: List[float]
+    volume: List[float]
+    # Requested spans the provider could not fill; the bars there are absent
+    missing: List[Tuple[int, int]] = []
@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+from core.stock_price.market_data_provider import MarketDataProvider
+from core.stock_price.rate_scheduler import Priority, prioritized
+from database.models import Timeframe
+from domain.candle.candle_repo import Bar, CandleRepo, Span
+from domain.candle.candle_schema import CandleSeries
+
+logger = logging.getLogger(__name__)
+
+# Finnhub resolution used to fetch each timeframe and the bar length in seconds.
+# 4h has no native resolution, so it is built from hourly bars.
+RESOLUTIONS: Dict[Timeframe, Tuple[str, int]] = {
+    Timeframe.ONE_MINUTE: ("1", 60),
+    Timeframe.FIVE_MINUTES: ("5", 300),
+    Timeframe.FIFTEEN_MINUTES: ("15", 900),
+    Timeframe.THIRTY_MINUTES: ("30", 1800),
+    Timeframe.ONE_HOUR: ("60", 3600),
+    Timeframe.FOUR_HOURS: ("60", 14400),
+    Timeframe.ONE_DAY: ("D", 86400),
+    Timeframe.ONE_WEEK: ("W", 604800),
+    Timeframe.ONE_MONTH: ("M", 2678400),
+}
+
+DEFAULT_BARS = 200
+
+# One fill at a time per (symbol, timeframe) so concurrent chart loads do not
+# fetch the same gap twice
+_fill_locks: Dict[Tuple[str, str], asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+def missing_spans(coverage: List[Span], start: int, end: int) -> List[Span]:
+    """Parts of [start, end) not covered by the sorted `coverage` spans."""
+    gaps: List[Span] = []
+    cursor = start
+    for span_start, span_end in coverage:
+        if span_end <= cursor:
+            continue
+        if span_start >= end:
+            break
+        if span_start > cursor:
+            gaps.append((cursor, span_start))
+        cursor = span_end
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def merge_spans(spans: List[Span]) -> List[Span]:
+    merged: List[Span] = []
+    for start, end in sorted(spans):
+        if start >= end:
+            continue
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def resample(bars: List[Bar], step: int) -> List[Bar]:
+    """Aggregate finer bars into `step`-second buckets."""
+    buckets: Dict[int, list] = {}
+    for ts, o, h, l, c, v in bars:
+        bucket = ts - ts % step
+        if (agg := buckets.get(bucket)) is None:
+            buckets[bucket] = [bucket, o, h, l, c, v]
+        else:
+            agg[2] = max(agg[2], h)
+            agg[3] = min(agg[3], l)
+            agg[4] = c
+            agg[5] += v
+    return [tuple(buckets[ts]) for ts in sorted(buckets)]
+
+
+class CandleService:
+    """Serves OHLCV history from the local candle store.
+
+    Each (symbol, timeframe) keeps a list of covered spans; a range query only
+    goes to the provider for the parts of the range that are not covered yet.
+    The bar that is still forming is never marked as covered, so it is
+    refetched until it closes.
+    """
+
+    def __init__(self, repo: CandleRepo, market_data: MarketDataProvider):
+        self.repo = repo
+        self.market_data = market_data
+
+    async def get_candles(
+        self,
+        symbol: str,
+        timeframe: Timeframe,
+        start: int | None = None,
+        end: int | None = None,
+    ) -> CandleSeries:
+        symbol = symbol.upper()
+        resolution, step = RESOLUTIONS[timeframe]
+        now = int(time.time())
+        end = min(end or now, now)
+        start = start if start is not None else end - step * DEFAULT_BARS
+        if step <= 14400:
+            # Align intraday ranges to bar boundaries so spans tile cleanly
+            start -= start % step
+        end = max(end, start)
+
+        missing: List[Span] = []
+        async with _fill_locks[(symbol, timeframe.value)]:
+            coverage = await self.repo.get_coverage(symbol, timeframe.value)
+            gaps = missing_spans(coverage, start, end)
+            if gaps:
+                missing = await self._fill(
+                    symbol, timeframe, resolution, step, coverage, gaps, now
+                )
+
+        bars = await self.repo.get_bars(symbol, timeframe.value, start, end + 1)
+        return CandleSeries(
+            symbol=symbol,
+            timeframe=timeframe,
+            timestamps=[bar[0] for bar in bars],
+            open=[bar[1] for bar in bars],
+            high=[bar[2] for bar in bars],
+            low=[bar[3] for bar in bars],
+            close=[bar[4] for bar in bars],
+            volume=[bar[5] for bar in bars],
+            missing=missing,
+        )
+
+    async def _fill(
+        self,
+        symbol: str,
+        timeframe: Timeframe,
+        resolution: str,
+        step: int,
+        coverage: List[Span],
+        gaps: List[Span],
+        now: int,
+    ) -> List[Span]:
+        """Fetch `gaps` from the provider and store them. Returns the gaps that failed."""
+        bars: List[Bar] = []
+        filled: List[Span] = []
+        failed: List[Span] = []
+        # Spans ending after this point could include the still-open bar.
+        # Daily and longer bars are not aligned to multiples of `step`, so
+        # anything that opened within the last `step` seconds counts as open.
+        closed_until = now - now % step if step <= 14400 else now - step
+
+        with prioritized(Priority.INTERACTIVE):
+            results = await asyncio.gather(
+                *(
+                    self.market_data.get_candles(
+                        symbol, resolution, gap_start, gap_end
+                    )
+                    for gap_start, gap_end in gaps
+                ),
+                return_exceptions=True,
+            )
+
+        for gap, result in zip(gaps, results):
+            if isinstance(result, Exception):
+                logger.warning(
+                    f"Failed to fetch {symbol} {timeframe.value} candles {gap}: {result}"
+                )
+                failed.append(gap)
+                continue
+            fetched = list(
+                zip(*(result[key] for key in ("t", "o", "h", "l", "c", "v")))
+            )
+            if timeframe == Timeframe.FOUR_HOURS:
+                fetched = resample(fetched, step)
+            bars.extend(fetched)
+            filled.append((gap[0], min(gap[1], closed_until)))
+
+        if bars or filled:
+            await self.repo.save_bars(
+                symbol, timeframe.value, bars, merge_spans(list(coverage) + filled)
+            )
+        return failed
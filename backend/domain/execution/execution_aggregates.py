@@ -0,0 +1,251 @@
+"""Position aggregates on trades and scale plans, kept in step with executions.
+
+A trade carries its net quantity, average entry price, realized P&L and the
+time of its last fill; a scale plan carries the quantity filled against it.
+The execution service updates them in the same transaction as the
+executions themselves. To recompute every one from the executions:
+
+    python -m domain.execution.execution_aggregates [--check]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+
+from sqlalchemy import update
+from sqlmodel import func, select
+
+from core.data_version import mark_changed
+from database.models import ScalePlan, Side, Trade, TradeExecution
+from database.session import async_session
+
+logger = logging.getLogger(__name__)
+
+# Stored floats that differ by less than this are not drift
+TOLERANCE = 1e-6
+
+
+def _utc(value: Optional[datetime]) -> Optional[datetime]:
+    """Naive UTC, the form timestamps are read back in."""
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+@dataclass
+class Position:
+    """A trade's position under the average-cost method."""
+
+    net_qty: float = 0.0
+    avg_entry_price: Optional[float] = None
+    realized_pnl: float = 0.0
+    last_executed_at: Optional[datetime] = None
+
+    @classmethod
+    def of(cls, trade: Trade) -> "Position":
+        return cls(
+            trade.net_qty or 0.0,
+            trade.avg_entry_price,
+            trade.realized_pnl or 0.0,
+            _utc(trade.last_executed_at),
+        )
+
+    def store(self, trade: Trade) -> None:
+        trade.net_qty = self.net_qty
+        trade.avg_entry_price = self.avg_entry_price
+        trade.realized_pnl = self.realized_pnl
+        trade.last_executed_at = self.last_executed_at
+
+    def follows(self, execution: TradeExecution) -> bool:
+        """Whether `execution` comes after every fill folded in so far."""
+        return (
+            self.last_executed_at is None
+            or _utc(execution.executed_at) >= self.last_executed_at
+        )
+
+    def apply(self, execution: TradeExecution) -> None:
+        self.fill(
+            execution.side,
+            execution.qty,
+            execution.price,
+            execution.commission,
+            execution.executed_at,
+        )
+
+    def fill(
+        self,
+        side: Side,
+        qty: float,
+        price: float,
+        commission: Optional[float],
+        executed_at: Optional[datetime],
+    ) -> None:
+        signed = qty if side == Side.BUY else -qty
+        held = abs(self.net_qty)
+        avg = self.avg_entry_price
+        realized = -(commission or 0.0)
+        if not held or (self.net_qty > 0) == (signed > 0):
+            # Opening or adding: the average moves toward this price
+            avg = ((avg or 0.0) * held + price * qty) / (held + qty)
+        else:
+            direction = 1 if self.net_qty > 0 else -1
+            realized += (price - avg) * min(qty, held) * direction
+            if qty > held:
+                # Closed the position and opened one the other way
+                avg = price
+        self.net_qty += signed
+        self.avg_entry_price = avg if self.net_qty else None
+        self.realized_pnl += realized
+        executed_at = _utc(executed_at)
+        if self.last_executed_at is None or (
+            executed_at and executed_at > self.last_executed_at
+        ):
+            self.last_executed_at = executed_at
+
+
+# Trade ids per IN list, and rows per fetch, when replaying
+REPLAY_BATCH = 500
+
+
+async def replay_positions(
+    session, trade_ids: Optional[Iterable[str]] = None
+) -> dict[str, Position]:
+    """Each trade's position from its executions, replayed in fill order.
+
+    Executions are streamed, so memory grows with the number of trades, not
+    of executions. Without `trade_ids` every trade with executions is replayed;
+    named trades without any come back as an empty position.
+    """
+    stmt = (
+        select(
+            TradeExecution.trade_id,
+            TradeExecution.side,
+            TradeExecution.qty,
+            TradeExecution.price,
+            TradeExecution.commission,
+            TradeExecution.executed_at,
+        )
+        .order_by(
+            TradeExecution.trade_id, TradeExecution.executed_at, TradeExecution.id
+        )
+        # Without it the ORM buffers the whole result despite streaming
+        .execution_options(yield_per=REPLAY_BATCH)
+    )
+    if trade_ids is None:
+        batches = [stmt]
+    else:
+        trade_ids = sorted(set(trade_ids))
+        batches = [
+            stmt.where(
+                TradeExecution.trade_id.in_(trade_ids[i : i + REPLAY_BATCH])
+            )
+            for i in range(0, len(trade_ids), REPLAY_BATCH)
+        ]
+    positions = {trade_id: Position() for trade_id in trade_ids or ()}
+    for batch in batches:
+        stream = await session.stream(batch)
+        async for trade_id, *fill in stream:
+            positions.setdefault(trade_id, Position()).fill(*fill)
+    return positions
+
+
+def _differs(stored, computed) -> bool:
+    if stored is None or computed is None:
+        return stored is not computed
+    if isinstance(computed, float):
+        return abs(stored - computed) > TOLERANCE
+    return _utc(stored) != computed
+
+
+async def repair_aggregates(session, write: bool = True) -> dict:
+    """Recompute every aggregate from the executions; returns the drift found.
+
+    Only rows that differ are written.
+    """
+    result = await session.exec(
+        select(TradeExecution.scale_plan_id, func.sum(TradeExecution.qty))
+        .where(TradeExecution.scale_plan_id.is_not(None))
+        .group_by(TradeExecution.scale_plan_id)
+    )
+    filled = {plan_id: float(qty) for plan_id, qty in result.all()}
+    result = await session.exec(
+        select(ScalePlan.id, ScalePlan.trade_id, ScalePlan.filled_qty)
+    )
+    plan_updates, changed_trades = [], set()
+    for plan_id, trade_id, stored in result.all():
+        computed = filled.get(plan_id, 0.0)
+        if _differs(stored, computed):
+            plan_updates.append({"id": plan_id, "filled_qty": computed})
+            changed_trades.add(trade_id)
+
+    positions = await replay_positions(session)
+    result = await session.exec(
+        select(
+            Trade.id,
+            Trade.net_qty,
+            Trade.avg_entry_price,
+            Trade.realized_pnl,
+            Trade.last_executed_at,
+        )
+    )
+    trade_updates = []
+    for trade_id, *stored in result.all():
+        position = positions.get(trade_id, Position())
+        computed = [
+            position.net_qty,
+            position.avg_entry_price,
+            position.realized_pnl,
+            position.last_executed_at,
+        ]
+        if any(map(_differs, stored, computed)):
+            trade_updates.append(
+                {
+                    "id": trade_id,
+                    "net_qty": position.net_qty,
+                    "avg_entry_price": position.avg_entry_price,
+                    "realized_pnl": position.realized_pnl,
+                    "last_executed_at": position.last_executed_at,
+                }
+            )
+            changed_trades.add(trade_id)
+
+    if write:
+        if plan_updates:
+            await session.exec(update(ScalePlan), params=plan_updates)
+        if trade_updates:
+            await session.exec(update(Trade), params=trade_updates)
+        # Bulk updates skip the flush, so cached trades are invalidated by hand
+        mark_changed(session, changed_trades)
+    return {
+        "scale_plans": len(plan_updates),
+        "trades": len(trade_updates),
+    }
+
+
+async def _run(check: bool) -> int:
+    async with async_session() as session:
+        drift = await repair_aggregates(session, write=not check)
+        if not check:
+            await session.commit()
+    action = "out of date" if check else "repaired"
+    logger.info(
+        "%d trades and %d scale plans %s",
+        drift["trades"],
+        drift["scale_plans"],
+        action,
+    )
+    return 1 if check and any(drift.values()) else 0
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--check", action="store_true", help="report drift without writing"
+    )
+    args = parser.parse_args()
+    sys.exit(asyncio.run(_run(args.check)))
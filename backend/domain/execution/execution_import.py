@@ -0,0 +1,286 @@
+"""Streaming readers for broker execution files, and the import CLI.
+
+CSV (with a header row) and JSON (an array, or one object per line) are
+decoded as the bytes arrive, so a statement of any length is read in
+memory bounded by its longest record. Headers are matched loosely:
+`Quantity`, `Shares` and `qty` all fill `qty`; unknown columns are
+ignored. To import a file directly into the database:
+
+    python -m domain.execution.execution_import fills.csv [--skip-invalid]
+"""
+
+import argparse
+import asyncio
+import codecs
+import csv
+import json
+import logging
+import os
+import re
+import sys
+import tempfile
+from typing import IO, AsyncIterable, AsyncIterator, Iterator, Optional
+
+logger = logging.getLogger(__name__)
+
+IMPORT_FORMATS = ("csv", "json")
+CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/vnd.ms-excel": "csv",
+    "application/json": "json",
+    "application/x-ndjson": "json",
+    "application/jsonl": "json",
+}
+EXTENSIONS = {".csv": "csv", ".json": "json", ".ndjson": "json", ".jsonl": "json"}
+
+# A record that has not closed by this many characters is malformed
+MAX_RECORD_CHARS = 1024**2
+CHUNK_BYTES = 64 * 1024
+# Uploads larger than this are spooled to disk rather than held in memory
+SPOOL_BYTES = int(os.getenv("IMPORT_SPOOL_BYTES", 8 * 1024**2))
+
+# Header or key (lowercase, letters only) -> ExecutionImportRow field
+_COLUMNS = {
+    "tradeid": "trade_id",
+    "scaleplanid": "scale_plan_id",
+    "planid": "scale_plan_id",
+    "symbol": "symbol",
+    "ticker": "symbol",
+    "side": "side",
+    "action": "side",
+    "buysell": "side",
+    "qty": "qty",
+    "quantity": "qty",
+    "shares": "qty",
+    "filledqty": "qty",
+    "price": "price",
+    "fillprice": "price",
+    "tradeprice": "price",
+    "avgprice": "price",
+    "commission": "commission",
+    "commissions": "commission",
+    "fee": "commission",
+    "fees": "commission",
+    "executedat": "executed_at",
+    "executiontime": "executed_at",
+    "datetime": "executed_at",
+    "timestamp": "executed_at",
+    "time": "executed_at",
+    "date": "executed_at",
+    "notes": "notes",
+    "note": "notes",
+}
+# Lines with their endings; unlike str.splitlines, only \n ends one
+_LINES = re.compile(r"[^\n]*\n|[^\n]+")
+
+
+class ImportFormatError(ValueError):
+    """The file itself cannot be read past `row`."""
+
+    def __init__(self, row: int, message: str):
+        super().__init__(f"row {row}: {message}")
+        self.row = row
+
+
+def import_format(
+    fmt: Optional[str] = None,
+    content_type: Optional[str] = None,
+    filename: Optional[str] = None,
+) -> str:
+    """The format named, or the one implied by a content type or file name."""
+    if fmt:
+        fmt = fmt.lower()
+    elif content_type:
+        fmt = CONTENT_TYPES.get(content_type.split(";")[0].strip().lower())
+    elif filename:
+        fmt = EXTENSIONS.get(os.path.splitext(filename)[1].lower())
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f"format must be one of {', '.join(IMPORT_FORMATS)}")
+    return fmt
+
+
+def _fields(record: dict) -> dict:
+    """Known fields under their schema names; empty values are left out."""
+    fields = {}
+    for key, value in record.items():
+        name = _COLUMNS.get(re.sub(r"[^a-z]", "", str(key).lower()))
+        if name and name not in fields and value not in (None, ""):
+            fields[name] = value.strip() if isinstance(value, str) else value
+    return fields
+
+
+class _CsvReader:
+    def __init__(self):
+        self.header: Optional[list[str]] = None
+        self.rows = 0
+        self._pending = ""
+
+    def feed(self, text: str, final: bool = False) -> Iterator[tuple[int, dict]]:
+        lines = _LINES.findall(self._pending + text)
+        self._pending = ""
+        if lines and not final and not lines[-1].endswith("\n"):
+            self._pending = lines.pop()
+        record = ""
+        for line in lines:
+            record += line
+            # A quoted field may hold line breaks: wait for its closing quote
+            if record.count('"') % 2:
+                continue
+            yield from self._record(record)
+            record = ""
+        if record:
+            if final:
+                raise ImportFormatError(self.rows + 1, "unterminated quoted field")
+            self._pending = record + self._pending
+        if len(self._pending) > MAX_RECORD_CHARS:
+            raise ImportFormatError(self.rows + 1, "record too long")
+
+    def _record(self, record: str) -> Iterator[tuple[int, dict]]:
+        values = next(csv.reader([record]), None)
+        if not values or not any(value.strip() for value in values):
+            return
+        if self.header is None:
+            self.header = values
+            return
+        self.rows += 1
+        yield self.rows, _fields(dict(zip(self.header, values)))
+
+
+class _JsonReader:
+    """Objects from a JSON array or a stream of concatenated objects."""
+
+    def __init__(self):
+        self.rows = 0
+        self._decoder = json.JSONDecoder()
+        self._buffer = ""
+        self._closed = False
+
+    def feed(self, text: str, final: bool = False) -> Iterator[tuple[int, dict]]:
+        buffer = self._buffer + text
+        pos = 0
+        while True:
+            # Skip the separators between objects: whitespace, [ , and ]
+            while pos < len(buffer) and buffer[pos] in " \t\r\n,[]":
+                self._closed = self._closed or buffer[pos] == "]"
+                pos += 1
+            if pos == len(buffer):
+                break
+            if self._closed:
+                raise ImportFormatError(self.rows, "data after the closing ]")
+            try:
+                value, end = self._decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if final or len(buffer) - pos > MAX_RECORD_CHARS:
+                    raise ImportFormatError(self.rows + 1, e.msg) from e
+                break
+            pos = end
+            self.rows += 1
+            if not isinstance(value, dict):
+                raise ImportFormatError(self.rows, "expected a JSON object")
+            yield self.rows, _fields(value)
+        self._buffer = buffer[pos:]
+
+
+async def read_records(
+    chunks: AsyncIterable[bytes], fmt: str
+) -> AsyncIterator[tuple[int, dict]]:
+    """Yield (row number, fields) for each record as `chunks` arrive."""
+    reader = _CsvReader() if fmt == "csv" else _JsonReader()
+    # utf-8-sig drops the byte order mark spreadsheet exports start with
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    async for chunk in chunks:
+        for record in reader.feed(decoder.decode(chunk)):
+            yield record
+    for record in reader.feed(decoder.decode(b"", final=True), final=True):
+        yield record
+
+
+async def read_file(path: str) -> AsyncIterator[bytes]:
+    with open(path, "rb") as file:
+        async for chunk in read_spool(file):
+            yield chunk
+
+
+async def spool(chunks: AsyncIterable[bytes]) -> IO[bytes]:
+    """Receive an upload in full before any of it is imported.
+
+    The import holds its write transaction from the first insert to the
+    commit; SQLite lets no other writer in meanwhile, so that must not
+    include waiting on a slow client.
+    """
+    file = tempfile.SpooledTemporaryFile(max_size=SPOOL_BYTES)
+    try:
+        async for chunk in chunks:
+            file.write(chunk)
+    except BaseException:
+        file.close()
+        raise
+    file.seek(0)
+    return file
+
+
+async def read_spool(file: IO[bytes]) -> AsyncIterator[bytes]:
+    while chunk := file.read(CHUNK_BYTES):
+        yield chunk
+
+
+async def _run(path: str, fmt: str, skip_invalid: bool) -> int:
+    # The service reads its records through this module
+    from fastapi import HTTPException
+
+    from database.session import async_session
+    from domain.execution.execution_repo import ExecutionRepo
+    from domain.execution.execution_schema import ExecutionImportReport
+    from domain.execution.execution_service import ExecutionService
+    from domain.scale_plan.scale_plan_repo import ScalePlanRepo
+    from domain.trade.trade_repo import TradeRepo
+
+    async with async_session() as session:
+        service = ExecutionService(
+            ExecutionRepo(session), ScalePlanRepo(session), TradeRepo(session)
+        )
+        try:
+            report = await service.import_executions(
+                read_records(read_file(path), fmt), skip_invalid=skip_invalid
+            )
+        except HTTPException as e:
+            if not isinstance(e.detail, dict):
+                logger.error(e.detail)
+                return 1
+            # Rejected: the detail is the report of what was wrong
+            report = ExecutionImportReport.model_validate(e.detail)
+    for error in report.errors:
+        logger.warning("Row %d: %s", error.row, error.message)
+    logger.info(
+        "%d of %d rows imported (%d invalid) into %d trades in %.2fs, %.0f rows/s",
+        report.imported,
+        report.rows,
+        report.invalid,
+        report.trades,
+        report.seconds,
+        report.rows_per_second,
+    )
+    return 0 if report.imported or not report.rows else 1
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description="Import a broker execution file.")
+    parser.add_argument("path", help="a CSV or JSON statement")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, default=None)
+    parser.add_argument(
+        "--skip-invalid",
+        action="store_true",
+        help="import the valid rows instead of rejecting the file",
+    )
+    args = parser.parse_args()
+    sys.exit(
+        asyncio.run(
+            _run(
+                args.path,
+                import_format(args.format, filename=args.path),
+                args.skip_invalid,
+            )
+        )
+    )
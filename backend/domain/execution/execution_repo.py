@@ -1,6 +1,8 @@
+from core.data_version import mark_changed
 from database.session import SessionDep
-from database.models import TradeExecution
+from database.models import ScalePlan, Trade, TradeExecution, TradeStatus
 from core.base_repo import BaseRepo
+from sqlalchemy import insert
 from sqlmodel import select, delete
 
 from domain.execution.execution_schema import ExecutionUpdate
@@ -23,20 +25,31 @@ class ExecutionRepo(BaseRepo):
         return result.all()
 
     async def get_execution_by_id(self, execution_id: str) -> TradeExecution | None:
-        return await self.get_by_id(execution_id)
+        return await self.session.get(TradeExecution, execution_id)
 
     async def execute(self, execution: TradeExecution) -> TradeExecution:
         self.session.add(execution)
         await self.session.flush()
         return execution
 
-    async def update_execution(self, execution_id: str, execution: ExecutionUpdate):
-        return await self.update(execution_id, execution)
+    async def update_execution(
+        self, execution: TradeExecution, payload: ExecutionUpdate
+    ) -> TradeExecution:
+        """Apply `payload` and flush; the caller commits with the aggregates."""
+        changes = payload.model_dump(exclude_unset=True)
+        changes.pop("id", None)
+        for key, value in changes.items():
+            if hasattr(execution, key):
+                setattr(execution, key, value)
+        await self.session.flush()
+        return execution
 
-    async def delete_execution(self, execution_id: str):
-        return await self.delete(execution_id)
+    async def delete_execution(self, execution: TradeExecution) -> None:
+        await self.session.delete(execution)
+        await self.session.flush()
 
     async def batch_delete(self, execution_ids: list[str]):
+        """Delete the executions without committing; the caller commits."""
         stmt = select(TradeExecution).where(TradeExecution.id.in_(execution_ids))
         result = await self.session.exec(stmt)
         executions_to_delete = result.all()
@@ -50,12 +63,48 @@ class ExecutionRepo(BaseRepo):
 
         stmt = delete(TradeExecution).where(TradeExecution.id.in_(execution_ids))
         result = await self.session.exec(stmt)
-        await self.session.commit()
+        # Bulk deletes skip the flush, so cached trades are invalidated by hand
+        mark_changed(self.session, {exec.trade_id for exec in executions_to_delete})
         payload = {
             "deleted_count": result.rowcount,
             "scale_plan_ids": affected_scale_plan_ids,
+            "executions": executions_to_delete,
         }
         return payload
 
+    async def insert_many(self, rows: list[dict]) -> None:
+        """Insert complete execution rows in one executemany batch.
+
+        The rows bypass the ORM; the caller invalidates the trades' caches.
+        """
+        if rows:
+            await self.session.exec(insert(TradeExecution), params=rows)
+
+    async def trade_exists(self, trade_id: str) -> bool:
+        result = await self.session.exec(select(Trade.id).where(Trade.id == trade_id))
+        return result.first() is not None
+
+    async def get_plan_trade_id(self, scale_plan_id: str) -> str | None:
+        result = await self.session.exec(
+            select(ScalePlan.trade_id).where(ScalePlan.id == scale_plan_id)
+        )
+        return result.first()
+
+    async def get_trade_id_for_symbol(self, symbol: str) -> str | None:
+        """The symbol's open trade, else the one being watched; newest first."""
+        result = await self.session.exec(
+            select(Trade.id, Trade.status, Trade.idea_date).where(
+                Trade.symbol == symbol,
+                Trade.status.in_([TradeStatus.OPEN, TradeStatus.WATCHING]),
+            )
+        )
+        # A symbol has a few live trades at most: pick in Python, not ORDER BY
+        best = max(
+            result.all(),
+            key=lambda row: (row.status == TradeStatus.OPEN, row.idea_date),
+            default=None,
+        )
+        return best.id if best else None
+
     async def commit_all(self):
         await self.session.commit()
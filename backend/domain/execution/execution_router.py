@@ -1,8 +1,16 @@
-from fastapi import APIRouter, status, HTTPException
-from typing import Optional
+from fastapi import APIRouter, Query, Request, Response, status, HTTPException
+from typing import Annotated, Optional
 
+from core.etag import data_etag, etag_headers, etag_matches, not_modified
 from domain.execution.execution_deps import ExecutionServiceDep
+from domain.execution.execution_import import (
+    import_format,
+    read_records,
+    read_spool,
+    spool,
+)
 from domain.execution.execution_schema import (
+    ExecutionImportReport,
     ExecutionRead,
     ExecutionCreate,
     ExecutionUpdate,
@@ -13,7 +21,16 @@ router = APIRouter()
 
 
 @router.get("", response_model=list[ExecutionRead], status_code=status.HTTP_200_OK)
-async def get_executions(service: ExecutionServiceDep, trade_id: Optional[str] = None):
+async def get_executions(
+    request: Request,
+    response: Response,
+    service: ExecutionServiceDep,
+    trade_id: Optional[str] = None,
+):
+    etag = await data_etag(request, "executions", trade_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
     return await service.get_executions(trade_id)
 
 
@@ -29,6 +46,34 @@ async def create_execution(service: ExecutionServiceDep, payload: ExecutionCreat
     return await service.create_execution(payload)
 
 
+@router.post(
+    "/import", response_model=ExecutionImportReport, status_code=status.HTTP_200_OK
+)
+async def import_executions(
+    request: Request,
+    service: ExecutionServiceDep,
+    format: Optional[str] = None,
+    skip_invalid: Annotated[bool, Query(alias="skipInvalid")] = False,
+):
+    """Import a broker statement sent as the raw request body.
+
+    The body is CSV or JSON (`format`, else its Content-Type). It is spooled
+    in full before the import starts, so the write transaction never waits
+    on the upload. Invalid rows reject the file with a 422 report unless
+    `skipInvalid` is set, in which case they are left out.
+    """
+    try:
+        fmt = import_format(format, request.headers.get("content-type"))
+    except ValueError as e:
+        code = status.HTTP_400_BAD_REQUEST
+        if not format:
+            code = status.HTTP_415_UNSUPPORTED_MEDIA_TYPE
+        raise HTTPException(status_code=code, detail=str(e))
+    with await spool(request.stream()) as body:
+        records = read_records(read_spool(body), fmt)
+        return await service.import_executions(records, skip_invalid=skip_invalid)
+
+
 @router.patch(
     "/{execution_id}", response_model=ExecutionRead, status_code=status.HTTP_200_OK
 )
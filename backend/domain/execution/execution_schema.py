@@ -1,6 +1,8 @@
 from datetime import datetime
 from typing import Optional, List
 
+from pydantic import field_validator, model_validator
+
 from core.base_schema import BaseSchema
 from database.models import Side, ExecSource
 
@@ -22,12 +24,129 @@ class ExecutionCreate(ExecutionBase):
 class ExecutionRead(ExecutionCreate):
     id: str
     executed_at: datetime
+    # Set to NULL by the foreign key when the plan is deleted
+    scale_plan_id: Optional[str] = None
 
 
 class ExecutionUpdate(ExecutionBase):
     qty: Optional[int] = None
     price: Optional[float] = None
 
+    @field_validator("qty", "price", "side", "source")
+    @classmethod
+    def _not_null(cls, value):
+        # Optional so it can be left out; the column itself is NOT NULL
+        if value is None:
+            raise ValueError("may be left out but not null")
+        return value
+
+    @field_validator("qty", "price")
+    @classmethod
+    def _positive(cls, value):
+        if value <= 0:
+            raise ValueError("must be greater than 0")
+        return value
+
 
 class BatchDeleteRequest(BaseSchema):
     execution_ids: List[str]
+
+
+def _number(value):
+    """Broker files write amounts like `$1,250.00`."""
+    if isinstance(value, str):
+        return value.strip().replace(",", "").replace("$", "")
+    return value
+
+
+class ExecutionImportRow(BaseSchema):
+    """One fill from a broker statement.
+
+    The trade is found from `trade_id`, from `scale_plan_id`, or else from
+    `symbol` (its open or watched trade). Without a side, a negative qty
+    is a sell.
+    """
+
+    trade_id: Optional[str] = None
+    scale_plan_id: Optional[str] = None
+    symbol: Optional[str] = None
+    side: Side
+    qty: int
+    price: float
+    commission: float = 0.0
+    executed_at: Optional[datetime] = None
+    notes: str = ""
+
+    @model_validator(mode="before")
+    @classmethod
+    def _side_from_qty(cls, data):
+        if isinstance(data, dict) and not data.get("side"):
+            qty = data.get("qty")
+            try:
+                negative = float(_number(qty)) < 0
+            except (TypeError, ValueError):
+                negative = False
+            data = {**data, "side": Side.SELL if negative else None}
+        return data
+
+    @field_validator("side", mode="before")
+    @classmethod
+    def _side(cls, value):
+        # BUY, Bought, BOT, B / SELL, Sold, SLD, S, "Sell Short"
+        if isinstance(value, str) and value.strip()[:1].lower() in ("b", "s"):
+            return Side.BUY if value.strip()[0].lower() == "b" else Side.SELL
+        return value
+
+    @field_validator("qty", mode="before")
+    @classmethod
+    def _qty(cls, value):
+        value = float(_number(value))
+        if not value.is_integer():
+            raise ValueError("qty must be a whole number")
+        return abs(int(value))
+
+    @field_validator("price", "commission", mode="before")
+    @classmethod
+    def _amount(cls, value):
+        return _number(value)
+
+    @field_validator("qty", "price")
+    @classmethod
+    def _positive(cls, value):
+        if value <= 0:
+            raise ValueError("must be greater than 0")
+        return value
+
+    @field_validator("commission")
+    @classmethod
+    def _commission(cls, value):
+        # Some brokers report fees as negative cash amounts
+        return abs(value)
+
+    @field_validator("symbol")
+    @classmethod
+    def _symbol(cls, value):
+        return value.strip().upper() if value else value
+
+    @model_validator(mode="after")
+    def _has_target(self):
+        if not (self.trade_id or self.scale_plan_id or self.symbol):
+            raise ValueError("one of tradeId, scalePlanId or symbol is required")
+        return self
+
+
+class ImportRowError(BaseSchema):
+    row: int
+    message: str
+
+
+class ExecutionImportReport(BaseSchema):
+    rows: int = 0
+    imported: int = 0
+    invalid: int = 0
+    # The first MAX_IMPORT_ERRORS, in file order
+    errors: List[ImportRowError] = []
+    trades: int = 0
+    scale_plans: int = 0
+    seconds: float = 0.0
+    rows_per_second: float = 0.0
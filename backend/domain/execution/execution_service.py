@@ -1,16 +1,57 @@
+import os
+import time
+from datetime import datetime, timezone
+from typing import AsyncIterable
+from uuid import uuid4
+
 from fastapi import HTTPException, status
+from pydantic import ValidationError
 
-from database.models import TradeExecution, ScalePlan, ScalePlanStatus, TradeStatus
+from core.data_version import mark_changed
+from core.event_hub import event_hub
+from database.models import (
+    ExecSource,
+    TradeExecution,
+    ScalePlan,
+    ScalePlanStatus,
+    TradeStatus,
+    Trade,
+)
+from domain.execution.execution_aggregates import Position, replay_positions
+from domain.execution.execution_import import ImportFormatError
 from domain.execution.execution_repo import ExecutionRepo
 from domain.scale_plan.scale_plan_repo import ScalePlanRepo
 from domain.execution.execution_schema import (
+    ExecutionImportReport,
+    ExecutionImportRow,
     ExecutionRead,
     ExecutionCreate,
     ExecutionUpdate,
+    ImportRowError,
+)
+from domain.scale_plan.scale_plan_schema import (
+    ScalePlanCreateResponse,
+    ScalePlanUpdate,
 )
-from domain.scale_plan.scale_plan_schema import ScalePlanUpdate
 
 from domain.trade.trade_repo import TradeRepo
+from domain.trade.trade_schema import TradeResponse
+
+# Rows per executemany batch when importing
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", 1000))
+# Row errors kept in an import report; the rest are only counted
+MAX_IMPORT_ERRORS = 100
+
+
+def _row_error(row: int, error: ValidationError | ValueError) -> ImportRowError:
+    if isinstance(error, ValidationError):
+        message = "; ".join(
+            f"{'.'.join(map(str, e['loc'])) or 'row'}: {e['msg']}"
+            for e in error.errors()
+        )
+    else:
+        message = str(error)
+    return ImportRowError(row=row, message=message)
 
 
 class ExecutionService:
@@ -24,8 +65,13 @@ class ExecutionService:
     async def get_executions(self, trade_id: str | None = None) -> list[TradeExecution]:
         return await self.repo.get_executions(trade_id)
 
-    async def get_execution_by_id(self, execution_id: str) -> TradeExecution | None:
-        return await self.repo.get_execution_by_id(execution_id)
+    async def get_execution_by_id(self, execution_id: str) -> TradeExecution:
+        execution = await self.repo.get_execution_by_id(execution_id)
+        if not execution:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Execution not found"
+            )
+        return execution
 
     async def create_execution(self, payload: ExecutionCreate) -> TradeExecution:
         data = payload.model_dump()
@@ -33,26 +79,42 @@ class ExecutionService:
 
         # Create the execution first
         created_execution = await self.repo.execute(execution)
+        await self._add_to_aggregates(created_execution)
         # Update scale plan status if execution is linked to a scale plan
+        changed_plan, changed_trade = None, None
         if created_execution.scale_plan_id and self.scale_plan_repo:
-            await self._update_scale_plan_status(created_execution)
+            changed_plan, changed_trade = await self._update_scale_plan_status(
+                created_execution
+            )
 
         await self.repo.commit_all()
+
+        event_hub.publish_model("execution.created", ExecutionRead, created_execution)
+        self._publish_changes([changed_plan], changed_trade)
         return created_execution
 
-    async def _update_scale_plan_status(self, execution: TradeExecution) -> None:
-        """Update scale plan status based on execution."""
+    async def _update_scale_plan_status(
+        self, execution: TradeExecution
+    ) -> tuple[ScalePlan | None, Trade | None]:
+        """Update scale plan status based on execution.
+
+        Returns the scale plan and trade if their status changed.
+        """
         if not execution.scale_plan_id:
-            return
+            return None, None
 
         scale_plan = await self.scale_plan_repo.get_scale_plan_by_id(
-            execution.scale_plan_id
+            execution.scale_plan_id, with_executions=False
         )
         if not scale_plan:
-            return
+            return None, None
+        return await self._sync_plan_status(scale_plan)
 
-        # Calculate total executed quantity for this scale plan
-        total_executed_qty = sum(exec.qty for exec in scale_plan.executions)
+    async def _sync_plan_status(
+        self, scale_plan: ScalePlan
+    ) -> tuple[ScalePlan | None, Trade | None]:
+        """Move the plan's status on from its filled qty after new fills."""
+        total_executed_qty = scale_plan.filled_qty
 
         # Update status based on execution progress
         new_status = scale_plan.status
@@ -65,19 +127,214 @@ class ExecutionService:
             new_status = ScalePlanStatus.TRIGGERED
 
         # Only update if status changed
+        changed_plan = None
         if new_status != scale_plan.status:
-            update_payload = ScalePlanUpdate(status=new_status)
-            await self.scale_plan_repo.update_by_id(
-                scale_plan.id, update_payload, commit=False
-            )
+            scale_plan.status = new_status
+            changed_plan = scale_plan
 
+        changed_trade = None
         if is_filled and scale_plan.plan_type == "entry":
-            await self.trade_repo.execute_trade(scale_plan.trade_id, TradeStatus.OPEN)
+            changed_trade = await self.trade_repo.execute_trade(
+                scale_plan.trade_id, TradeStatus.OPEN
+            )
+
+        return changed_plan, changed_trade
+
+    async def _add_to_aggregates(self, execution: TradeExecution) -> None:
+        """Fold a new execution into its plan's filled qty and trade's position."""
+        await self._adjust_filled_qty(execution.scale_plan_id, execution.qty)
+        trade = await self.trade_repo.get_by_id(execution.trade_id)
+        position = Position.of(trade)
+        if position.follows(execution):
+            position.apply(execution)
+            position.store(trade)
+        else:
+            # A backdated fill changes the average cost of every later one
+            await self._rebuild_positions({trade.id})
+
+    async def _remove_from_aggregates(self, executions: list[TradeExecution]) -> None:
+        for execution in executions:
+            await self._adjust_filled_qty(execution.scale_plan_id, -execution.qty)
+        await self._rebuild_positions({execution.trade_id for execution in executions})
+
+    async def _adjust_filled_qty(self, scale_plan_id: str | None, delta: float) -> None:
+        if not scale_plan_id or not delta:
+            return
+        scale_plan = await self.scale_plan_repo.get_scale_plan_by_id(
+            scale_plan_id, with_executions=False
+        )
+        if scale_plan:
+            scale_plan.filled_qty += delta
+
+    async def _rebuild_positions(self, trade_ids: set[str]) -> None:
+        """Replay each trade's remaining executions in fill order."""
+        positions = await replay_positions(self.repo.session, trade_ids)
+        for trade_id, position in positions.items():
+            position.store(await self.trade_repo.get_by_id(trade_id))
+
+    async def import_executions(
+        self,
+        records: AsyncIterable[tuple[int, dict]],
+        skip_invalid: bool = False,
+    ) -> ExecutionImportReport:
+        """Insert a broker file's fills in one transaction.
+
+        Rows are validated as they stream in and inserted IMPORT_CHUNK_SIZE at
+        a time. Plans and trades are settled once each at the end: filled
+        qty and status for every plan filled, positions replayed for every
+        trade. Unless `skip_invalid`, any invalid row rejects the whole file
+        with a 422 whose detail is the report.
+        """
+        started = time.perf_counter()
+        report = ExecutionImportReport()
+        # Lookups made so far: trade id / plan id / symbol -> trade id or None
+        trades, plans, symbols = {}, {}, {}
+        filled: dict[str, int] = {}
+        trade_ids: set[str] = set()
+        batch: list[dict] = []
+        try:
+            async for row, fields in records:
+                report.rows += 1
+                try:
+                    fill = ExecutionImportRow.model_validate(fields)
+                    trade_id = await self._import_trade_id(fill, trades, plans, symbols)
+                except (ValidationError, ValueError) as e:
+                    report.invalid += 1
+                    if len(report.errors) < MAX_IMPORT_ERRORS:
+                        report.errors.append(_row_error(row, e))
+                    continue
+                if report.invalid and not skip_invalid:
+                    # The file will be rejected; keep reading only to report
+                    continue
+                batch.append(
+                    {
+                        "id": str(uuid4()),
+                        "trade_id": trade_id,
+                        "scale_plan_id": fill.scale_plan_id,
+                        "side": fill.side,
+                        "source": ExecSource.IMPORT,
+                        "commission": fill.commission,
+                        "executed_at": fill.executed_at or datetime.now(timezone.utc),
+                        "qty": fill.qty,
+                        "price": fill.price,
+                        "notes": fill.notes,
+                    }
+                )
+                trade_ids.add(trade_id)
+                if fill.scale_plan_id:
+                    filled[fill.scale_plan_id] = (
+                        filled.get(fill.scale_plan_id, 0) + fill.qty
+                    )
+                if len(batch) >= IMPORT_CHUNK_SIZE:
+                    await self.repo.insert_many(batch)
+                    report.imported += len(batch)
+                    batch = []
+        except ImportFormatError as e:
+            await self.repo.session.rollback()
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+        if report.invalid and not skip_invalid:
+            await self.repo.session.rollback()
+            report.imported = 0
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=self._finish_report(report, started).model_dump(by_alias=True),
+            )
+        await self.repo.insert_many(batch)
+        report.imported += len(batch)
+
+        changed = []
+        for scale_plan_id, qty in filled.items():
+            await self._adjust_filled_qty(scale_plan_id, qty)
+            scale_plan = await self.scale_plan_repo.get_scale_plan_by_id(
+                scale_plan_id, with_executions=False
+            )
+            changed.append(await self._sync_plan_status(scale_plan))
+        await self._rebuild_positions(trade_ids)
+        # The executions were bulk inserted, so cached trades are invalidated by hand
+        mark_changed(self.repo.session, trade_ids)
+        await self.repo.commit_all()
+
+        report.trades, report.scale_plans = len(trade_ids), len(filled)
+        self._finish_report(report, started)
+        event_hub.publish(
+            "executions.imported",
+            {"imported": report.imported, "tradeIds": sorted(trade_ids)},
+        )
+        for changed_plan, changed_trade in changed:
+            if changed_plan:
+                event_hub.publish_model(
+                    "scale_plan.updated", ScalePlanCreateResponse, changed_plan
+                )
+            if changed_trade:
+                event_hub.publish_model("trade.updated", TradeResponse, changed_trade)
+        return report
+
+    async def _import_trade_id(
+        self, fill: ExecutionImportRow, trades: dict, plans: dict, symbols: dict
+    ) -> str:
+        """The trade an imported fill belongs to, from the cached lookups."""
+        if fill.scale_plan_id:
+            if fill.scale_plan_id not in plans:
+                plans[fill.scale_plan_id] = await self.repo.get_plan_trade_id(
+                    fill.scale_plan_id
+                )
+            trade_id = plans[fill.scale_plan_id]
+            if trade_id is None:
+                raise ValueError(f"scale plan {fill.scale_plan_id} not found")
+            if fill.trade_id and fill.trade_id != trade_id:
+                raise ValueError(
+                    f"scale plan {fill.scale_plan_id} belongs to another trade"
+                )
+            return trade_id
+        if fill.trade_id:
+            if fill.trade_id not in trades:
+                trades[fill.trade_id] = await self.repo.trade_exists(fill.trade_id)
+            if not trades[fill.trade_id]:
+                raise ValueError(f"trade {fill.trade_id} not found")
+            return fill.trade_id
+        if fill.symbol not in symbols:
+            symbols[fill.symbol] = await self.repo.get_trade_id_for_symbol(fill.symbol)
+        if symbols[fill.symbol] is None:
+            raise ValueError(f"no open or watched trade for {fill.symbol}")
+        return symbols[fill.symbol]
+
+    @staticmethod
+    def _finish_report(
+        report: ExecutionImportReport, started: float
+    ) -> ExecutionImportReport:
+        report.seconds = round(time.perf_counter() - started, 3)
+        if report.seconds:
+            report.rows_per_second = round(report.rows / report.seconds, 1)
+        return report
 
     async def update_execution(
         self, execution_id: str, payload: ExecutionUpdate
     ) -> TradeExecution:
-        return await self.repo.update_execution(execution_id, payload)
+        execution = await self.repo.get_execution_by_id(execution_id)
+        if not execution:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Execution not found"
+            )
+        old_qty = execution.qty
+        result = await self.repo.update_execution(execution, payload)
+        delta = result.qty - old_qty
+        await self._adjust_filled_qty(result.scale_plan_id, delta)
+        await self._rebuild_positions({result.trade_id})
+        # A larger fill moves the plan on like a new execution does, a smaller
+        # one moves it back like a deleted one does
+        changed_plan, changed_trade = None, None
+        if delta > 0:
+            changed_plan, changed_trade = await self._update_scale_plan_status(result)
+        elif delta < 0 and result.scale_plan_id:
+            changed_plan = await self._update_scale_plan_status_after_delete(
+                result.scale_plan_id
+            )
+        await self.repo.commit_all()
+
+        event_hub.publish_model("execution.updated", ExecutionRead, result)
+        self._publish_changes([changed_plan], changed_trade)
+        return result
 
     async def delete_execution(self, execution_id: str) -> None:
         db_execution = await self.repo.get_execution_by_id(execution_id)
@@ -85,24 +342,59 @@ class ExecutionService:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Execution not found"
             )
-        return await self.repo.delete_execution(execution_id)
+        await self.repo.delete_execution(db_execution)
+        await self._remove_from_aggregates([db_execution])
+        changed_plan = None
+        if db_execution.scale_plan_id:
+            changed_plan = await self._update_scale_plan_status_after_delete(
+                db_execution.scale_plan_id
+            )
+        await self.repo.commit_all()
+
+        event_hub.publish("execution.deleted", {"id": execution_id})
+        self._publish_changes([changed_plan])
 
     async def batch_delete(self, execution_ids: list[str]) -> int:
         result = await self.repo.batch_delete(execution_ids)
-        if result["scale_plan_ids"]:
-            for scale_plan_id in result["scale_plan_ids"]:
-                await self._update_scale_plan_status_after_delete(scale_plan_id)
+        await self._remove_from_aggregates(result["executions"])
+        changed_plans = [
+            await self._update_scale_plan_status_after_delete(scale_plan_id)
+            for scale_plan_id in result["scale_plan_ids"] or ()
+        ]
+        await self.repo.commit_all()
 
+        for execution_id in execution_ids:
+            event_hub.publish("execution.deleted", {"id": execution_id})
+        self._publish_changes(changed_plans)
         return result["deleted_count"]
 
-    async def _update_scale_plan_status_after_delete(self, scale_plan_id: str) -> None:
-        """Update scale plan status after executions are deleted."""
-        scale_plan = await self.scale_plan_repo.get_scale_plan_by_id(scale_plan_id)
+    @staticmethod
+    def _publish_changes(
+        plans: list[ScalePlan | None], trade: Trade | None = None
+    ) -> None:
+        """Announce plans and a trade changed by a committed write."""
+        for plan in plans:
+            if plan:
+                event_hub.publish_model(
+                    "scale_plan.updated", ScalePlanCreateResponse, plan
+                )
+        if trade:
+            event_hub.publish_model("trade.updated", TradeResponse, trade)
+
+    async def _update_scale_plan_status_after_delete(
+        self, scale_plan_id: str
+    ) -> ScalePlan | None:
+        """Move the plan's status back after executions are removed.
+
+        Returns the scale plan if its status changed; the caller commits.
+        """
+        scale_plan = await self.scale_plan_repo.get_scale_plan_by_id(
+            scale_plan_id, with_executions=False
+        )
         if not scale_plan:
-            return
+            return None
 
-        remaining_executions = scale_plan.executions
-        total_executed_qty = sum(exec.qty for exec in remaining_executions)
+        total_executed_qty = scale_plan.filled_qty
 
         # Determine new status
         if total_executed_qty == 0:
@@ -110,14 +402,14 @@ class ExecutionService:
         else:
             new_status = ScalePlanStatus.FILLED_PARTIAL
 
-        await self._update_scale_plan_status_if_changed(scale_plan, new_status)
+        return await self._update_scale_plan_status_if_changed(scale_plan, new_status)
 
     async def _update_scale_plan_status_if_changed(
         self, scale_plan: ScalePlan, new_status: ScalePlanStatus
-    ) -> None:
-        """Update scale plan status only if it has changed."""
-        if new_status != scale_plan.status:
-            from domain.scale_plan.scale_plan_schema import ScalePlanUpdate
-
-            update_payload = ScalePlanUpdate(status=new_status)
-            await self.scale_plan_repo.update_by_id(scale_plan.id, update_payload)
+    ) -> ScalePlan | None:
+        """Update scale plan status only if it has changed; the caller commits."""
+        if new_status == scale_plan.status:
+            return None
+        return await self.scale_plan_repo.update_by_id(
+            scale_plan.id, ScalePlanUpdate(status=new_status), commit=False
+        )
@@ -0,0 +1,33 @@
+from fastapi import APIRouter
+
+from core.event_hub import event_hub
+from core.stock_price.market_data_client import get_market_data_client
+from core.stock_price.profile_store import profile_store
+from core.stock_price.quote_book import quote_book
+from core.stock_price.quote_cache import quote_cache
+from core.stock_price.symbol_index import symbol_index
+from core.stock_price.quote_refresher import get_quote_refresher
+from core.stock_price.quote_share import get_quote_share
+from core.stock_price.quote_stream import get_quote_stream
+from domain.market_data.market_data_schema import MarketDataStats
+
+router = APIRouter()
+
+
+@router.get("/stats", response_model=MarketDataStats)
+async def get_market_data_stats():
+    """Rate-scheduler queue depth and wait times plus quote cache, profile store and stream counters."""
+    stream = get_quote_stream()
+    refresher = get_quote_refresher()
+    share = get_quote_share()
+    return {
+        **get_market_data_client().stats(),
+        "quote_cache": quote_cache.snapshot(),
+        "quote_book_size": len(quote_book),
+        "profile_store": profile_store.snapshot(),
+        "symbol_index": symbol_index.snapshot(),
+        "quote_stream": stream.snapshot() if stream else None,
+        "quote_refresher": refresher.snapshot() if refresher else None,
+        "quote_share": share.snapshot() if share else None,
+        "events": event_hub.snapshot(),
+    }
@@ -0,0 +1,102 @@
+from typing import Dict, Optional
+
+from core.base_schema import BaseSchema
+
+
+class PriorityStats(BaseSchema):
+    queued: int
+    granted: int
+    avg_wait: float
+    max_wait: float
+
+
+class RateSchedulerStats(BaseSchema):
+    calls_per_minute: int
+    burst: int
+    tokens: float
+    queue_depth: int
+    throttled: int
+    priorities: Dict[str, PriorityStats]
+
+
+class QuoteCacheStats(BaseSchema):
+    ttl: float
+    size: int
+    in_flight: int
+    hits: int
+    misses: int
+    coalesced: int
+
+
+class ProfileStoreStats(BaseSchema):
+    max_age: float
+    size: int
+    in_flight: int
+    hits: int
+    misses: int
+    refreshes: int
+    failures: int
+
+
+class SymbolIndexStats(BaseSchema):
+    size: int
+    updated_at: Optional[float] = None
+
+
+class QuoteStreamStats(BaseSchema):
+    running: bool
+    connected: bool
+    subscribed: int
+    ticks: int
+
+
+class QuoteRefresherStats(BaseSchema):
+    running: bool
+    symbols: int
+    hot: int
+    refreshes: int
+    failures: int
+
+
+class QuoteShareStats(BaseSchema):
+    leader: bool
+    published: int
+    applied: int
+    forwarded: int
+    received: int
+
+
+class EventHubStats(BaseSchema):
+    subscribers: int
+    published: int
+    dropped: int
+
+
+class BreakerStats(BaseSchema):
+    state: str
+    failures: int
+    opened: int
+    half_opened: int
+    closed: int
+    rejected: int
+
+
+class HedgingStats(BaseSchema):
+    enabled: bool
+    sent: int
+    wins: int
+    delays: Dict[str, float]
+
+
+class MarketDataStats(BaseSchema):
+    scheduler: Optional[RateSchedulerStats] = None
+    breakers: Dict[str, BreakerStats] = {}
+    hedging: Optional[HedgingStats] = None
+    quote_cache: QuoteCacheStats
+    quote_book_size: int
+    profile_store: ProfileStoreStats
+    symbol_index: SymbolIndexStats
+    quote_stream: Optional[QuoteStreamStats] = None
+    quote_refresher: Optional[QuoteRefresherStats] = None
+    quote_share: Optional[QuoteShareStats] = None
+    events: EventHubStats
@@ -0,0 +1,135 @@
+import contextlib
+import logging
+import os
+
+from core.cache.backends import is_shared_cache
+from core.data_version import data_versions
+from core.env import env_flag
+from core.event_hub import event_hub
+from core.stock_price.market_data_provider import get_market_data_provider
+from core.stock_price.price_publisher import PricePublisher
+from core.stock_price.quote_book import quote_book
+from core.stock_price.quote_refresher import (
+    QuoteRefresher,
+    get_quote_refresher,
+    mark_symbols_viewed,
+    resync_quote_refresher,
+    set_quote_refresher,
+)
+from core.stock_price.quote_share import QuoteShare, get_quote_share, set_quote_share
+from core.stock_price.quote_stream import (
+    QuoteStream,
+    get_quote_stream,
+    notify_symbols_changed,
+    set_quote_stream,
+)
+from core.stock_price.symbol_index import (
+    DEFAULT_INDEX_PATH,
+    DEFAULT_POLL_INTERVAL,
+    DEFAULT_REFRESH_INTERVAL,
+    SymbolIndexRefresher,
+    symbol_index,
+)
+from core.worker_lock import WorkerLock
+from database.session import get_session
+from domain.trade.trade_repo import TradeRepo
+
+logger = logging.getLogger(__name__)
+
+price_publisher = PricePublisher(
+    quote_book, event_hub, interval=float(os.getenv("PRICE_EVENT_INTERVAL", 1))
+)
+
+
+async def fetch_symbol_universe() -> list[dict]:
+    provider = get_market_data_provider()
+    rows: list[dict] = []
+    for exchange in os.getenv("SYMBOL_INDEX_EXCHANGES", "US").split(","):
+        rows.extend(await provider.get_symbol_list(exchange.strip()))
+    return rows
+
+
+symbol_index_refresher = SymbolIndexRefresher(
+    symbol_index,
+    fetch_symbol_universe,
+    path=os.getenv("SYMBOL_INDEX_PATH", DEFAULT_INDEX_PATH),
+    interval=float(
+        os.getenv("SYMBOL_INDEX_REFRESH_INTERVAL", DEFAULT_REFRESH_INTERVAL)
+    ),
+    poll_interval=float(os.getenv("SYMBOL_INDEX_POLL_INTERVAL", DEFAULT_POLL_INTERVAL)),
+)
+
+# With a shared cache, the worker holding this lock is the only one that
+# calls the market-data upstream in the background
+worker_lock = WorkerLock(os.getenv("MARKET_DATA_LEADER_LOCK", "market-data.lock"))
+
+
+async def get_active_symbols() -> set[str]:
+    """Symbols of OPEN and WATCHING trades, read outside of a request."""
+    async with contextlib.aclosing(get_session()) as sessions:
+        async for session in sessions:
+            return await TradeRepo(session=session).get_active_symbols()
+    return set()
+
+
+async def load_quote_snapshots(symbols: list[str]) -> None:
+    await get_market_data_provider().get_stock_price_batch(symbols)
+
+
+async def start_upstream_tasks() -> None:
+    symbol_index_refresher.start()
+    if env_flag("QUOTE_STREAM_ENABLED"):
+        stream = QuoteStream.from_env(
+            quote_book, get_active_symbols, load_quote_snapshots
+        )
+        set_quote_stream(stream)
+        stream.start()
+        logger.info("Streaming quote ingestion enabled")
+    else:
+        refresher = QuoteRefresher.from_env(
+            quote_book, get_active_symbols, get_market_data_provider
+        )
+        set_quote_refresher(refresher)
+        refresher.start()
+
+
+def _symbols_changed() -> None:
+    notify_symbols_changed()
+    resync_quote_refresher()
+
+
+async def start_market_data_tasks() -> None:
+    price_publisher.start()
+    if not is_shared_cache():
+        await start_upstream_tasks()
+        return
+
+    # Workers share quotes through the cache; one of them keeps them fresh.
+    # The others reload the symbol index whenever the leader rewrites it.
+    symbol_index_refresher.start(refresh=False)
+    share = QuoteShare(
+        quote_book,
+        worker_lock.acquire,
+        start_upstream_tasks,
+        data_versions.store,
+        _symbols_changed,
+        mark_symbols_viewed,
+        interval=float(os.getenv("QUOTE_SHARE_INTERVAL", 2)),
+    )
+    set_quote_share(share)
+    share.start()
+
+
+async def stop_market_data_tasks() -> None:
+    if share := get_quote_share():
+        await share.stop()
+        set_quote_share(None)
+    await price_publisher.stop()
+    await symbol_index_refresher.stop()
+    if stream := get_quote_stream():
+        await stream.stop()
+        set_quote_stream(None)
+    if refresher := get_quote_refresher():
+        await refresher.stop()
+        set_quote_refresher(None)
+    worker_lock.release()
@@ -0,0 +1,87 @@
+import os
+import time
+from datetime import datetime, timezone
+from typing import Annotated, List
+
+from dotenv import load_dotenv
+from fastapi import APIRouter, HTTPException, Query, Request, Response, status
+from pydantic import TypeAdapter
+
+from core.etag import etag_matches, make_etag, market_data_version
+from core.json_response import AdapterJSONResponse
+from core.stock_price.quote_book import STALE_QUOTE_AFTER, quote_book
+from core.stock_price.quote_refresher import mark_symbols_viewed
+from domain.quote.quote_schema import QuoteRow, QuotesRequest
+
+load_dotenv()
+
+# Clients may reuse a response this long without asking again
+QUOTES_MAX_AGE = int(os.getenv("QUOTES_MAX_AGE", 2))
+MAX_SYMBOLS = 200
+
+_QUOTE_LIST = TypeAdapter(list[QuoteRow])
+
+router = APIRouter()
+
+
+def _parse_symbols(values: List[str]) -> List[str]:
+    symbols = list(
+        dict.fromkeys(
+            symbol.strip().upper()
+            for value in values
+            for symbol in value.split(",")
+            if symbol.strip()
+        )
+    )
+    if not symbols:
+        raise HTTPException(status_code=400, detail="No symbols given")
+    if len(symbols) > MAX_SYMBOLS:
+        raise HTTPException(
+            status_code=400, detail=f"At most {MAX_SYMBOLS} symbols per request"
+        )
+    return symbols
+
+
+def _quotes_response(request: Request, symbols: List[str]) -> Response:
+    # Symbols being polled are on screen; keep them on the hot refresh interval
+    mark_symbols_viewed(symbols)
+    quotes = quote_book.price_map(symbols).values()
+    now = time.time()
+    etag = make_etag("quotes", *symbols, market_data_version(quotes, now))
+    headers = {"ETag": etag, "Cache-Control": f"max-age={QUOTES_MAX_AGE}"}
+    if etag_matches(request, etag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    rows = [
+        QuoteRow(
+            symbol=quote.symbol,
+            current_price=quote.current_price,
+            change=quote.change,
+            percent_change=quote.percent_change,
+            high=quote.high,
+            low=quote.low,
+            open_price=quote.open_price,
+            previous_close=quote.previous_close,
+            timestamp=quote.timestamp,
+            as_of=datetime.fromtimestamp(quote.updated_at, timezone.utc),
+            stale=now - quote.updated_at > STALE_QUOTE_AFTER,
+        )
+        for quote in quotes
+    ]
+    return AdapterJSONResponse(_QUOTE_LIST, rows, headers=headers)
+
+
+@router.get("", response_model=list[QuoteRow])
+async def get_quotes(request: Request, symbols: Annotated[List[str], Query()]):
+    """Latest quotes from the quote book, e.g. `?symbols=AAPL,MSFT`.
+
+    Never touches the database or the upstream API; symbols the book does
+    not hold yet are left out.
+    """
+    return _quotes_response(request, _parse_symbols(symbols))
+
+
+@router.post("", response_model=list[QuoteRow])
+async def post_quotes(request: Request, payload: QuotesRequest):
+    """Same as GET, for symbol lists too long for a query string."""
+    return _quotes_response(request, _parse_symbols(payload.symbols))
@@ -0,0 +1,25 @@
+from datetime import datetime
+from typing import List, Optional
+
+from core.base_schema import BaseSchema
+
+
+class QuoteRow(BaseSchema):
+    """One symbol's row of the quote book."""
+
+    symbol: str
+    current_price: float
+    change: Optional[float] = None
+    percent_change: Optional[float] = None
+    high: Optional[float] = None
+    low: Optional[float] = None
+    open_price: Optional[float] = None
+    previous_close: Optional[float] = None
+    timestamp: int
+    # When the row was last refreshed, and whether that is older than expected
+    as_of: datetime
+    stale: bool = False
+
+
+class QuotesRequest(BaseSchema):
+    symbols: List[str]
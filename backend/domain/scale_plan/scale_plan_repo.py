@@ -24,7 +24,11 @@ class ScalePlanRepo(BaseRepo[ScalePlan]):
         result = await self.session.exec(stmt)
         return result.all()
 
-    async def get_scale_plan_by_id(self, scale_plan_id: str) -> ScalePlan | None:
+    async def get_scale_plan_by_id(
+        self, scale_plan_id: str, with_executions: bool = True
+    ) -> ScalePlan | None:
+        if not with_executions:
+            return await self.session.get(ScalePlan, scale_plan_id)
         stmt = (
             select(ScalePlan)
             .options(selectinload(ScalePlan.executions))
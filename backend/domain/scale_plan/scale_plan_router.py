@@ -1,6 +1,7 @@
-from fastapi import APIRouter, status
+from fastapi import APIRouter, Request, Response, status
 from typing import Optional
 
+from core.etag import data_etag, etag_headers, etag_matches, not_modified
 from domain.scale_plan.scale_plan_deps import ScalePlanServiceDep
 from domain.scale_plan.scale_plan_schema import (
     ScalePlanRead,
@@ -14,8 +15,15 @@ router = APIRouter()
 
 @router.get("", response_model=list[ScalePlanRead])
 async def get_all_scale_plans_by_trade(
-    service: ScalePlanServiceDep, trade_id: Optional[str] = None
+    request: Request,
+    response: Response,
+    service: ScalePlanServiceDep,
+    trade_id: Optional[str] = None,
 ):
+    etag = await data_etag(request, "scale-plans", trade_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers.update(etag_headers(etag))
     if trade_id:
         return await service.get_all_scale_plans_by_trade(trade_id)
     return await service.get_all_scale_plans()
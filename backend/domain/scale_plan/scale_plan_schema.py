@@ -33,6 +33,7 @@ class ScalePlanRead(ScalePlanBase):
     trade_id: str
     trade_type: TradeType
     status: ScalePlanStatus
+    filled_qty: float = 0.0
     executions: list[ExecutionRead] = Field(default_factory=list)
 
 
@@ -40,6 +41,7 @@ class ScalePlanCreateResponse(ScalePlanBase):
     id: str
     trade_id: str
     status: ScalePlanStatus
+    filled_qty: float = 0.0
 
 
 class ScalePlanUpdate(ScalePlanBase):
@@ -1,8 +1,13 @@
 from fastapi import HTTPException, status
 
+from core.event_hub import event_hub
 from database.models import ScalePlan, ScalePlanStatus
 from domain.scale_plan.scale_plan_repo import ScalePlanRepo
-from domain.scale_plan.scale_plan_schema import ScalePlanCreate, ScalePlanUpdate
+from domain.scale_plan.scale_plan_schema import (
+    ScalePlanCreate,
+    ScalePlanCreateResponse,
+    ScalePlanUpdate,
+)
 
 
 class ScalePlanService:
@@ -18,10 +23,14 @@ class ScalePlanService:
     async def create_scale_plan(self, dto: ScalePlanCreate):
         data = dto.model_dump()
         scale_plan = ScalePlan(**data)
-        return await self.repo.create_scale_plan(scale_plan)
+        result = await self.repo.create_scale_plan(scale_plan)
+        event_hub.publish_model("scale_plan.created", ScalePlanCreateResponse, result)
+        return result
 
     async def update_scale_plan(self, scale_plan_id: str, dto: ScalePlanUpdate):
-        return await self.repo.update_by_id(scale_plan_id, dto)
+        result = await self.repo.update_by_id(scale_plan_id, dto)
+        event_hub.publish_model("scale_plan.updated", ScalePlanCreateResponse, result)
+        return result
 
     async def delete_scale_plan(self, scale_plan_id: str) -> None:
         db_scale_plan = await self.repo.get_scale_plan_by_id(scale_plan_id)
@@ -34,4 +43,5 @@ class ScalePlanService:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Scale plan is not in PLANNED status",
             )
-        return await self.repo.delete_by_id(scale_plan_id)
+        await self.repo.delete_by_id(scale_plan_id)
+        event_hub.publish("scale_plan.deleted", {"id": scale_plan_id})
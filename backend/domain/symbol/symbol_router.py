@@ -0,0 +1,17 @@
+from fastapi import APIRouter, HTTPException, Query, status
+
+from core.stock_price.symbol_index import symbol_index
+from domain.symbol.symbol_schema import SymbolMatch
+
+router = APIRouter()
+
+
+@router.get("/search", response_model=list[SymbolMatch], status_code=status.HTTP_200_OK)
+async def search_symbols(q: str, limit: int = Query(default=10, ge=1, le=50)):
+    """Autocomplete tickers by symbol prefix, company-name word or close spelling."""
+    if not symbol_index.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Symbol index is not loaded yet",
+        )
+    return [entry._asdict() for entry in symbol_index.search(q, limit)]
@@ -0,0 +1,7 @@
+from core.base_schema import BaseSchema
+
+
+class SymbolMatch(BaseSchema):
+    symbol: str
+    description: str
+    type: str
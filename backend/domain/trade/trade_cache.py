@@ -0,0 +1,144 @@
+import asyncio
+import hashlib
+import logging
+from typing import AbstractSet, Any, Dict, List
+
+from fastapi_cache import FastAPICache
+
+from core.data_version import data_versions
+from database.models import Trade
+from domain.trade.trade_repo import ALL_RELATIONS, TradeCursor, TradeRepo
+from domain.trade.trade_schema import TradeFilter, TradeInclude
+
+logger = logging.getLogger(__name__)
+
+NAMESPACE = "trades"
+TRADE_CACHE_EXPIRE = 3600
+
+
+def _page_key(
+    page_version: int,
+    filters: TradeFilter,
+    after: TradeCursor | None,
+    limit: int | None,
+) -> str:
+    query = f"{filters.model_dump_json(exclude_none=True)}|{after}|{limit}"
+    digest = hashlib.sha1(query.encode()).hexdigest()
+    return f"{FastAPICache.get_prefix()}:{NAMESPACE}:page:{page_version}:{digest}"
+
+
+def _include_tag(include: AbstractSet[TradeInclude]) -> str:
+    if include == ALL_RELATIONS:
+        return "all"
+    return "+".join(sorted(relation.value for relation in include)) or "none"
+
+
+def _trade_key(trade_id: str, version: int, tag: str) -> str:
+    return f"{FastAPICache.get_prefix()}:{NAMESPACE}:trade:{trade_id}:{version}:{tag}"
+
+
+class TradeCache:
+    """Caches trade pages as ordered id lists plus one entry per trade.
+
+    Keys carry the data versions from `core.data_version`, so a write to one
+    trade only forces that trade to be re-read. Unfiltered pages depend only
+    on which trades exist and their order, so they follow the list version;
+    filtered pages follow the global version. Entries are only stored when no
+    write committed while they were being loaded.
+    """
+
+    def __init__(self, repo: TradeRepo):
+        self.repo = repo
+
+    @staticmethod
+    def _enabled() -> bool:
+        try:
+            FastAPICache.get_backend()
+        except AssertionError:
+            # FastAPICache.init has not run (e.g. scripts outside the app)
+            return False
+        return FastAPICache.get_enable()
+
+    @staticmethod
+    async def _get(key: str) -> Any:
+        cached = await FastAPICache.get_backend().get(key)
+        return None if cached is None else FastAPICache.get_coder().decode(cached)
+
+    @staticmethod
+    async def _set(entries: Dict[str, Any]) -> None:
+        backend, coder = FastAPICache.get_backend(), FastAPICache.get_coder()
+        await asyncio.gather(
+            *(
+                backend.set(key, coder.encode(value), TRADE_CACHE_EXPIRE)
+                for key, value in entries.items()
+            )
+        )
+
+    @staticmethod
+    async def _unchanged(version: int) -> bool:
+        """Whether no write has committed since `version` was read."""
+        return (await data_versions.current())[0] == version
+
+    async def get_page_ids(
+        self,
+        filters: TradeFilter,
+        after: TradeCursor | None = None,
+        limit: int | None = None,
+    ) -> List[str]:
+        """Ids of up to `limit` trades matching `filters` in list order after `after`."""
+        if not self._enabled():
+            return await self.repo.get_trade_ids(filters, after, limit)
+
+        version, list_version = await data_versions.current()
+        page_version = list_version if filters.is_empty() else version
+        page_key = _page_key(page_version, filters, after, limit)
+        trade_ids = await self._get(page_key)
+        if trade_ids is None:
+            trade_ids = await self.repo.get_trade_ids(filters, after, limit)
+            if await self._unchanged(version):
+                await self._set({page_key: trade_ids})
+        return trade_ids
+
+    async def get_page(
+        self,
+        filters: TradeFilter,
+        after: TradeCursor | None = None,
+        limit: int | None = None,
+        include: AbstractSet[TradeInclude] = ALL_RELATIONS,
+    ) -> List[Trade]:
+        """Up to `limit` trades matching `filters` in list order after `after`.
+
+        Only the relations in `include` are loaded; the others are empty.
+        """
+        trade_ids = await self.get_page_ids(filters, after, limit)
+        if not self._enabled():
+            trades = await self.repo.get_trades_by_ids(trade_ids, include)
+            by_id = {trade.id: trade for trade in trades}
+            return [by_id[trade_id] for trade_id in trade_ids if trade_id in by_id]
+
+        # Read before the per-trade versions so a write in between is caught
+        version, _ = await data_versions.current()
+        versions = await data_versions.trade_versions(trade_ids)
+        tag = _include_tag(include)
+        keys = [_trade_key(trade_id, versions[trade_id], tag) for trade_id in trade_ids]
+        cached = await asyncio.gather(*(self._get(key) for key in keys))
+        by_id = {
+            trade_id: trade
+            for trade_id, trade in zip(trade_ids, cached)
+            if trade is not None
+        }
+
+        missing = [trade_id for trade_id in trade_ids if trade_id not in by_id]
+        if missing:
+            logger.info(f"Trade cache miss for {len(missing)} of {len(trade_ids)}")
+            fetched = await self.repo.get_trades_by_ids(missing, include)
+            by_id.update((trade.id, trade) for trade in fetched)
+            if await self._unchanged(version):
+                await self._set(
+                    {
+                        _trade_key(trade.id, versions[trade.id], tag): trade
+                        for trade in fetched
+                    }
+                )
+
+        return [by_id[trade_id] for trade_id in trade_ids if trade_id in by_id]
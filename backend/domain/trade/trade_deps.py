@@ -1,15 +1,22 @@
+from datetime import datetime
+from database.models import TradeStatus
 from database.session import SessionDep
-from domain.trade.trade_repo import TradeRepo
-from fastapi import Depends
+from domain.trade.trade_repo import ALL_RELATIONS, TradeRepo
+from domain.trade.trade_schema import TradeFilter, TradeInclude
+from fastapi import Depends, HTTPException, Query
+from pydantic.alias_generators import to_snake
 from domain.trade.trade_service import TradeService
 from domain.annotation.annotation_deps import get_annotation_repo
-from typing import Annotated
+from typing import Annotated, List, Optional
 from domain.annotation.annotation_repo import AnnotationRepo
-from core.stock_price.finnhub_service import FinnhubService
+from core.stock_price.market_data_provider import (
+    MarketDataProvider,
+    get_market_data_provider,
+)
 
 
-def get_stock_price_service() -> FinnhubService:
-    return FinnhubService()
+def get_stock_price_service() -> MarketDataProvider:
+    return get_market_data_provider()
 
 
 def get_trade_repo(session: SessionDep) -> TradeRepo:
@@ -19,13 +26,57 @@ def get_trade_repo(session: SessionDep) -> TradeRepo:
 def get_trade_service(
     repo: TradeRepo = Depends(get_trade_repo),
     annotation_repo: AnnotationRepo = Depends(get_annotation_repo),
-    stock_price_service: FinnhubService = Depends(get_stock_price_service),
+    market_data: MarketDataProvider = Depends(get_stock_price_service),
 ) -> TradeService:
     return TradeService(
         repo=repo,
         annotation_repo=annotation_repo,
-        finnhub_service=stock_price_service,
+        market_data=market_data,
     )
 
 
 TradeServiceDep = Annotated[TradeService, Depends(get_trade_service)]
+
+
+def get_trade_filter(
+    status: Annotated[Optional[List[TradeStatus]], Query()] = None,
+    symbol: Optional[str] = None,
+    setup: Optional[str] = None,
+    entered_from: Annotated[Optional[datetime], Query(alias="enteredFrom")] = None,
+    entered_to: Annotated[Optional[datetime], Query(alias="enteredTo")] = None,
+    idea_from: Annotated[Optional[datetime], Query(alias="ideaFrom")] = None,
+    idea_to: Annotated[Optional[datetime], Query(alias="ideaTo")] = None,
+    min_rating: Annotated[Optional[float], Query(alias="minRating")] = None,
+    max_rating: Annotated[Optional[float], Query(alias="maxRating")] = None,
+) -> TradeFilter:
+    return TradeFilter(
+        status=status,
+        symbol=symbol,
+        setup=setup,
+        entered_from=entered_from,
+        entered_to=entered_to,
+        idea_from=idea_from,
+        idea_to=idea_to,
+        min_rating=min_rating,
+        max_rating=max_rating,
+    )
+
+
+TradeFilterDep = Annotated[TradeFilter, Depends(get_trade_filter)]
+
+
+def get_trade_include(include: Optional[str] = None) -> frozenset[TradeInclude]:
+    """Relations named in `include=annotations,scalePlans`; all when omitted."""
+    if include is None:
+        return ALL_RELATIONS
+    try:
+        return frozenset(
+            TradeInclude(to_snake(name.strip()))
+            for name in include.split(",")
+            if name.strip()
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid include: {e}")
+
+
+TradeIncludeDep = Annotated[frozenset[TradeInclude], Depends(get_trade_include)]
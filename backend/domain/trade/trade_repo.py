@@ -1,31 +1,219 @@
+import base64
+import binascii
+import json
 from datetime import datetime, timezone
+from typing import AbstractSet, NamedTuple, Optional
 
 from database.session import SessionDep
-from database.models import Trade, ScalePlan, TradeStatus, Annotation
+from database.models import (
+    Trade,
+    ScalePlan,
+    TradeStatus,
+    Annotation,
+    PlanType,
+    ScalePlanStatus,
+    TradeExecution,
+)
 from core.base_repo import BaseRepo
-from domain.trade.trade_schema import TradeUpdate
+from domain.trade.trade_schema import TradeFilter, TradeInclude, TradeUpdate
 from fastapi import HTTPException
-from sqlmodel import select
-from sqlalchemy.orm import selectinload
+from sqlmodel import and_, func, or_, select
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import aliased, noload, selectinload
+
+ALL_RELATIONS = frozenset(TradeInclude)
+
+
+class TradeCursor(NamedTuple):
+    """Position after the last trade of a page, in list order."""
+
+    enter_date: Optional[datetime]
+    id: str
+
+    @classmethod
+    def after(cls, trade: Trade) -> "TradeCursor":
+        return cls(trade.enter_date, trade.id)
+
+    def encode(self) -> str:
+        date = self.enter_date.isoformat() if self.enter_date else None
+        raw = json.dumps([date, self.id], separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, value: str) -> "TradeCursor":
+        try:
+            raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4))
+            date, trade_id = json.loads(raw)
+            return cls(datetime.fromisoformat(date) if date else None, str(trade_id))
+        except (binascii.Error, ValueError, TypeError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid cursor: {e}")
+
+
+def _filter_clauses(filters: TradeFilter) -> list:
+    clauses = []
+    if filters.status:
+        clauses.append(Trade.status.in_(filters.status))
+    if filters.symbol:
+        clauses.append(Trade.symbol == filters.symbol.upper())
+    if filters.setup:
+        clauses.append(Trade.setup == filters.setup)
+    if filters.entered_from:
+        clauses.append(Trade.enter_date >= filters.entered_from)
+    if filters.entered_to:
+        clauses.append(Trade.enter_date < filters.entered_to)
+    if filters.idea_from:
+        clauses.append(Trade.idea_date >= filters.idea_from)
+    if filters.idea_to:
+        clauses.append(Trade.idea_date < filters.idea_to)
+    if filters.min_rating is not None:
+        clauses.append(Trade.rating >= filters.min_rating)
+    if filters.max_rating is not None:
+        clauses.append(Trade.rating <= filters.max_rating)
+    return clauses
+
+
+def _after_clause(cursor: TradeCursor):
+    # List order is enter_date DESC NULLS LAST, id DESC
+    if cursor.enter_date is None:
+        return and_(Trade.enter_date.is_(None), Trade.id < cursor.id)
+    return or_(
+        Trade.enter_date < cursor.enter_date,
+        and_(Trade.enter_date == cursor.enter_date, Trade.id < cursor.id),
+        Trade.enter_date.is_(None),
+    )
+
+
+def _load_options(include: AbstractSet[TradeInclude]) -> list:
+    """Eager loads for the included relations; the rest are never queried."""
+    options = []
+    for relation in TradeInclude:
+        attr = getattr(Trade, relation.value)
+        if relation not in include:
+            options.append(noload(attr))
+        elif relation is TradeInclude.SCALE_PLANS:
+            options.append(selectinload(attr).selectinload(ScalePlan.executions))
+        else:
+            options.append(selectinload(attr))
+    return options
+
+
+def _child_count(model) -> object:
+    return (
+        select(func.count())
+        .where(model.trade_id == Trade.id)
+        .correlate(Trade)
+        .scalar_subquery()
+    )
+
+
+def _plan_value(column, *where) -> object:
+    return (
+        select(column)
+        .where(ScalePlan.trade_id == Trade.id, *where)
+        .correlate(Trade)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def _first_plan_id(*where) -> object:
+    """Id of the trade's first plan matching `where`, in list order."""
+    return (
+        select(ScalePlan.id)
+        .where(ScalePlan.trade_id == Trade.id, *where)
+        .correlate(Trade)
+        .order_by(ScalePlan.label, ScalePlan.id)
+        .limit(1)
+        .scalar_subquery()
+    )
 
 
 class TradeRepo(BaseRepo[Trade]):
     def __init__(self, session: SessionDep):
         super().__init__(session, Trade)
 
-    async def get_all_trades(self):
+    async def get_trade_ids(
+        self,
+        filters: TradeFilter,
+        after: TradeCursor | None = None,
+        limit: int | None = None,
+    ) -> list[str]:
+        """Ids of the trades matching `filters` in list order, starting after `after`."""
+        stmt = select(Trade.id).where(*_filter_clauses(filters))
+        if after is not None:
+            stmt = stmt.where(_after_clause(after))
+        stmt = stmt.order_by(Trade.enter_date.desc().nulls_last(), Trade.id.desc())
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        result = await self.session.exec(stmt)
+        return list(result.all())
+
+    async def get_trades_by_ids(
+        self,
+        trade_ids: list[str],
+        include: AbstractSet[TradeInclude] = ALL_RELATIONS,
+    ) -> list[Trade]:
         stmt = (
             select(Trade)
-            .options(
-                selectinload(Trade.executions),
-                selectinload(Trade.annotations),
-                selectinload(Trade.scale_plans).selectinload(ScalePlan.executions),
-            )
-            .order_by(Trade.enter_date.desc())
+            .options(*_load_options(include))
+            .where(Trade.id.in_(trade_ids))
+        )
+        result = await self.session.exec(stmt)
+        return result.all()
+
+    async def get_trade_summaries(self, trade_ids: list[str]) -> list[Row]:
+        """Trade columns plus child counts, R:R and fill inputs, in one query."""
+        # Targets without a price carry no weight in the average
+        target = and_(
+            ScalePlan.plan_type == PlanType.TARGET,
+            ScalePlan.target_price.is_not(None),
+        )
+        entry = and_(
+            ScalePlan.plan_type == PlanType.ENTRY,
+            ScalePlan.status != ScalePlanStatus.CANCELED,
+        )
+        # Price and stop come from the same entry plan
+        entry_plan = aliased(ScalePlan)
+        stmt = select(
+            Trade.id,
+            Trade.symbol,
+            Trade.setup,
+            Trade.rating,
+            Trade.status,
+            Trade.idea_date,
+            Trade.enter_date,
+            Trade.exit_date,
+            Trade.outcome,
+            Trade.net_qty,
+            Trade.avg_entry_price,
+            Trade.realized_pnl,
+            _child_count(ScalePlan).label("scale_plan_count"),
+            _child_count(TradeExecution).label("execution_count"),
+            _child_count(Annotation).label("annotation_count"),
+            _plan_value(func.sum(ScalePlan.target_price * ScalePlan.qty), target).label(
+                "target_value"
+            ),
+            _plan_value(func.sum(ScalePlan.qty), target).label("target_qty"),
+            entry_plan.limit_price.label("entry_price"),
+            entry_plan.stop_price.label("entry_stop"),
+            _plan_value(func.sum(ScalePlan.filled_qty), entry).label("entry_filled"),
+            _plan_value(func.sum(ScalePlan.qty), entry).label("entry_qty"),
         )
+        stmt = stmt.outerjoin(entry_plan, entry_plan.id == _first_plan_id(entry))
+        stmt = stmt.where(Trade.id.in_(trade_ids))
         result = await self.session.exec(stmt)
         return result.all()
 
+    async def get_active_symbols(self) -> set[str]:
+        """Distinct symbols of OPEN and WATCHING trades."""
+        stmt = (
+            select(Trade.symbol)
+            .where(Trade.status.in_([TradeStatus.OPEN, TradeStatus.WATCHING]))
+            .distinct()
+        )
+        result = await self.session.exec(stmt)
+        return {symbol.upper() for symbol in result.all() if symbol}
+
     async def get_trade_by_id(self, trade_id: str, include_annotations: bool = True):
         options = [
             selectinload(Trade.executions),
@@ -1,18 +1,80 @@
-from fastapi import APIRouter
-from domain.trade.trade_deps import TradeServiceDep
+import os
+from typing import Annotated, Optional
+
+from dotenv import load_dotenv
+from fastapi import APIRouter, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+
+from core.etag import data_etag, etag_headers, etag_matches, not_modified
+from core.event_hub import event_hub
+from core.json_response import AdapterJSONResponse
+from domain.trade.trade_deps import (
+    TradeFilterDep,
+    TradeIncludeDep,
+    TradeServiceDep,
+)
 from domain.trade.trade_schema import (
     TradeResponse,
+    TradeSummary,
+    TradeView,
     TradeCreate,
     TradeUpdate,
 )
 from fastapi import status
 
+load_dotenv()
+
+TRADE_PAGE_SIZE = int(os.getenv("TRADE_PAGE_SIZE", 100))
+
+# Built once; each list response is serialized by these in a single pass
+_TRADE_LIST = TypeAdapter(list[TradeResponse])
+_SUMMARY_LIST = TypeAdapter(list[TradeSummary])
+
 router = APIRouter()
 
 
-@router.get("", response_model=list[TradeResponse])
-async def get_live_trades(service: TradeServiceDep):
-    return await service.get_all_trades()
+@router.get("", response_model=list[TradeResponse] | list[TradeSummary])
+async def get_live_trades(
+    request: Request,
+    service: TradeServiceDep,
+    filters: TradeFilterDep,
+    include: TradeIncludeDep,
+    view: TradeView = TradeView.FULL,
+    cursor: Optional[str] = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = TRADE_PAGE_SIZE,
+):
+    """A page of trades, newest entry first; `X-Next-Cursor` fetches the next one.
+
+    `view=summary` returns lean `TradeSummary` rows; otherwise `include`
+    picks which relations are loaded and returned. Answers 304 to a matching
+    `If-None-Match` before any trade is loaded. Prices are as of the load;
+    clients poll /api/quotes for live ones.
+    """
+    etag = await data_etag(request, "trades")
+    if etag_matches(request, etag):
+        return not_modified(etag)
+
+    if view is TradeView.SUMMARY:
+        adapter = _SUMMARY_LIST
+        trades, next_cursor = await service.get_trade_summaries(filters, cursor, limit)
+    else:
+        adapter = _TRADE_LIST
+        trades, next_cursor = await service.get_trades(filters, cursor, limit, include)
+    headers = etag_headers(etag)
+    if next_cursor:
+        headers["X-Next-Cursor"] = next_cursor
+    return AdapterJSONResponse(adapter, trades, headers=headers)
+
+
+@router.get("/stream")
+async def stream_trade_events(request: Request):
+    """Server-sent events with price changes and trade/scale-plan/execution deltas."""
+    return StreamingResponse(
+        event_hub.stream(request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.post("", response_model=TradeResponse, status_code=status.HTTP_201_CREATED)
@@ -1,4 +1,5 @@
 from core.base_schema import BaseSchema
+from enum import Enum
 from typing import List, Optional
 from pydantic import Field
 from datetime import datetime
@@ -26,6 +27,10 @@ class TradeResponse(TradeBase):
     rr_ratio: Optional[float] = None
     idea_date: datetime
     status: TradeStatus
+    # Position from the executions, stored on the trade
+    net_qty: float = 0.0
+    avg_entry_price: Optional[float] = None
+    realized_pnl: float = 0.0
 
     # Current market data (added for real-time price display)
     current_price: Optional[float] = None
@@ -40,9 +45,55 @@ class TradeResponse(TradeBase):
     industry: Optional[str] = None
     logo: Optional[str] = None
     cap: Optional[float] = None
+    # When the quote above was last refreshed, and whether it is older than
+    # expected or the enrichment budget ran out and last known values were used
+    market_data_as_of: Optional[datetime] = None
+    market_data_stale: bool = False
     executions: list[ExecutionRead] = Field(default_factory=list)
 
 
+class TradeView(str, Enum):
+    FULL = "full"
+    SUMMARY = "summary"
+
+
+class TradeInclude(str, Enum):
+    """Relations a full trade response can carry."""
+
+    ANNOTATIONS = "annotations"
+    SCALE_PLANS = "scale_plans"
+    EXECUTIONS = "executions"
+
+
+class TradeSummary(TradeBase):
+    """Lean list row: the trade's own columns, child counts and R:R from SQL.
+
+    Market data comes from the local quote book only, so a summary page
+    never waits on the upstream API.
+    """
+
+    id: str
+    status: TradeStatus
+    idea_date: datetime
+    rr_ratio: Optional[float] = None
+    scale_plan_count: int = 0
+    execution_count: int = 0
+    annotation_count: int = 0
+    net_qty: float = 0.0
+    avg_entry_price: Optional[float] = None
+    realized_pnl: float = 0.0
+    # Share of the entry plans' qty filled so far, 0-100
+    filled_pct: Optional[float] = None
+
+    current_price: Optional[float] = None
+    price_change: Optional[float] = None
+    percent_change: Optional[float] = None
+    name: Optional[str] = None
+    logo: Optional[str] = None
+    market_data_as_of: Optional[datetime] = None
+    market_data_stale: bool = False
+
+
 class TradeCreate(TradeBase):
     scale_plans: List[ScalePlanCreate]
     annotations: Optional[List[AnnotationCreate]] = None
@@ -59,6 +110,23 @@ class TradeUpdate(TradeBase):
     annotations: Optional[List[AnnotationCreate]] = None
 
 
+class TradeFilter(BaseSchema):
+    """Query-string filters for the trade list, applied in SQL."""
+
+    status: Optional[List[TradeStatus]] = None
+    symbol: Optional[str] = None
+    setup: Optional[str] = None
+    entered_from: Optional[datetime] = None
+    entered_to: Optional[datetime] = None
+    idea_from: Optional[datetime] = None
+    idea_to: Optional[datetime] = None
+    min_rating: Optional[float] = None
+    max_rating: Optional[float] = None
+
+    def is_empty(self) -> bool:
+        return not self.model_dump(exclude_none=True)
+
+
 class Quote(BaseSchema):
     current_price: float
     price_change: float
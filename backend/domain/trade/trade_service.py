@@ -1,17 +1,26 @@
 import asyncio
 import logging
-from typing import Dict, List, Optional
+import os
+from datetime import datetime, timezone
+from typing import AbstractSet, Awaitable, Dict, List, Sequence, Set, Tuple, TypeVar
 import time
 
-from fastapi_cache import KeyBuilder
-from fastapi_cache.decorator import cache
-from starlette.requests import Request
-from starlette.responses import Response
-
+from core.event_hub import event_hub
 from core.stock_price.finnhub_schema import CompanyProfile, StockQuote
-from domain.trade.trade_repo import TradeRepo
+from core.stock_price.quote_book import STALE_QUOTE_AFTER, BookQuote, quote_book
+from core.stock_price.quote_refresher import (
+    mark_symbols_viewed,
+    resync_quote_refresher,
+)
+from core.stock_price.quote_stream import notify_symbols_changed
+from core.stock_price.symbol_index import symbol_index
+from domain.trade.trade_cache import TradeCache
+from domain.trade.trade_repo import ALL_RELATIONS, TradeCursor, TradeRepo
 from domain.trade.trade_schema import (
     TradeCreate,
+    TradeFilter,
+    TradeInclude,
+    TradeSummary,
     TradeUpdate,
     TradeResponse,
 )
@@ -28,30 +37,57 @@ from database.models import (
     ScalePlanStatus,
 )
 from fastapi import HTTPException, status
-from core.stock_price.finnhub_service import FinnhubService
+from core.stock_price.market_data_provider import MarketDataProvider
+from core.stock_price.rate_scheduler import Priority, prioritized
 
 logging.basicConfig(level=logging.INFO)
 
 logger = logging.getLogger(__name__)
 
 
-class TradesKeyBuilder(KeyBuilder):
-    """Custom key builder class that ignores 'self' parameter for consistent caching."""
+T = TypeVar("T")
 
-    def __call__(
-        self,
-        func,
-        namespace: str = "",
-        *,
-        request: Optional[Request] = None,
-        response: Optional[Response] = None,
-        args: tuple = (),
-        kwargs: dict = None,
-    ) -> str:
-        return f"{namespace}:all_trades"
+# How long a request waits for market data before answering with what it has
+ENRICHMENT_BUDGET = float(os.getenv("ENRICHMENT_BUDGET_MS", 250)) / 1000
+
+# Last profile seen per symbol, served when a lookup misses the budget
+_last_profiles: Dict[str, CompanyProfile] = {}
+# Lookups that outlived their request; referenced so they run to completion
+_background: Set[asyncio.Task] = set()
+
+
+async def _within_budget(aw: Awaitable[T], budget: float) -> Tuple[T | None, bool]:
+    """Await `aw` for at most `budget` seconds.
+
+    Returns `(result, False)` when it finished in time, or `(None, True)` when
+    it did not, in which case it keeps running in the background so its
+    result is there for the next request.
+    """
+    task = asyncio.ensure_future(aw)
+    done, _ = await asyncio.wait({task}, timeout=budget)
+    if task in done:
+        return task.result(), False
+
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())
+    return None, True
+
+
+def _validate_trade(trade: Trade) -> TradeResponse:
+    """`TradeResponse` from an ORM row, looking attributes up by field name.
+
+    Trying the camelCase aliases first misses on every attribute of the row,
+    and each miss raises through SQLModel's slow `__getattr__`.
+    """
+    return TradeResponse.model_validate(trade, by_alias=False, by_name=True)
 
 
-key_builder = TradesKeyBuilder()
+def _split_page(items: Sequence[T], limit: int | None) -> Tuple[Sequence[T], bool]:
+    """Trim a page fetched with one extra row; the flag says whether more follow."""
+    if limit and len(items) > limit:
+        return items[:limit], True
+    return items, False
 
 
 class TradeService:
@@ -59,29 +95,101 @@ class TradeService:
         self,
         repo: TradeRepo,
         annotation_repo: AnnotationRepo,
-        finnhub_service: FinnhubService,
+        market_data: MarketDataProvider,
     ):
         self.repo = repo
         self.annotation_repo = annotation_repo
-        self.finnhub_service = finnhub_service
+        self.market_data = market_data
+        self.cache = TradeCache(repo)
 
     async def get_company_profile(self, symbol: str) -> CompanyProfile | None:
-        return await self.finnhub_service.get_company_profile(symbol)
+        return await self.market_data.get_company_profile(symbol)
 
-    @cache(namespace="trades", expire=3600, key_builder=key_builder)
-    async def _get_cached_trades(self) -> list[Trade]:
-        logger.info("🔥 CACHE MISS: Fetching all trades from database")
+    async def get_trades(
+        self,
+        filters: TradeFilter | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+        include: AbstractSet[TradeInclude] = ALL_RELATIONS,
+    ) -> Tuple[list[TradeResponse], str | None]:
+        """One page of trades with current market data, and the next page's cursor.
+
+        Without `limit` every matching trade is returned. Only the trades on
+        the page are loaded and enriched, and only the relations in `include`.
+        """
+        after = TradeCursor.decode(cursor) if cursor else None
+        # One extra row tells whether another page follows
+        db_trades = await self.cache.get_page(
+            filters or TradeFilter(), after, limit + 1 if limit else None, include
+        )
+        db_trades, more = _split_page(db_trades, limit)
+        next_cursor = TradeCursor.after(db_trades[-1]).encode() if more else None
+        return await self._enrich_trades(db_trades, include), next_cursor
 
-        start_time = time.time()
-        trades = await self.repo.get_all_trades()
-        end_time = time.time()
-        logger.info(f"✅ API call took {end_time - start_time:.2f} seconds")
-        return trades
+    async def get_trade_summaries(
+        self,
+        filters: TradeFilter | None = None,
+        cursor: str | None = None,
+        limit: int | None = None,
+    ) -> Tuple[list[TradeSummary], str | None]:
+        """Like `get_trades`, as `TradeSummary` rows built from a single query."""
+        after = TradeCursor.decode(cursor) if cursor else None
+        trade_ids = await self.cache.get_page_ids(
+            filters or TradeFilter(), after, limit + 1 if limit else None
+        )
+        trade_ids, more = _split_page(trade_ids, limit)
+        if not trade_ids:
+            return [], None
+
+        rows = {row.id: row for row in await self.repo.get_trade_summaries(trade_ids)}
+        rows = [rows[trade_id] for trade_id in trade_ids if trade_id in rows]
+        next_cursor = TradeCursor.after(rows[-1]).encode() if more and rows else None
+        return self._summarize(rows), next_cursor
 
     async def get_all_trades(self) -> list[TradeResponse]:
         """Get all trades with current market data."""
-        db_trades = await self._get_cached_trades()
+        trades, _ = await self.get_trades()
+        return trades
 
+    def _summarize(self, rows: list) -> list[TradeSummary]:
+        symbols = list(
+            {
+                row.symbol
+                for row in rows
+                if row.symbol and row.status in (TradeStatus.OPEN, TradeStatus.WATCHING)
+            }
+        )
+        mark_symbols_viewed(symbols)
+        price_map = self._get_local_price_map(symbols) if symbols else {}
+        profile_map = self._get_last_profile_map(symbols)
+
+        summaries = []
+        for row in rows:
+            data = dict(row._mapping)
+            target_value = data.pop("target_value")
+            target_qty = data.pop("target_qty")
+            data["rr_ratio"] = self._rr_ratio(
+                data.pop("entry_price"),
+                data.pop("entry_stop"),
+                target_value / target_qty if target_value and target_qty else None,
+            )
+            entry_filled = data.pop("entry_filled")
+            entry_qty = data.pop("entry_qty")
+            if entry_qty:
+                data["filled_pct"] = round((entry_filled or 0) / entry_qty * 100, 2)
+            if row.symbol in symbols:
+                # Fields the summary does not carry are ignored on validation
+                data.update(self._market_data(row.symbol, price_map))
+                if profile := profile_map.get(row.symbol):
+                    data.update({"name": profile.name, "logo": profile.logo})
+            summaries.append(TradeSummary.model_validate(data))
+        return summaries
+
+    async def _enrich_trades(
+        self,
+        db_trades: list[Trade],
+        include: AbstractSet[TradeInclude] = ALL_RELATIONS,
+    ) -> list[TradeResponse]:
         if not db_trades:
             return []
 
@@ -97,48 +205,60 @@ class TradeService:
 
         # Early return if no symbols to lookup
         if not symbols:
-            return [TradeResponse.model_validate(trade) for trade in db_trades]
-
-        price_map: Dict[str, StockQuote] = {}
+            return [_validate_trade(trade) for trade in db_trades]
+
+        # Prices come only from the quote book, which the quote stream or the
+        # background refresher keeps current, so the list never waits on the API.
+        # Symbols on screen are refreshed on the hot interval for a while.
+        mark_symbols_viewed(symbols)
+        price_map: Dict[str, StockQuote | BookQuote] = self._get_local_price_map(
+            symbols
+        )
         profile_map: Dict[str, CompanyProfile] = {}
+        degraded = False
 
         try:
-            price_result, profile_result = await asyncio.gather(
-                self._get_price_map(symbols),
-                self._get_profile_map(symbols),
-                return_exceptions=True,
+            profile_map, degraded = await _within_budget(
+                self._get_profile_map(symbols), ENRICHMENT_BUDGET
             )
-
-            if isinstance(price_result, Exception):
-                logging.warning(f"Failed to fetch prices: {price_result}")
-                price_map = {}
-            else:
-                price_map = price_result
-
-            if isinstance(profile_result, Exception):
-                logging.warning(f"Failed to fetch profiles: {profile_result}")
-                profile_map = {}
-            else:
-                profile_map = profile_result
-
         except Exception as e:
-            logging.error(f"Error fetching market data: {e}")
-            price_map = profile_map = {}
+            logging.warning(f"Failed to fetch profiles: {e}")
+            degraded = True
+        if degraded:
+            logging.warning("Profile lookup exceeded the enrichment budget")
+            profile_map = self._get_last_profile_map(symbols)
 
+        looked_up = set(symbols)
         trades = []
         for trade in db_trades:
-            trade_data = self._enrich_trade(trade, price_map, profile_map)
-
-            trades.append(TradeResponse.model_validate(trade_data))
+            trades.append(
+                self._enrich_trade(
+                    trade,
+                    price_map,
+                    profile_map,
+                    degraded and trade.symbol in looked_up,
+                    with_rr=TradeInclude.SCALE_PLANS in include,
+                )
+            )
 
         return trades
 
     async def get_live_trade_by_id(self, live_trade_id: str) -> TradeResponse | None:
-        return await self.repo.get_trade_by_id(live_trade_id)
+        trade = await self.repo.get_trade_by_id(live_trade_id)
+        if trade and trade.symbol:
+            mark_symbols_viewed([trade.symbol])
+        return trade
+
+    async def _symbol_exists(self, symbol: str) -> bool:
+        # The local index answers without a network call; the profile lookup
+        # is only a fallback until the index has been loaded once
+        if symbol_index.ready:
+            return symbol in symbol_index
+        with prioritized(Priority.INTERACTIVE):
+            return bool(await self.market_data.get_company_profile(symbol))
 
     async def create_trade(self, trade: TradeCreate) -> TradeResponse:
-        profile = await self.finnhub_service.get_company_profile(trade.symbol)
-        if not profile:
+        if not await self._symbol_exists(trade.symbol):
             raise HTTPException(
                 status_code=404, detail=f"Stock not found for symbol {trade.symbol}"
             )
@@ -148,13 +268,16 @@ class TradeService:
 
         # Create the trade
         result = await self.repo.create_trade(trade_instance)
+        self._trade_changed("created", result)
 
         return result
 
     async def update_trade(
         self, trade_id: str, payload: TradeUpdate
     ) -> TradeResponse | None:
-        return await self.repo.update_trade(trade_id, payload)
+        result = await self.repo.update_trade(trade_id, payload)
+        self._trade_changed("updated", result)
+        return result
 
     async def replace_trade(self, trade_id: str, payload: TradeCreate) -> TradeResponse:
         """Replace an existing trade with new data while preserving certain fields."""
@@ -165,10 +288,12 @@ class TradeService:
 
         # Enrich the result with current market data if it's an active trade
         if result.symbol and result.status in (TradeStatus.OPEN, TradeStatus.WATCHING):
-            enriched_result = await self._enrich_single_trade(result)
-            return enriched_result
+            response = await self._enrich_single_trade(result)
+        else:
+            response = _validate_trade(result)
 
-        return TradeResponse.model_validate(result)
+        self._trade_changed("updated", response)
+        return response
 
     async def invalidate_trade(self, trade_id: str) -> None:
         trade = await self.repo.get_trade_by_id(trade_id)
@@ -179,45 +304,83 @@ class TradeService:
                 status_code=400, detail="Can only invalidate trades in watching status"
             )
         trade.status = TradeStatus.INVALIDATED
-        await self.repo.update_trade(trade_id, trade)
+        result = await self.repo.update_trade(trade_id, trade)
+        self._trade_changed("updated", result)
 
     async def delete_trade(self, trade_id: str) -> None:
-        return await self.repo.delete_trade(trade_id)
+        await self.repo.delete_trade(trade_id)
+        notify_symbols_changed()
+        resync_quote_refresher()
+        event_hub.publish("trade.deleted", {"id": trade_id})
 
-    async def _get_price_map(self, symbols: list[str]):
-        quotes = await self.finnhub_service.get_stock_price_batch(symbols)
-        return {quote.symbol: quote for quote in quotes}
+    @staticmethod
+    def _trade_changed(op: str, trade: Trade | TradeResponse) -> None:
+        """Propagate a trade mutation to quote subscriptions and event listeners."""
+        notify_symbols_changed()
+        resync_quote_refresher()
+        event_hub.publish_model(f"trade.{op}", TradeResponse, trade)
+
+    def _get_local_price_map(self, symbols: list[str]):
+        missing = [symbol for symbol in symbols if symbol not in quote_book]
+        if missing:
+            # Not refreshed yet (e.g. a new trade); the next pass will have them
+            resync_quote_refresher()
+        return quote_book.price_map(symbols)
 
     async def _get_profile_map(self, symbols: list[str]):
-        profiles = await self.finnhub_service.get_company_profile_batch(symbols)
-        return {profile.ticker: profile for profile in profiles}
+        profiles = await self.market_data.get_company_profile_batch(symbols)
+        profile_map = {profile.ticker: profile for profile in profiles}
+        _last_profiles.update(profile_map)
+        return profile_map
+
+    @staticmethod
+    def _get_last_profile_map(symbols: list[str]) -> Dict[str, CompanyProfile]:
+        return {
+            symbol: profile
+            for symbol in symbols
+            if (profile := _last_profiles.get(symbol))
+        }
+
+    async def _get_quote(self, symbol: str) -> StockQuote | BookQuote:
+        """Quote from the book, falling back to the provider for unseen symbols."""
+        if quote := quote_book.get(symbol):
+            return quote
+        quote = await self.market_data.get_stock_price(symbol)
+        quote_book.update_from_quote(quote)
+        return quote
 
     async def _enrich_single_trade(self, trade: Trade) -> TradeResponse:
         """Enrich a single trade with current market data."""
         if not trade.symbol:
-            return TradeResponse.model_validate(trade)
+            return _validate_trade(trade)
 
         try:
-            quote_task = self.finnhub_service.get_stock_price(trade.symbol)
-            profile_task = self.finnhub_service.get_company_profile(trade.symbol)
-
-            quote, profile = await asyncio.gather(
-                quote_task, profile_task, return_exceptions=True
-            )
+            mark_symbols_viewed([trade.symbol])
+            symbols = [trade.symbol]
+            with prioritized(Priority.INTERACTIVE):
+                lookup = asyncio.gather(
+                    self._get_quote(trade.symbol),
+                    self._get_profile_map(symbols),
+                    return_exceptions=True,
+                )
+                result, degraded = await _within_budget(lookup, ENRICHMENT_BUDGET)
 
-            price_map = (
-                {trade.symbol: quote} if not isinstance(quote, Exception) else {}
-            )
-            profile_map = (
-                {trade.symbol: profile} if not isinstance(profile, Exception) else {}
-            )
+            if degraded:
+                price_map = quote_book.price_map(symbols)
+                profile_map = self._get_last_profile_map(symbols)
+            else:
+                quote, profile_map = result
+                price_map = (
+                    {} if isinstance(quote, Exception) else {trade.symbol: quote}
+                )
+                if isinstance(profile_map, Exception):
+                    profile_map = self._get_last_profile_map(symbols)
 
-            enriched_data = self._enrich_trade(trade, price_map, profile_map)
-            return TradeResponse.model_validate(enriched_data)
+            return self._enrich_trade(trade, price_map, profile_map, degraded)
 
         except Exception as e:
             logging.warning(f"Failed to enrich trade {trade.id} with market data: {e}")
-            return TradeResponse.model_validate(trade)
+            return _validate_trade(trade)
 
     def _build_watchlist_payload(self, trade: TradeCreate):
         scale_plans = self._build_plans(trade.scale_plans)
@@ -234,41 +397,19 @@ class TradeService:
     def _enrich_trade(
         self,
         trade: Trade,
-        price_map: Dict[str, StockQuote],
+        price_map: Dict[str, StockQuote | BookQuote],
         profile_map: Dict[str, CompanyProfile],
-    ):
-        trade_data = TradeResponse.model_validate(trade).model_dump()
-        entry_plan = next(
-            (
-                plan
-                for plan in trade.scale_plans
-                if plan.plan_type == PlanType.ENTRY
-                and plan.status != ScalePlanStatus.CANCELED
-            ),
-            None,
-        )
-
-        target_plans = [
-            sp for sp in trade.scale_plans if sp.plan_type == PlanType.TARGET
-        ]
-
-        trade_data.update(
-            {
-                "rr_ratio": self._calculate_rr_ratio(target_plans, entry_plan),
-            }
-        )
+        degraded: bool = False,
+        with_rr: bool = True,
+    ) -> TradeResponse:
+        # The ORM row is validated once; the market fields below are already
+        # typed, so they are copied in without a second validation pass
+        trade_data = {}
+        if with_rr:
+            trade_data["rr_ratio"] = self._calculate_rr_ratio(trade.scale_plans)
 
         if trade.symbol:
-            if quote := price_map.get(trade.symbol):
-                trade_data.update(
-                    {
-                        "current_price": quote.current_price,
-                        "price_change": quote.change,
-                        "percent_change": quote.percent_change,
-                        "open_price": quote.open_price,
-                        "previous_close": quote.previous_close,
-                    }
-                )
+            trade_data.update(self._market_data(trade.symbol, price_map, degraded))
 
             if profile := profile_map.get(trade.symbol):
                 trade_data.update(
@@ -283,7 +424,61 @@ class TradeService:
                     }
                 )
 
-        return trade_data
+        return _validate_trade(trade).model_copy(update=trade_data)
+
+    @staticmethod
+    def _market_data(
+        symbol: str,
+        price_map: Dict[str, StockQuote | BookQuote],
+        degraded: bool = False,
+    ) -> dict:
+        """Quote fields for `symbol` and whether they are stale."""
+        data = {}
+        stale = degraded
+        if quote := price_map.get(symbol):
+            # Book quotes carry their refresh time; fresh REST quotes are "now"
+            as_of = getattr(quote, "updated_at", None) or time.time()
+            stale = stale or time.time() - as_of > STALE_QUOTE_AFTER
+            data.update(
+                {
+                    "current_price": quote.current_price,
+                    "price_change": quote.change,
+                    "percent_change": quote.percent_change,
+                    "open_price": quote.open_price,
+                    "previous_close": quote.previous_close,
+                    "market_data_as_of": datetime.fromtimestamp(as_of, timezone.utc),
+                }
+            )
+        data["market_data_stale"] = stale
+        return data
+
+    @staticmethod
+    def _calculate_rr_ratio(scale_plans: List[ScalePlan]) -> float:
+        # The first entry plan in list order, as in the trade summaries
+        entry_plan = min(
+            (
+                plan
+                for plan in scale_plans
+                if plan.plan_type == PlanType.ENTRY
+                and plan.status != ScalePlanStatus.CANCELED
+            ),
+            key=lambda plan: (plan.label, plan.id),
+            default=None,
+        )
+        targets = [
+            sp
+            for sp in scale_plans
+            if sp.plan_type == PlanType.TARGET and sp.target_price is not None
+        ]
+        if not targets or not entry_plan or not entry_plan.stop_price:
+            return 0.0
+
+        avg_target = sum(t.target_price * t.qty for t in targets) / sum(
+            t.qty for t in targets
+        )
+        return TradeService._rr_ratio(
+            entry_plan.limit_price, entry_plan.stop_price, avg_target
+        )
 
     @staticmethod
     def _build_annotations(dto: TradeCreate):
@@ -382,19 +577,13 @@ class TradeService:
                 )
 
     @staticmethod
-    def _calculate_rr_ratio(
-        targets: List[ScalePlan], entry_plan: ScalePlan | None
+    def _rr_ratio(
+        entry_price: float | None, stop_price: float | None, avg_target: float | None
     ) -> float:
-        if not targets or not entry_plan:
+        if not stop_price or entry_price is None or avg_target is None:
             return 0.0
 
-        if not entry_plan.stop_price:
-            return 0.0
-        avg_target = sum(t.target_price * t.qty for t in targets) / sum(
-            t.qty for t in targets
-        )
-
-        risk = abs(entry_plan.limit_price - entry_plan.stop_price)
-        reward = abs(avg_target - entry_plan.limit_price)
+        risk = abs(entry_price - stop_price)
+        reward = abs(avg_target - entry_price)
 
         return round(reward / risk, 2) if risk > 0 else 0.0
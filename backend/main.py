@@ -1,25 +1,48 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi_cache.backends.inmemory import InMemoryBackend
-from fastapi_cache import FastAPICache, Coder
 import contextlib
 
-from fastapi_cache.coder import PickleCoder
-
+from core.cache.backends import close_cache, init_cache
+from core.stock_price.market_data_client import (
+    close_market_data_client,
+    init_market_data_client,
+)
+from core.stock_price.market_data_provider import close_market_data_provider
+from core.stock_price.profile_store import profile_store
 from database.db import create_db_and_tables
 from domain.scale_plan.scale_plan_router import router as scale_plan_router
 from domain.trade.trade_router import router as trade_router
 from domain.annotation.annotation_router import router as annotation_router
 from domain.execution.execution_router import router as execution_router
+from domain.market_data.market_data_router import router as market_data_router
+from domain.symbol.symbol_router import router as symbol_router
+from domain.candle.candle_router import router as candle_router
+from domain.cache.cache_router import router as cache_router
+from domain.quote.quote_router import router as quote_router
+from domain.market_data.market_data_tasks import (
+    start_market_data_tasks,
+    stop_market_data_tasks,
+)
+
+CACHE_PREFIX = "fastapi-cache"
 
 
 @contextlib.asynccontextmanager
 async def lifespan(app: FastAPI):
     await create_db_and_tables()
-    FastAPICache.init(InMemoryBackend(), prefix="fastapi-cache", coder=PickleCoder)
+    await profile_store.load()
+    init_cache(CACHE_PREFIX)
+    init_market_data_client()
+    await start_market_data_tasks()
 
     yield
 
+    await stop_market_data_tasks()
+    await profile_store.close()
+    await close_market_data_provider()
+    await close_market_data_client()
+    await close_cache()
+
 
 app = FastAPI(
     title="Trading Journal API",
@@ -34,6 +57,7 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["POST", "GET", "PATCH", "DELETE", "PUT"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
 
 app.include_router(trade_router, prefix="/api/trades", tags=["trades"])
@@ -42,6 +66,13 @@ app.include_router(
     execution_router, prefix="/api/executions", tags=["trade-executions"]
 )
 app.include_router(annotation_router, prefix="/api/annotations", tags=["annotations"])
+app.include_router(
+    market_data_router, prefix="/api/market-data", tags=["market-data"]
+)
+app.include_router(symbol_router, prefix="/api/symbols", tags=["symbols"])
+app.include_router(candle_router, prefix="/api/candles", tags=["candles"])
+app.include_router(cache_router, prefix="/api/cache", tags=["cache"])
+app.include_router(quote_router, prefix="/api/quotes", tags=["quotes"])
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,173 @@
+"""Local stand-in for the Finnhub REST API that enforces a call quota.
+
+The tests mount `create_app()` behind an ASGI transport. To run it as a
+server, `uvicorn tests.fake_finnhub:app --port 8100` and point
+FINHUB_BASE_URL at http://localhost:8100 to exercise the rate scheduler
+without spending real API calls.
+"""
+
+import os
+import time
+import zlib
+from collections import deque
+
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+QUOTA_PER_MINUTE = int(os.getenv("FAKE_FINNHUB_CALLS_PER_MINUTE", 60))
+
+SYMBOLS = [
+    ("AAPL", "APPLE INC", "Common Stock"),
+    ("AMD", "ADVANCED MICRO DEVICES", "Common Stock"),
+    ("AMSC", "AMERICAN SUPERCONDUCTOR CORP", "Common Stock"),
+    ("AMZN", "AMAZON.COM INC", "Common Stock"),
+    ("GOOGL", "ALPHABET INC-CL A", "Common Stock"),
+    ("META", "META PLATFORMS INC-CLASS A", "Common Stock"),
+    ("MSFT", "MICROSOFT CORP", "Common Stock"),
+    ("NVDA", "NVIDIA CORP", "Common Stock"),
+    ("QQQ", "INVESCO QQQ TRUST SERIES 1", "ETP"),
+    ("SPY", "SPDR S&P 500 ETF TRUST", "ETP"),
+    ("TSLA", "TESLA INC", "Common Stock"),
+]
+
+_RESOLUTION_SECONDS = {
+    "1": 60,
+    "5": 300,
+    "15": 900,
+    "30": 1800,
+    "60": 3600,
+    "D": 86400,
+    "W": 604800,
+    "M": 2592000,
+}
+
+
+class Quota:
+    """Sliding-window quota; `served` lists the symbols served, in order."""
+
+    def __init__(self, calls: int, window: float = 60.0):
+        self.calls = calls
+        self.window = window
+        self.served: list[str] = []
+        self.rejected = 0
+        self._calls: deque[float] = deque()
+
+    def check(self, symbol: str = "") -> float | None:
+        """Record a call; seconds until the window frees up if over quota."""
+        now = time.monotonic()
+        while self._calls and now - self._calls[0] >= self.window:
+            self._calls.popleft()
+        if len(self._calls) >= self.calls:
+            self.rejected += 1
+            return self.window - (now - self._calls[0])
+        self._calls.append(now)
+        self.served.append(symbol)
+        return None
+
+
+def _rejected(retry_after: float) -> JSONResponse:
+    return JSONResponse(
+        status_code=429,
+        content={"error": "API limit reached. Please try again later."},
+        headers={"Retry-After": str(max(1, round(retry_after)))},
+    )
+
+
+def _base_price(symbol: str) -> float:
+    return 10 + zlib.crc32(symbol.encode()) % 490
+
+
+def create_app(calls: int = QUOTA_PER_MINUTE, window: float = 60.0) -> FastAPI:
+    """A fake allowing `calls` per `window` seconds, counted in `app.state.quota`."""
+    app = FastAPI(title="Fake Finnhub")
+    app.state.quota = quota = Quota(calls, window)
+
+    @app.get("/quote")
+    async def quote(symbol: str):
+        if (retry_after := quota.check(symbol)) is not None:
+            return _rejected(retry_after)
+        price = _base_price(symbol)
+        return {
+            "c": price,
+            "d": 1.0,
+            "dp": round(100 / (price - 1), 4),
+            "h": price + 2,
+            "l": price - 2,
+            "o": price - 0.5,
+            "pc": price - 1,
+            "t": int(time.time()),
+        }
+
+    @app.get("/stock/profile2")
+    async def profile(symbol: str):
+        if (retry_after := quota.check(symbol)) is not None:
+            return _rejected(retry_after)
+        return {
+            "country": "US",
+            "currency": "USD",
+            "exchange": "NASDAQ NMS - GLOBAL MARKET",
+            "marketCapitalization": _base_price(symbol) * 1000,
+            "name": f"{symbol.upper()} Inc",
+            "ticker": symbol.upper(),
+            "weburl": f"https://example.com/{symbol.lower()}",
+            "logo": "",
+            "finnhubIndustry": "Technology",
+        }
+
+    @app.get("/stock/symbol")
+    async def symbols(exchange: str):
+        if (retry_after := quota.check()) is not None:
+            return _rejected(retry_after)
+        return [
+            {
+                "symbol": symbol,
+                "displaySymbol": symbol,
+                "description": description,
+                "type": type_,
+                "currency": "USD",
+            }
+            for symbol, description, type_ in SYMBOLS
+        ]
+
+    @app.get("/stock/candle")
+    async def candles(
+        symbol: str,
+        resolution: str,
+        start: int = Query(alias="from"),
+        end: int = Query(alias="to"),
+    ):
+        if (retry_after := quota.check(symbol)) is not None:
+            return _rejected(retry_after)
+        step = _RESOLUTION_SECONDS[resolution]
+        stamps = list(range(-(-start // step) * step, end + 1, step))[-5000:]
+        if not stamps:
+            return {"s": "no_data"}
+        base = _base_price(symbol)
+        # Deterministic wiggle so repeated fetches of the same bar agree
+        closes = [
+            base + (zlib.crc32(f"{symbol}{t}".encode()) % 200 - 100) / 50
+            for t in stamps
+        ]
+        return {
+            "s": "ok",
+            "t": stamps,
+            "o": [c - 0.25 for c in closes],
+            "h": [c + 0.5 for c in closes],
+            "l": [c - 0.5 for c in closes],
+            "c": closes,
+            "v": [1000 + zlib.crc32(str(t).encode()) % 9000 for t in stamps],
+        }
+
+    @app.get("/_stats")
+    async def get_stats():
+        return {
+            "served": len(quota.served),
+            "rejected": quota.rejected,
+            "quota": quota.calls,
+            "window": quota.window,
+        }
+
+    return app
+
+
+app = create_app()
@@ -0,0 +1,308 @@
+"""Query-plan check for every repository read, against a migrated SQLite file.
+
+Builds a fresh database with the Alembic migrations, seeds it, runs ANALYZE,
+then calls each repository query and records the statements it emits,
+eager loads included. Every statement is run through EXPLAIN QUERY PLAN;
+the check fails when one scans a table or walks a whole index instead of
+searching it, or sorts its result in a temporary b-tree. Reads that cover
+a whole table on purpose are listed in ALLOWED_SCANS. The test suite runs
+it (test_query_plans.py); to print every plan:
+
+    python -m tests.query_plans --verbose
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import re
+import sys
+import tempfile
+from argparse import Namespace
+from datetime import datetime, timedelta, timezone
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import event
+from sqlalchemy.orm import sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database.db import make_engine
+from database.models import (
+    Annotation,
+    AnnotationType,
+    Candle,
+    CandleCoverage,
+    PlanType,
+    ScalePlan,
+    ScalePlanStatus,
+    Side,
+    Trade,
+    TradeExecution,
+    TradeStatus,
+)
+from domain.annotation.annotation_repo import AnnotationRepo
+from domain.candle.candle_repo import CandleRepo
+from domain.execution.execution_aggregates import replay_positions
+from domain.execution.execution_repo import ExecutionRepo
+from domain.scale_plan.scale_plan_repo import ScalePlanRepo
+from domain.trade.trade_repo import TradeCursor, TradeRepo
+from domain.trade.trade_schema import TradeFilter, TradeInclude
+
+ALEMBIC_INI = os.path.join(os.path.dirname(os.path.dirname(__file__)), "alembic.ini")
+EPOCH = datetime(2025, 1, 2, 14, 30, tzinfo=timezone.utc)
+
+# Reads that walk a whole table or index on purpose. The unfiltered list
+# pages walk the (enter_date, id) index in order and stop at the LIMIT; the
+# others return every row.
+ALLOWED_SCANS = {
+    "trades.page": {"trade"},
+    "trades.page_after": {"trade"},
+    "trades.active_symbols": {"trade"},
+    "executions.all": {"trade_execution"},
+    "annotations.all": {"annotation"},
+}
+
+# Includes index walks: filtering one by anything but its columns reads it all
+FULL_SCAN = re.compile(r"^SCAN (\w+)")
+TEMP_SORT = re.compile(r"USE TEMP B-TREE FOR (ORDER BY|RIGHT PART OF ORDER BY)")
+
+
+def migrate(path: str) -> None:
+    config = Config(ALEMBIC_INI, cmd_opts=Namespace(x=[f"url=sqlite:///{path}"]))
+    command.upgrade(config, "head")
+
+
+def seed_rows(trades: int) -> list:
+    rng = random.Random(11)
+    statuses = list(TradeStatus)
+    rows = []
+    for i in range(trades):
+        trade = Trade(
+            symbol=f"SYM{i % 100:03d}",
+            setup=rng.choice(["breakout", "pullback", "reversal"]),
+            rating=rng.randint(1, 5),
+            status=statuses[i % len(statuses)],
+            idea_date=EPOCH + timedelta(hours=i),
+            enter_date=None if i % 5 == 0 else EPOCH + timedelta(hours=i, minutes=5),
+        )
+        for n in range(4):
+            plan = ScalePlan(
+                plan_type=PlanType.ENTRY if n == 0 else PlanType.TARGET,
+                status=rng.choice(list(ScalePlanStatus)),
+                label=f"T{n}",
+                qty=10,
+                limit_price=100,
+                stop_price=95,
+                target_price=110 + n,
+            )
+            trade.scale_plans.append(plan)
+            trade.executions.append(
+                TradeExecution(
+                    scale_plan=plan,
+                    side=Side.BUY,
+                    qty=5,
+                    price=100,
+                    executed_at=EPOCH + timedelta(hours=i, minutes=n),
+                )
+            )
+        trade.annotations.append(
+            Annotation(content="seed", annotation_type=rng.choice(list(AnnotationType)))
+        )
+        rows.append(trade)
+
+    start = int(EPOCH.timestamp())
+    for symbol in ("SYM000", "SYM001"):
+        rows.extend(
+            Candle(
+                symbol=symbol,
+                timeframe="1m",
+                ts=start + i * 60,
+                open=1,
+                high=2,
+                low=0.5,
+                close=1.5,
+                volume=100,
+            )
+            for i in range(2000)
+        )
+        rows.append(
+            CandleCoverage(
+                symbol=symbol, timeframe="1m", start=start, end=start + 2000 * 60
+            )
+        )
+    return rows
+
+
+async def repository_reads(factory) -> dict:
+    """Label -> coroutine factory for each repository read path."""
+    async with factory() as session:
+        # An entered trade from the middle of the list, and the first page
+        repo = TradeRepo(session)
+        listed = await repo.get_trade_ids(TradeFilter())
+        [trade] = await repo.get_trades_by_ids([listed[len(listed) // 2]])
+        trade_id, scale_plan_id = trade.id, trade.scale_plans[0].id
+        execution_id, annotation_id = trade.executions[0].id, trade.annotations[0].id
+        cursor = TradeCursor.after(trade)
+    start = int(EPOCH.timestamp())
+    page_ids = listed[:100]
+
+    def trades(method, *args, **kwargs):
+        return lambda session: getattr(TradeRepo(session), method)(*args, **kwargs)
+
+    return {
+        "trades.page": trades("get_trade_ids", TradeFilter(), limit=100),
+        "trades.page_after": trades(
+            "get_trade_ids", TradeFilter(), after=cursor, limit=100
+        ),
+        "trades.page_status": trades(
+            "get_trade_ids", TradeFilter(status=[TradeStatus.OPEN]), limit=100
+        ),
+        "trades.page_status_after": trades(
+            "get_trade_ids",
+            TradeFilter(status=[TradeStatus.OPEN]),
+            after=cursor,
+            limit=100,
+        ),
+        "trades.page_entered": trades(
+            "get_trade_ids",
+            TradeFilter(
+                entered_from=EPOCH + timedelta(days=3),
+                entered_to=EPOCH + timedelta(days=10),
+            ),
+            limit=100,
+        ),
+        "trades.by_ids": trades("get_trades_by_ids", page_ids),
+        "trades.by_ids_bare": trades(
+            "get_trades_by_ids", page_ids, include=frozenset({TradeInclude.EXECUTIONS})
+        ),
+        "trades.summaries": trades("get_trade_summaries", page_ids),
+        "trades.active_symbols": trades("get_active_symbols"),
+        "trades.by_id": trades("get_trade_by_id", trade_id),
+        "scale_plans.by_trade": lambda s: ScalePlanRepo(s).get_scale_plans_by_trade(
+            trade_id
+        ),
+        "scale_plans.by_id": lambda s: ScalePlanRepo(s).get_scale_plan_by_id(
+            scale_plan_id
+        ),
+        "executions.by_trade": lambda s: ExecutionRepo(s).get_executions(trade_id),
+        "executions.all": lambda s: ExecutionRepo(s).get_executions(),
+        "executions.by_id": lambda s: ExecutionRepo(s).get_execution_by_id(
+            execution_id
+        ),
+        "executions.trade_exists": lambda s: ExecutionRepo(s).trade_exists(trade_id),
+        "executions.plan_trade_id": lambda s: ExecutionRepo(s).get_plan_trade_id(
+            scale_plan_id
+        ),
+        "executions.symbol_trade_id": lambda s: ExecutionRepo(
+            s
+        ).get_trade_id_for_symbol("SYM007"),
+        "executions.replay": lambda s: replay_positions(s, [trade_id]),
+        "annotations.all": lambda s: AnnotationRepo(s).get_all_annotations(),
+        "annotations.by_type": lambda s: AnnotationRepo(s).get_all_annotations(
+            "catalyst"
+        ),
+        "annotations.by_id": lambda s: AnnotationRepo(s).get_annotation_by_id(
+            annotation_id
+        ),
+        "candles.bars": lambda s: CandleRepo(s).get_bars(
+            "SYM000", "1m", start, start + 600 * 60
+        ),
+        "candles.coverage": lambda s: CandleRepo(s).get_coverage("SYM000", "1m"),
+    }
+
+
+def problems(label: str, plan: list[str]) -> list[str]:
+    found = []
+    for step in plan:
+        scan = FULL_SCAN.match(step)
+        if scan and scan.group(1) not in ALLOWED_SCANS.get(label, ()):
+            found.append(step)
+        elif TEMP_SORT.search(step):
+            found.append(step)
+    return found
+
+
+async def check(engine, factory, verbose: bool) -> dict:
+    statements: list[tuple[str, object]] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    reads = await repository_reads(factory)
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    captured = {}
+    try:
+        for label, read in reads.items():
+            statements.clear()
+            async with factory() as session:
+                await read(session)
+            captured[label] = list(statements)
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+    report = {}
+    async with engine.connect() as conn:
+        for label, queries in captured.items():
+            entries = []
+            for statement, parameters in queries:
+                rows = await conn.exec_driver_sql(
+                    f"EXPLAIN QUERY PLAN {statement}", parameters
+                )
+                plan = [row[-1] for row in rows]
+                entry = {"problems": problems(label, plan)}
+                if verbose or entry["problems"]:
+                    entry["sql"] = " ".join(statement.split())
+                    entry["plan"] = plan
+                entries.append(entry)
+            report[label] = entries
+    return report
+
+
+async def run(args, path: str) -> dict:
+    engine = make_engine(f"sqlite+aiosqlite:///{path}")
+    factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    try:
+        async with factory() as session:
+            session.add_all(seed_rows(args.trades))
+            await session.commit()
+        async with engine.begin() as conn:
+            await conn.exec_driver_sql("ANALYZE")
+        report = await check(engine, factory, args.verbose)
+    finally:
+        await engine.dispose()
+
+    failed = sorted(
+        label
+        for label, entries in report.items()
+        if any(entry["problems"] for entry in entries)
+    )
+    result = {"queries": len(report), "failed": failed}
+    if args.verbose or failed:
+        result["plans"] = {
+            label: entries
+            for label, entries in report.items()
+            if args.verbose or label in failed
+        }
+    return result
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--trades", type=int, default=2000)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "plans.db")
+        # Alembic's env.py runs its own event loop, so migrate first
+        migrate(path)
+        result = asyncio.run(run(args, path))
+    print(json.dumps(result, indent=2))
+    return 1 if result["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""Local websocket stand-in for the Finnhub trade stream.
+
+Replays ticks recorded with QUOTE_STREAM_RECORD_PATH (one raw Finnhub message
+per line), honouring subscribe/unsubscribe messages and the original spacing
+between ticks. Timestamps are shifted to the current time on every pass. The
+tests drive a `ReplayServer` directly; to run one by hand:
+
+    python -m tests.replay_ws ticks.jsonl --port 8765 [--speed 10]
+
+then start the API with QUOTE_STREAM_ENABLED=true and
+FINNHUB_WS_URL=ws://localhost:8765.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import time
+
+import websockets
+
+logger = logging.getLogger(__name__)
+
+
+def load_recording(path: str) -> list[dict]:
+    ticks = []
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            message = json.loads(line)
+            if message.get("type") == "trade":
+                ticks.extend(message.get("data") or [])
+    ticks.sort(key=lambda t: t["t"])
+    return ticks
+
+
+async def _replay(
+    ws, ticks: list[dict], subscribed: set[str], speed: float, loop_forever: bool
+) -> None:
+    async def listen():
+        async for raw in ws:
+            message = json.loads(raw)
+            symbol = (message.get("symbol") or "").upper()
+            if message.get("type") == "subscribe":
+                subscribed.add(symbol)
+            elif message.get("type") == "unsubscribe":
+                subscribed.discard(symbol)
+
+    listener = asyncio.create_task(listen())
+    try:
+        while ticks:
+            # Rebase each pass onto the wall clock so replayed ticks are never
+            # older than the REST snapshots the client seeded its book with
+            offset = int(time.time() * 1000) - ticks[0]["t"]
+            previous_t = None
+            for tick in ticks:
+                if previous_t is not None:
+                    await asyncio.sleep(max(0, tick["t"] - previous_t) / 1000 / speed)
+                previous_t = tick["t"]
+                if tick["s"].upper() in subscribed:
+                    data = [{**tick, "t": tick["t"] + offset}]
+                    await ws.send(json.dumps({"type": "trade", "data": data}))
+            if not loop_forever:
+                break
+    finally:
+        listener.cancel()
+
+
+class ReplayServer:
+    """Replays `ticks` to every client; `subscribed` is the latest client's set."""
+
+    def __init__(self, ticks: list[dict], speed: float = 1.0, loop_forever=True):
+        self.ticks = ticks
+        self.speed = speed
+        self.loop_forever = loop_forever
+        self.connections = 0
+        self.subscribed: set[str] = set()
+        self._clients: set = set()
+        self._server = None
+
+    async def _handler(self, ws, *_) -> None:
+        self.connections += 1
+        self.subscribed = subscribed = set()
+        self._clients.add(ws)
+        try:
+            await _replay(ws, self.ticks, subscribed, self.speed, self.loop_forever)
+        except websockets.ConnectionClosed:
+            pass
+        finally:
+            self._clients.discard(ws)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start listening; returns the port (a free one when `port` is 0)."""
+        self._server = await websockets.serve(self._handler, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def drop_clients(self) -> None:
+        """Close every open connection, as an upstream restart would."""
+        await asyncio.gather(*(ws.close() for ws in list(self._clients)))
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+
+async def serve(path: str, host: str, port: int, speed: float, loop_forever: bool):
+    ticks = load_recording(path)
+    server = ReplayServer(ticks, speed, loop_forever)
+    await server.start(host, port)
+    logger.info(f"Replaying {len(ticks)} ticks from {path} on ws://{host}:{port}")
+    try:
+        await asyncio.Future()
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("recording")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--speed", type=float, default=1.0)
+    parser.add_argument("--once", action="store_true", help="do not loop the recording")
+    args = parser.parse_args()
+    asyncio.run(serve(args.recording, args.host, args.port, args.speed, not args.once))
@@ -0,0 +1,109 @@
+import httpx
+import pytest
+
+from core.stock_price.finnhub_service import FinnhubService
+from core.stock_price.market_data_client import MarketDataClient
+from core.stock_price.rate_scheduler import RateScheduler
+from database.models import Timeframe
+from domain.candle import candle_service
+from domain.candle.candle_repo import CandleRepo
+from domain.candle.candle_service import (
+    CandleService,
+    merge_spans,
+    missing_spans,
+    resample,
+)
+from tests.fake_finnhub import create_app
+
+HOUR = 3600
+# A Monday 00:00 UTC, so 4h buckets start on it
+T = 1_700_438_400
+
+
+def test_missing_spans():
+    assert missing_spans([], 0, 100) == [(0, 100)]
+    assert missing_spans([(0, 100)], 0, 100) == []
+    assert missing_spans([(10, 20), (30, 40)], 0, 50) == [
+        (0, 10),
+        (20, 30),
+        (40, 50),
+    ]
+    # Spans entirely outside the range are ignored
+    assert missing_spans([(0, 10), (20, 30), (90, 99)], 15, 50) == [(15, 20), (30, 50)]
+    # Overlapping spans do not move the cursor back
+    assert missing_spans([(0, 40), (10, 20), (50, 60)], 0, 60) == [(40, 50)]
+    assert missing_spans([(0, 10), (10, 20)], 0, 20) == []
+    assert missing_spans([(0, 10)], 50, 50) == []
+
+
+def test_merge_spans():
+    assert merge_spans([]) == []
+    assert merge_spans([(30, 40), (0, 10), (5, 20)]) == [(0, 20), (30, 40)]
+    # Adjacent spans join; empty ones, like a still-open bar's, are dropped
+    assert merge_spans([(0, 10), (10, 20), (25, 25), (30, 20)]) == [(0, 20)]
+    assert merge_spans([(0, 50), (10, 20)]) == [(0, 50)]
+
+
+def test_resample():
+    bars = [
+        (T, 10, 12, 9, 11, 100),
+        (T + HOUR, 11, 15, 10, 14, 200),
+        (T + 3 * HOUR, 14, 14, 8, 9, 50),
+        # Only the first hour of the next bucket has traded so far
+        (T + 4 * HOUR, 9, 10, 9, 10, 5),
+    ]
+    assert resample(bars, 4 * HOUR) == [
+        (T, 10, 15, 8, 9, 350),
+        (T + 4 * HOUR, 9, 10, 9, 10, 5),
+    ]
+    assert resample([], 4 * HOUR) == []
+
+
+class RecordingFinnhub(FinnhubService):
+    def __init__(self, client: MarketDataClient):
+        super().__init__(client)
+        self.fetched = []
+
+    async def get_candles(self, symbol, resolution, start, end):
+        self.fetched.append((start, end))
+        return await super().get_candles(symbol, resolution, start, end)
+
+
+@pytest.fixture
+async def service(session, monkeypatch):
+    monkeypatch.setenv("FINHUB_API_KEY", "test")
+    monkeypatch.setenv("FINHUB_BASE_URL", "http://finnhub.test")
+    client = MarketDataClient(
+        scheduler=RateScheduler(calls_per_minute=6000),
+        transport=httpx.ASGITransport(app=create_app(calls=100)),
+    )
+    yield CandleService(CandleRepo(session), RecordingFinnhub(client))
+    await client.aclose()
+
+
+async def test_only_missing_ranges_are_fetched(service):
+    first = await service.get_candles("AAPL", Timeframe.ONE_HOUR, T, T + 10 * HOUR)
+    assert len(first.timestamps) == 11
+    assert first.missing == []
+
+    second = await service.get_candles(
+        "AAPL", Timeframe.ONE_HOUR, T + 5 * HOUR, T + 15 * HOUR
+    )
+    assert second.timestamps == list(range(T + 5 * HOUR, T + 16 * HOUR, HOUR))
+
+    await service.get_candles("AAPL", Timeframe.ONE_HOUR, T, T + 15 * HOUR)
+    assert service.market_data.fetched == [
+        (T, T + 10 * HOUR),
+        (T + 10 * HOUR, T + 15 * HOUR),
+    ]
+
+
+async def test_open_bar_is_refetched_until_it_closes(service, monkeypatch):
+    now = T + 100 * HOUR + 1800
+    monkeypatch.setattr(candle_service.time, "time", lambda: now)
+    await service.get_candles("AAPL", Timeframe.ONE_HOUR, T + 90 * HOUR)
+    await service.get_candles("AAPL", Timeframe.ONE_HOUR, T + 90 * HOUR)
+    assert service.market_data.fetched == [
+        (T + 90 * HOUR, now),
+        (T + 100 * HOUR, now),
+    ]
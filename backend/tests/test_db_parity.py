@@ -0,0 +1,60 @@
+"""The repositories return the same results on SQLite and PostgreSQL.
+
+Skipped unless TEST_POSTGRES_URL points at a scratch PostgreSQL database;
+its tables are dropped and recreated.
+"""
+
+import asyncio
+import os
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from benchmarks.db_parity import FILTERS, build_trades, snapshot
+from database.db import database_url, make_engine, pool_options
+
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+TRADES = 120
+CHECKS = [*(f"pages:{name}" for name in FILTERS), "trades", "summaries"]
+CHECKS += ["candles", "coverage"]
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+
+async def _snapshot(url: str) -> dict:
+    engine = make_engine(url, **pool_options(url))
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(SQLModel.metadata.drop_all)
+            await conn.run_sync(SQLModel.metadata.create_all)
+        factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with factory() as session:
+            session.add_all(build_trades(TRADES))
+            await session.commit()
+        return await snapshot(factory, TRADES)
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def snapshots(tmp_path_factory) -> tuple[dict, dict]:
+    sqlite_url = f"sqlite+aiosqlite:///{tmp_path_factory.mktemp('parity') / 'db'}"
+    # Seeded once for every check; the snapshots are plain data
+    return (
+        asyncio.run(_snapshot(sqlite_url)),
+        asyncio.run(_snapshot(database_url(POSTGRES_URL))),
+    )
+
+
+def test_every_read_path_is_checked(snapshots):
+    sqlite, postgres = snapshots
+    assert sorted(sqlite) == sorted(postgres) == sorted(CHECKS)
+
+
+@pytest.mark.parametrize("check", CHECKS)
+def test_results_match(snapshots, check):
+    sqlite, postgres = snapshots
+    assert sqlite[check], f"{check} returned nothing to compare"
+    assert postgres[check] == sqlite[check]
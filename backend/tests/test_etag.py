@@ -0,0 +1,44 @@
+import time
+
+from core import etag
+from core.stock_price.quote_book import STALE_QUOTE_AFTER, QuoteBook
+
+
+def version(book: QuoteBook, *symbols: str, now: float | None = None) -> str:
+    quotes = book.price_map(symbols).values()
+    return etag.market_data_version(quotes, now or time.time())
+
+
+def test_market_data_version_follows_only_the_quotes_returned():
+    book = QuoteBook()
+    book.apply_tick("AAPL", 100.0, 1.0)
+    book.apply_tick("MSFT", 200.0, 1.0)
+    fresh = version(book, "AAPL")
+    assert version(book, "AAPL") == fresh
+
+    # Ticks on other symbols leave it alone
+    book.apply_tick("MSFT", 201.0, 2.0)
+    assert version(book, "AAPL") == fresh
+
+    # The feed stalls: no tick arrives, but AAPL's quote ages past the limit
+    stale = version(book, "AAPL", now=time.time() + STALE_QUOTE_AFTER + 1)
+    assert stale != fresh
+
+    book.apply_tick("AAPL", 101.0, 2.0)
+    assert version(book, "AAPL") not in (fresh, stale)
+
+
+def test_books_holding_the_same_quotes_agree():
+    leader, follower = QuoteBook(), QuoteBook()
+    leader.apply_tick("AAPL", 100.0, 1.0)
+    leader.apply_tick("MSFT", 200.0, 1.0)
+    # The follower has seen other traffic, so its counter differs
+    follower.apply_tick("TSLA", 300.0, 1.0)
+    for quote in leader.quotes():
+        follower.apply_quote(quote)
+
+    now = time.time()
+    assert follower.version != leader.version
+    assert version(follower, "AAPL", "MSFT", now=now) == version(
+        leader, "AAPL", "MSFT", now=now
+    )
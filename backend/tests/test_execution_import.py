@@ -0,0 +1,53 @@
+import sqlite3
+
+import httpx
+from fastapi import FastAPI
+from sqlmodel import func, select
+
+from database.models import ScalePlan, Trade, TradeExecution
+from database.session import get_session
+from domain.execution import execution_router, execution_service
+
+
+async def test_upload_is_spooled_before_the_write_transaction(
+    session, tmp_path, monkeypatch
+):
+    monkeypatch.setattr(execution_service, "IMPORT_CHUNK_SIZE", 2)
+    trade = Trade(symbol="AAPL", setup="breakout", rating=3)
+    trade.scale_plans = [ScalePlan(label="E1", plan_type="entry", qty=10)]
+    session.add(trade)
+    await session.commit()
+
+    app = FastAPI()
+    app.include_router(execution_router.router, prefix="/api/executions")
+    app.dependency_overrides[get_session] = lambda: session
+    writes = []
+
+    async def body():
+        yield b"trade_id,side,qty,price\n"
+        for _ in range(4):
+            yield f"{trade.id},buy,1,100\n".encode()
+        # Another writer, mid-upload, must not find the database locked
+        other = sqlite3.connect(tmp_path / "test.db", timeout=0)
+        try:
+            other.execute("UPDATE trade SET rating = 4")
+            other.commit()
+            writes.append("ok")
+        except sqlite3.OperationalError as e:
+            writes.append(str(e))
+        finally:
+            other.close()
+        yield f"{trade.id},buy,1,100\n".encode()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        response = await c.post(
+            "/api/executions/import",
+            content=body(),
+            headers={"Content-Type": "text/csv"},
+        )
+    assert response.status_code == 200, response.text
+    assert response.json()["imported"] == 5
+    assert writes == ["ok"]
+    count = await session.exec(select(func.count()).select_from(TradeExecution))
+    assert count.one() == 5
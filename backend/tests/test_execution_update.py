@@ -0,0 +1,88 @@
+import pytest
+from fastapi import HTTPException
+from pydantic import ValidationError
+
+from database.models import PlanType, ScalePlan, ScalePlanStatus, Trade, TradeStatus
+from domain.execution.execution_repo import ExecutionRepo
+from domain.execution.execution_schema import ExecutionCreate, ExecutionUpdate
+from domain.execution.execution_service import ExecutionService
+from domain.scale_plan.scale_plan_repo import ScalePlanRepo
+from domain.trade.trade_repo import TradeRepo
+
+
+@pytest.fixture
+async def entry(session) -> ScalePlan:
+    trade = Trade(symbol="AAPL", setup="breakout", rating=3)
+    entry = ScalePlan(label="E1", plan_type=PlanType.ENTRY, qty=10, limit_price=100)
+    trade.scale_plans = [entry]
+    session.add(trade)
+    await session.commit()
+    return entry
+
+
+@pytest.fixture
+def service(session, monkeypatch) -> ExecutionService:
+    commits = []
+    commit = session.commit
+    monkeypatch.setattr(session, "commit", lambda: commits.append(1) or commit())
+    service = ExecutionService(
+        ExecutionRepo(session), ScalePlanRepo(session), TradeRepo(session)
+    )
+    service.commits = commits
+    return service
+
+
+async def fill(service: ExecutionService, entry: ScalePlan, qty: int):
+    return await service.create_execution(
+        ExecutionCreate(
+            qty=qty,
+            price=100,
+            side="buy",
+            source="MANUAL",
+            trade_id=entry.trade_id,
+            scale_plan_id=entry.id,
+        )
+    )
+
+
+async def test_update_re_derives_plan_status(session, entry, service):
+    execution = await fill(service, entry, 4)
+    assert entry.status == ScalePlanStatus.FILLED_PARTIAL
+
+    await service.update_execution(execution.id, ExecutionUpdate(qty=10))
+    assert (entry.filled_qty, entry.status) == (10, ScalePlanStatus.FILLED)
+    trade = await session.get(Trade, entry.trade_id)
+    assert trade.status == TradeStatus.OPEN
+
+    # Qty, status and position move back together, in one commit
+    service.commits.clear()
+    await service.update_execution(execution.id, ExecutionUpdate(qty=6))
+    assert service.commits == [1]
+    await session.refresh(entry)
+    assert (entry.filled_qty, entry.status) == (6, ScalePlanStatus.FILLED_PARTIAL)
+
+
+async def test_delete_re_derives_plan_status_in_one_commit(entry, service):
+    execution = await fill(service, entry, 4)
+    service.commits.clear()
+    await service.delete_execution(execution.id)
+    assert service.commits == [1]
+    assert (entry.filled_qty, entry.status) == (0, ScalePlanStatus.PLANNED)
+
+
+async def test_unknown_execution_is_not_found(service):
+    for call in (
+        service.get_execution_by_id("missing"),
+        service.update_execution("missing", ExecutionUpdate(qty=1)),
+        service.delete_execution("missing"),
+    ):
+        with pytest.raises(HTTPException) as error:
+            await call
+        assert error.value.status_code == 404
+
+
+def test_update_rejects_null_and_non_positive_amounts():
+    assert ExecutionUpdate(notes="x").model_dump(exclude_unset=True) == {"notes": "x"}
+    for payload in ({"qty": None}, {"price": None}, {"qty": 0}, {"side": None}):
+        with pytest.raises(ValidationError):
+            ExecutionUpdate.model_validate(payload)
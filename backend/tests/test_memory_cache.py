@@ -0,0 +1,94 @@
+import itertools
+
+import pytest
+
+from core.cache import memory_backend
+from core.cache.memory_backend import ENTRY_OVERHEAD, BoundedMemoryBackend
+
+ENTRY = 1000
+
+
+@pytest.fixture(autouse=True)
+def clock(monkeypatch):
+    """A monotonic clock that moves on by a second per reading."""
+    ticks = itertools.count(1000)
+    monkeypatch.setattr(memory_backend.time, "monotonic", lambda: next(ticks))
+
+
+async def put(cache: BoundedMemoryBackend, key: str, size: int = ENTRY, **kwargs):
+    """Store an entry that costs `size` bytes of the budget."""
+    await cache.set(key, b"x" * (size - len(key) - ENTRY_OVERHEAD), **kwargs)
+
+
+async def kept(cache: BoundedMemoryBackend, *keys: str) -> list[str]:
+    return [key for key in keys if await cache.get(key) is not None]
+
+
+async def test_lru_evicts_the_least_recently_used_over_quota():
+    cache = BoundedMemoryBackend(10 * ENTRY, quotas={"a": 3 * ENTRY})
+    for key in ("a:1", "a:2", "a:3"):
+        await put(cache, key)
+    await cache.get("a:1")
+    await put(cache, "a:4")
+
+    stats = cache.snapshot()["namespaces"]["a"]
+    assert (stats["bytes"], stats["evictions"]) == (3 * ENTRY, 1)
+    assert await kept(cache, "a:1", "a:2", "a:3", "a:4") == ["a:1", "a:3", "a:4"]
+
+
+async def test_lfu_evicts_the_least_used_over_quota():
+    cache = BoundedMemoryBackend(10 * ENTRY, quotas={"a": 3 * ENTRY}, policy="lfu")
+    for key in ("a:1", "a:2", "a:3"):
+        await put(cache, key)
+    for key in ("a:1", "a:1", "a:2", "a:3", "a:3"):
+        await cache.get(key)
+    # a:2 was used most recently, but least often
+    await put(cache, "a:4")
+    assert cache.snapshot()["namespaces"]["a"]["evictions"] == 1
+    assert await kept(cache, "a:1", "a:2", "a:3", "a:4") == ["a:1", "a:3", "a:4"]
+
+    # The entry just stored is never the one evicted to make room for it
+    await put(cache, "a:5")
+    assert await kept(cache, "a:4", "a:5") == ["a:5"]
+
+
+async def test_expired_entries_go_first_and_count_as_expired():
+    cache = BoundedMemoryBackend(10 * ENTRY, quotas={"a": 2 * ENTRY}, policy="lfu")
+    await put(cache, "a:1")
+    await cache.get("a:1")
+    await put(cache, "a:2", expire=1)
+    await put(cache, "a:3")
+
+    stats = cache.snapshot()["namespaces"]["a"]
+    assert (stats["expired"], stats["evictions"]) == (1, 0)
+    assert await kept(cache, "a:1", "a:3") == ["a:1", "a:3"]
+
+
+@pytest.mark.parametrize("policy", ["lru", "lfu"])
+async def test_global_budget_evicts_from_the_stalest_namespace(policy):
+    cache = BoundedMemoryBackend(3 * ENTRY, policy=policy)
+    await put(cache, "a:1")
+    await put(cache, "b:1")
+    await put(cache, "a:2")
+    await cache.get("a:1")
+    await put(cache, "b:2")
+
+    snapshot = cache.snapshot()
+    assert snapshot["bytes"] == 3 * ENTRY
+    assert snapshot["namespaces"]["b"]["evictions"] == 1
+    assert snapshot["namespaces"]["a"]["evictions"] == 0
+    assert await kept(cache, "a:1", "a:2", "b:1", "b:2") == ["a:1", "a:2", "b:2"]
+
+
+async def test_oversize_entries_are_rejected():
+    cache = BoundedMemoryBackend(3 * ENTRY, quotas={"a": ENTRY})
+    await put(cache, "a:1")
+    await put(cache, "a:big", 2 * ENTRY)
+    await put(cache, "b:big", 4 * ENTRY)
+
+    snapshot = cache.snapshot()
+    assert snapshot["namespaces"]["a"]["rejected"] == 1
+    assert snapshot["namespaces"]["b"]["rejected"] == 1
+    assert snapshot["evictions"] == 0
+    assert snapshot["bytes"] == ENTRY
+    assert await kept(cache, "a:1", "a:big", "b:big") == ["a:1"]
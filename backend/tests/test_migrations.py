@@ -0,0 +1,68 @@
+import asyncio
+import sqlite3
+from argparse import Namespace
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy.orm import sessionmaker
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from database.db import make_engine
+from domain.execution.execution_aggregates import repair_aggregates
+from tests.query_plans import ALEMBIC_INI
+
+BEFORE_AGGREGATES = "b7d3e9a05c14"
+
+
+def upgrade(path: str, revision: str = "head") -> None:
+    config = Config(ALEMBIC_INI, cmd_opts=Namespace(x=[f"url=sqlite:///{path}"]))
+    command.upgrade(config, revision)
+
+
+async def drift(path: str) -> dict:
+    engine = make_engine(f"sqlite+aiosqlite:///{path}")
+    try:
+        factory = sessionmaker(engine, class_=AsyncSession)
+        async with factory() as session:
+            return await repair_aggregates(session, write=False)
+    finally:
+        await engine.dispose()
+
+
+def test_position_aggregates_are_filled_in_from_existing_executions(tmp_path):
+    path = str(tmp_path / "upgrade.db")
+    upgrade(path, BEFORE_AGGREGATES)
+    with sqlite3.connect(path) as db:
+        db.execute(
+            "INSERT INTO trade (id, symbol, setup, rating, status, idea_date)"
+            " VALUES ('t1', 'AAPL', 'breakout', 3, 'OPEN', '2025-01-02 14:00:00')"
+        )
+        db.execute(
+            "INSERT INTO scale_plan (id, trade_id, status, order_type, trade_type,"
+            " plan_type, label, qty, notes) VALUES ('p1', 't1', 'FILLED',"
+            " 'LIMIT', 'LONG', 'ENTRY', 'E1', 20, '')"
+        )
+        # Inserted out of fill order; the sell comes last
+        db.executemany(
+            "INSERT INTO trade_execution (id, trade_id, scale_plan_id, side, source,"
+            " commission, executed_at, qty, price, notes)"
+            " VALUES (?, 't1', ?, ?, 'MANUAL', ?, ?, ?, ?, '')",
+            [
+                ("e3", None, "SELL", 1.0, "2025-01-02 16:00:00", 5, 120.0),
+                ("e2", "p1", "BUY", 0.0, "2025-01-02 15:00:00", 10, 110.0),
+                ("e1", "p1", "BUY", 0.0, "2025-01-02 14:30:00", 10, 100.0),
+            ],
+        )
+
+    upgrade(path)
+
+    with sqlite3.connect(path) as db:
+        trade = db.execute(
+            "SELECT net_qty, avg_entry_price, realized_pnl, last_executed_at"
+            " FROM trade WHERE id = 't1'"
+        ).fetchone()
+        filled = db.execute("SELECT filled_qty FROM scale_plan").fetchone()
+    assert trade[:3] == (15, 105, 5 * 15 - 1)
+    assert trade[3].startswith("2025-01-02 16:00:00")
+    assert filled == (20,)
+    assert asyncio.run(drift(path)) == {"scale_plans": 0, "trades": 0}
@@ -0,0 +1,31 @@
+import asyncio
+from argparse import Namespace
+
+import pytest
+
+from tests.query_plans import migrate, problems, run
+
+# Enough rows for ANALYZE to favour the indexes the reads are meant to use
+TRADES = 500
+
+
+@pytest.fixture(scope="module")
+def report(tmp_path_factory) -> dict:
+    path = str(tmp_path_factory.mktemp("plans") / "plans.db")
+    # Alembic's env.py runs its own event loop, so migrate first
+    migrate(path)
+    return asyncio.run(run(Namespace(trades=TRADES, verbose=False), path))
+
+
+def test_every_repository_read_searches_an_index(report):
+    assert report["queries"] >= 24
+    assert report["failed"] == [], report["plans"]
+
+
+def test_scans_and_temp_sorts_are_flagged():
+    assert problems("annotations.by_type", ["SCAN annotation"]) == ["SCAN annotation"]
+    assert problems("annotations.all", ["SCAN annotation"]) == []
+    assert problems(
+        "trades.by_id",
+        ["SEARCH trade USING INDEX ix_trade (id=?)", "USE TEMP B-TREE FOR ORDER BY"],
+    ) == ["USE TEMP B-TREE FOR ORDER BY"]
@@ -0,0 +1,67 @@
+from core.cache.version_store import LocalVersionStore
+from core.stock_price.quote_book import QuoteBook
+from core.stock_price.quote_share import QuoteShare
+
+
+class Calls:
+    def __init__(self):
+        self.resyncs = 0
+        self.viewed: list[str] = []
+
+    def symbols_changed(self):
+        self.resyncs += 1
+
+    def mark_viewed(self, symbols):
+        self.viewed.extend(symbols)
+
+
+def book_with(*symbols: str) -> QuoteBook:
+    book = QuoteBook()
+    for symbol in symbols:
+        book.apply_tick(symbol, 100.0, 1.0)
+    return book
+
+
+def share(book: QuoteBook, store, calls: Calls, leader: bool) -> QuoteShare:
+    share = QuoteShare(
+        book,
+        lambda: leader,
+        None,
+        store,
+        calls.symbols_changed,
+        calls.mark_viewed,
+    )
+    share.leader = leader
+    return share
+
+
+async def test_followers_pass_changes_on_to_the_leader():
+    store = LocalVersionStore()
+    calls = Calls()
+    leader = share(book_with("AAPL", "MSFT"), store, calls, leader=True)
+    follower = share(book_with("AAPL", "MSFT"), store, Calls(), leader=False)
+    await leader.receive()
+
+    follower.symbols_changed()
+    follower.mark_viewed(["msft", "NOTHELD"])
+    await follower.forward()
+    await leader.receive()
+    assert calls.resyncs == 1
+    assert calls.viewed == ["MSFT"]
+
+    # Nothing new to pass on
+    await follower.forward()
+    await leader.receive()
+    assert (calls.resyncs, calls.viewed) == (1, ["MSFT"])
+    assert follower.forwarded == leader.received == 2
+
+
+async def test_the_leader_keeps_its_own_changes_local():
+    store = LocalVersionStore()
+    calls = Calls()
+    leader = share(book_with("AAPL"), store, calls, leader=True)
+    leader.symbols_changed()
+    leader.mark_viewed(["AAPL"])
+    await leader.forward()
+    assert leader.forwarded == 0
+    assert await store.get(["quotes:symbols"]) == {"quotes:symbols": 0}
@@ -0,0 +1,124 @@
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from core.stock_price.quote_book import QuoteBook
+from core.stock_price.quote_stream import QuoteStream
+from tests.replay_ws import ReplayServer, load_recording
+
+RECORDING = os.path.join(os.path.dirname(__file__), "fixtures", "ticks.jsonl")
+
+
+async def until(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            raise AssertionError("condition not met in time")
+        await asyncio.sleep(0.01)
+
+
+@pytest.fixture
+async def server():
+    server = ReplayServer(load_recording(RECORDING), speed=20)
+    server.port = await server.start()
+    yield server
+    await server.close()
+
+
+@pytest.fixture
+def wanted():
+    return {"AAPL"}
+
+
+@pytest.fixture
+async def stream(server, wanted):
+    book = QuoteBook()
+    seeded = []
+
+    async def symbols():
+        return set(wanted)
+
+    async def load_snapshots(symbols):
+        seeded.append(symbols)
+
+    stream = QuoteStream(
+        f"ws://127.0.0.1:{server.port}",
+        book,
+        symbols,
+        load_snapshots,
+        reconnect_delay=0.05,
+        resync_debounce=0.01,
+    )
+    stream.seeded = seeded
+    stream.start()
+    yield stream
+    await stream.stop()
+
+
+def test_recording_keeps_only_trades_in_time_order():
+    ticks = load_recording(RECORDING)
+    assert len(ticks) == 20
+    assert [tick["t"] for tick in ticks] == sorted(tick["t"] for tick in ticks)
+
+
+async def test_ticks_update_the_book(server, stream):
+    book = stream.book
+    await until(lambda: book.get("AAPL") is not None)
+    assert server.subscribed == {"AAPL"}
+    assert stream.seeded == [["AAPL"]]
+
+    quote = book.get("AAPL")
+    assert 150 <= quote.current_price <= 150.09
+    assert quote.low <= quote.current_price <= quote.high
+    # Replayed timestamps are rebased onto the wall clock
+    assert quote.timestamp >= time.time() - 5
+    assert book.get("MSFT") is None
+
+
+async def test_resync_follows_the_wanted_symbols(server, stream, wanted):
+    await until(lambda: server.subscribed == {"AAPL"})
+    wanted.clear()
+    wanted.add("MSFT")
+    stream.request_resync()
+
+    await until(lambda: stream.book.get("MSFT") is not None)
+    assert server.subscribed == {"MSFT"}
+    assert stream.subscribed == {"MSFT"}
+    assert stream.seeded == [["AAPL"], ["MSFT"]]
+
+
+async def test_reconnects_and_resubscribes_after_a_drop(server, stream, wanted):
+    wanted.add("MSFT")
+    await until(lambda: server.subscribed == {"AAPL", "MSFT"})
+
+    await server.drop_clients()
+    await until(lambda: server.connections == 2)
+    await until(lambda: server.subscribed == {"AAPL", "MSFT"})
+    assert stream.connected
+
+    # Every symbol is seeded again on the new connection, and ticks resume
+    assert stream.seeded[-1] == ["AAPL", "MSFT"]
+    version = stream.book.version
+    await until(lambda: stream.book.version > version)
+
+
+def test_batches_collapse_to_the_latest_tick_per_symbol():
+    book = QuoteBook()
+    stream = QuoteStream("ws://unused", book, symbol_source=None)
+    data = [
+        {"s": "AAPL", "p": 101.0, "t": 2000},
+        {"s": "AAPL", "p": 102.0, "t": 3000},
+        {"s": "MSFT", "p": 400.0, "t": 3000},
+    ]
+    stream.handle_message(json.dumps({"type": "trade", "data": data}))
+    stream.handle_message(json.dumps({"type": "ping"}))
+
+    assert stream.ticks == 2
+    assert book.get("AAPL").current_price == 102.0
+    # An older tick arriving late does not move the price back
+    old = [{"s": "AAPL", "p": 99.0, "t": 1000}]
+    stream.handle_message(json.dumps({"type": "trade", "data": old}))
+    assert book.get("AAPL").current_price == 102.0
@@ -0,0 +1,63 @@
+import time
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from core.stock_price.quote_book import STALE_QUOTE_AFTER, QuoteBook
+from core.stock_price.quote_refresher import QuoteRefresher
+from domain.quote import quote_router
+
+
+@pytest.fixture
+def book(monkeypatch) -> QuoteBook:
+    book = QuoteBook()
+    monkeypatch.setattr(quote_router, "quote_book", book)
+    return book
+
+
+@pytest.fixture
+async def client():
+    app = FastAPI()
+    app.include_router(quote_router.router, prefix="/api/quotes")
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+async def test_quotes_etag_changes_when_the_feed_stalls(book, client):
+    book.apply_tick("AAPL", 100.0, 1.0)
+    first = await client.get("/api/quotes", params={"symbols": "AAPL"})
+    assert first.json()[0]["stale"] is False
+    tag = first.headers["etag"]
+
+    again = await client.get(
+        "/api/quotes", params={"symbols": "AAPL"}, headers={"If-None-Match": tag}
+    )
+    assert again.status_code == 304
+
+    book._updated_at[0] = time.time() - STALE_QUOTE_AFTER - 1
+    stalled = await client.get(
+        "/api/quotes", params={"symbols": "AAPL"}, headers={"If-None-Match": tag}
+    )
+    assert stalled.status_code == 200
+    assert stalled.json()[0]["stale"] is True
+
+
+async def test_quotes_etag_ignores_other_symbols(book, client):
+    book.apply_tick("AAPL", 100.0, 1.0)
+    first = await client.get("/api/quotes", params={"symbols": "AAPL"})
+    book.apply_tick("MSFT", 200.0, 1.0)
+    again = await client.get(
+        "/api/quotes",
+        params={"symbols": "AAPL"},
+        headers={"If-None-Match": first.headers["etag"]},
+    )
+    assert again.status_code == 304
+
+
+def test_only_active_symbols_are_marked_viewed():
+    refresher = QuoteRefresher(QuoteBook(), symbol_source=None, provider=None)
+    refresher.symbols = {"AAPL", "MSFT"}
+    refresher.mark_viewed(["aapl", *(f"JUNK{i}" for i in range(200))])
+    assert set(refresher._viewed) == {"AAPL"}
@@ -0,0 +1,112 @@
+import asyncio
+
+import httpx
+import pytest
+
+from core.stock_price.market_data_client import MarketDataClient
+from core.stock_price.rate_scheduler import Priority, RateScheduler
+from tests.fake_finnhub import create_app
+
+BASE_URL = "http://finnhub.test"
+
+
+def client_for(app, scheduler: RateScheduler) -> MarketDataClient:
+    return MarketDataClient(
+        scheduler=scheduler, transport=httpx.ASGITransport(app=app)
+    )
+
+
+async def quote(client: MarketDataClient, symbol: str, priority: Priority):
+    return await client.get(
+        f"{BASE_URL}/quote", params={"symbol": symbol}, priority=priority
+    )
+
+
+async def test_burst_is_served_without_waiting():
+    scheduler = RateScheduler(calls_per_minute=60, burst=3)
+    for _ in range(3):
+        await asyncio.wait_for(scheduler.acquire(Priority.BULK), 0.05)
+    assert not scheduler.try_acquire(Priority.BULK)
+    assert scheduler.snapshot()["priorities"]["bulk"]["granted"] == 3
+
+
+async def test_interactive_calls_overtake_queued_bulk_calls():
+    app = create_app(calls=100)
+    # One token, refilled every 20ms, so everything after the first queues
+    client = client_for(app, RateScheduler(calls_per_minute=3000, burst=1))
+    try:
+        bulk = [
+            asyncio.create_task(quote(client, f"BULK{i}", Priority.BULK))
+            for i in range(5)
+        ]
+        await asyncio.sleep(0)
+        assert client.scheduler.queue_depth == 4
+        interactive = asyncio.create_task(quote(client, "LIVE", Priority.INTERACTIVE))
+        responses = await asyncio.gather(*bulk, interactive)
+    finally:
+        await client.aclose()
+
+    assert all(response.status_code == 200 for response in responses)
+    # BULK0 took the free token; LIVE jumps the four still waiting
+    assert app.state.quota.served[:2] == ["BULK0", "LIVE"]
+    stats = client.scheduler.snapshot()
+    assert stats["queue_depth"] == 0
+    assert stats["priorities"]["interactive"]["granted"] == 1
+    assert stats["priorities"]["bulk"]["granted"] == 5
+    assert (
+        stats["priorities"]["interactive"]["max_wait"]
+        < stats["priorities"]["bulk"]["max_wait"]
+    )
+
+
+async def test_429_penalizes_the_bucket_and_retries_after_retry_after():
+    # The upstream allows 3 calls a second; the scheduler believes in 600/min
+    app = create_app(calls=3, window=1.0)
+    client = client_for(app, RateScheduler(calls_per_minute=600, burst=5))
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    try:
+        responses = await asyncio.gather(
+            *(quote(client, f"SYM{i}", Priority.BULK) for i in range(5))
+        )
+    finally:
+        await client.aclose()
+
+    assert [response.status_code for response in responses] == [200] * 5
+    # Each rejection was penalized once and retried once
+    assert app.state.quota.rejected >= 1
+    assert client.scheduler.throttled == app.state.quota.rejected
+    assert len(app.state.quota.served) == 5
+    # The retries waited out the fake's Retry-After of one second
+    assert loop.time() - started >= 1.0
+
+
+async def test_second_429_is_returned_to_the_caller(monkeypatch):
+    app = create_app(calls=1, window=60.0)
+    scheduler = RateScheduler(calls_per_minute=600, burst=5)
+    # Retry-After is a minute away; back off briefly instead
+    penalize = scheduler.penalize
+    monkeypatch.setattr(scheduler, "penalize", lambda retry_after=None: penalize(0.01))
+    client = client_for(app, scheduler)
+    try:
+        assert (await quote(client, "AAPL", Priority.BULK)).status_code == 200
+        response = await quote(client, "MSFT", Priority.BULK)
+    finally:
+        await client.aclose()
+
+    assert response.status_code == 429
+    assert app.state.quota.rejected == 2
+
+
+@pytest.mark.parametrize("priority", list(Priority))
+async def test_cancelled_waiters_do_not_consume_tokens(priority):
+    scheduler = RateScheduler(calls_per_minute=600, burst=1)
+    await scheduler.acquire(priority)
+    waiter = asyncio.create_task(scheduler.acquire(priority))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+    assert scheduler.queue_depth == 0
+    await asyncio.wait_for(scheduler.acquire(priority), 0.5)
+    assert scheduler.snapshot()["priorities"][priority.name.lower()]["granted"] == 2
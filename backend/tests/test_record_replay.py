@@ -0,0 +1,36 @@
+import asyncio
+import json
+
+from core.stock_price.finnhub_schema import StockQuote
+from core.stock_price.record_replay_provider import RecordReplayProvider
+
+
+class Upstream:
+    async def get_stock_price(self, symbol: str) -> StockQuote:
+        return StockQuote(s=symbol, c=10, d=0, dp=0, h=11, l=9, o=10, pc=10, t=1)
+
+
+async def test_recordings_are_buffered_and_flushed_once(tmp_path, monkeypatch):
+    recorder = RecordReplayProvider(str(tmp_path), Upstream(), flush_delay=0.01)
+    writes = []
+    write = recorder._write
+    monkeypatch.setattr(
+        recorder, "_write", lambda kind, data: writes.append(kind) or write(kind, data)
+    )
+
+    symbols = [f"SYM{i}" for i in range(20)]
+    quotes = await recorder.get_stock_price_batch(symbols)
+    assert len(quotes) == 20
+    # Nothing is written on the event loop while the batch is answered
+    assert writes == []
+    await asyncio.sleep(0.05)
+    assert writes == ["quotes"]
+
+    await recorder.get_stock_price("LAST")
+    await recorder.close()
+    assert writes == ["quotes", "quotes"]
+    saved = json.loads((tmp_path / "quotes.json").read_text())
+    assert set(saved) == {*symbols, "LAST"}
+
+    replay = RecordReplayProvider(str(tmp_path))
+    assert (await replay.get_stock_price("SYM3")).symbol == "SYM3"
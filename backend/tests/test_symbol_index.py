@@ -0,0 +1,129 @@
+import asyncio
+import os
+from pathlib import Path
+
+import pytest
+
+from core.stock_price.symbol_index import (
+    SymbolEntry,
+    SymbolIndex,
+    SymbolIndexRefresher,
+)
+from domain.trade.trade_service import TradeService
+
+FIXTURE = Path(__file__).parent / "fixtures" / "symbols.tsv.gz"
+
+
+@pytest.fixture
+def index() -> SymbolIndex:
+    index = SymbolIndex()
+    assert index.load(str(FIXTURE))
+    return index
+
+
+def symbols(index: SymbolIndex, query: str, limit: int = 10) -> list[str]:
+    return [entry.symbol for entry in index.search(query, limit)]
+
+
+def test_load_reads_the_gzipped_snapshot(index):
+    assert len(index) == 10
+    assert index.ready
+    assert "msft" in index
+    assert "MSFX" not in index
+
+
+def test_ticker_prefix_matches_come_first(index):
+    assert symbols(index, "am") == ["AMD", "AMSC", "AMZN"]
+    assert symbols(index, "AMZN") == ["AMZN"]
+    assert symbols(index, "a", limit=2) == ["AAPL", "AMD"]
+
+
+def test_company_name_words_match_after_tickers(index):
+    assert symbols(index, "micro") == ["AMD", "MSFT"]
+    assert symbols(index, "trust") == ["QQQ", "SPY"]
+    # Ticker prefixes first, then words from the description
+    assert symbols(index, "ama") == ["AMZN"]
+    # SPY by ticker, then SERIES and SUPERCONDUCTOR in word order
+    assert symbols(index, "s") == ["SPY", "QQQ", "AMSC"]
+
+
+def test_misspelled_tickers_fall_back_to_close_matches(index):
+    assert symbols(index, "MSFY") == ["MSFT"]
+    assert symbols(index, "APPL") == ["AAPL"]
+    assert symbols(index, "XYZW") == []
+
+
+def test_save_round_trips(index, tmp_path):
+    path = str(tmp_path / "symbols.tsv.gz")
+    index.save(path)
+    reloaded = SymbolIndex()
+    assert reloaded.load(path)
+    assert reloaded.search("a") == index.search("a")
+
+
+class FakeMarketData:
+    def __init__(self, known: set[str]):
+        self.known = known
+        self.lookups: list[str] = []
+
+    async def get_company_profile(self, symbol: str):
+        self.lookups.append(symbol)
+        return {"ticker": symbol} if symbol in self.known else None
+
+
+def service_for(market_data) -> TradeService:
+    return TradeService(repo=None, annotation_repo=None, market_data=market_data)
+
+
+async def test_symbol_exists_uses_the_loaded_index(index, monkeypatch):
+    monkeypatch.setattr("domain.trade.trade_service.symbol_index", index)
+    market_data = FakeMarketData(known=set())
+    service = service_for(market_data)
+
+    assert await service._symbol_exists("NVDA")
+    assert not await service._symbol_exists("NOPE")
+    assert market_data.lookups == []
+
+
+async def test_symbol_exists_falls_back_to_profile_lookup(monkeypatch):
+    monkeypatch.setattr("domain.trade.trade_service.symbol_index", SymbolIndex())
+    market_data = FakeMarketData(known={"NVDA"})
+    service = service_for(market_data)
+
+    assert await service._symbol_exists("NVDA")
+    assert not await service._symbol_exists("NOPE")
+    assert market_data.lookups == ["NVDA", "NOPE"]
+
+
+async def test_follower_reloads_the_snapshot_when_it_is_rewritten(index, tmp_path):
+    path = str(tmp_path / "symbols.tsv.gz")
+    follower = SymbolIndexRefresher(SymbolIndex(), fetch=None, path=path)
+    # First boot: no snapshot yet, so nothing to load
+    assert not await follower.reload_if_changed()
+    assert not follower.index.ready
+
+    index.save(path)
+    assert await follower.reload_if_changed()
+    assert len(follower.index) == 10
+    assert not await follower.reload_if_changed()
+
+    index.replace([SymbolEntry("IBM", "INTL BUSINESS MACHINES", "Common Stock")])
+    index.save(path)
+    os.utime(path, (0, follower.index.updated_at + 1))
+    assert await follower.reload_if_changed()
+    assert symbols(follower.index, "ibm") == ["IBM"]
+
+
+async def test_taking_over_refreshes_stops_following(tmp_path):
+    refresher = SymbolIndexRefresher(
+        SymbolIndex(), fetch=None, path=str(tmp_path / "none.tsv.gz"), interval=3600
+    )
+    refresher.start(refresh=False)
+    following = refresher._task
+    assert following is not None and not refresher.refreshing
+
+    refresher.start()
+    await asyncio.sleep(0)
+    assert following.cancelled()
+    assert refresher.refreshing
+    await refresher.stop()
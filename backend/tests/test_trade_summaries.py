@@ -0,0 +1,54 @@
+from database.models import PlanType, ScalePlan, ScalePlanStatus, Trade
+from domain.trade.trade_repo import TradeRepo
+from domain.trade.trade_service import TradeService
+
+
+def plan(label: str, plan_type: PlanType, **fields) -> ScalePlan:
+    return ScalePlan(label=label, plan_type=plan_type, qty=10, **fields)
+
+
+async def test_entry_price_and_stop_come_from_one_plan(session):
+    trade = Trade(symbol="AAPL", setup="breakout", rating=3)
+    trade.scale_plans = [
+        plan("E2", PlanType.ENTRY, limit_price=110, stop_price=None),
+        plan("E1", PlanType.ENTRY, limit_price=100, stop_price=90),
+        plan(
+            "E0",
+            PlanType.ENTRY,
+            limit_price=50,
+            stop_price=40,
+            status=ScalePlanStatus.CANCELED,
+        ),
+        plan("T1", PlanType.TARGET, target_price=120),
+    ]
+    session.add(trade)
+    await session.commit()
+
+    [row] = await TradeRepo(session).get_trade_summaries([trade.id])
+    assert (row.entry_price, row.entry_stop) == (100, 90)
+    assert row.entry_qty == 20
+    # The full response picks the same entry plan
+    assert TradeService._calculate_rr_ratio(trade.scale_plans) == 2.0
+
+
+async def test_targets_without_a_price_are_left_out(session):
+    no_stop = Trade(symbol="MSFT", setup="breakout", rating=3)
+    no_stop.scale_plans = [
+        plan("E1", PlanType.ENTRY, limit_price=100, stop_price=None),
+        plan("T1", PlanType.TARGET, target_price=None),
+    ]
+    priced = Trade(symbol="NVDA", setup="breakout", rating=3)
+    priced.scale_plans = [
+        plan("E1", PlanType.ENTRY, limit_price=100, stop_price=90),
+        plan("T1", PlanType.TARGET, target_price=None),
+        plan("T2", PlanType.TARGET, target_price=130),
+    ]
+    session.add_all([no_stop, priced])
+    await session.commit()
+
+    assert TradeService._calculate_rr_ratio(no_stop.scale_plans) == 0.0
+    assert TradeService._calculate_rr_ratio(priced.scale_plans) == 3.0
+    rows = await TradeRepo(session).get_trade_summaries([no_stop.id, priced.id])
+    summaries = {row.id: row for row in rows}
+    assert summaries[priced.id].target_value / summaries[priced.id].target_qty == 130
+    assert summaries[no_stop.id].target_qty is None
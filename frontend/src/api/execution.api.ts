@@ -20,3 +20,9 @@ export const deleteExecution = (id: string) => apiClient.delete(`${EXECUTION_API
 
 export const deleteExecutions = (ids: string[]) =>
   apiClient.delete(`${EXECUTION_API_URL}/batch`, { data: { execution_ids: ids } })
+
+export const importExecutions = (file: File, skipInvalid = false) =>
+  apiClient.post(`${EXECUTION_API_URL}/import`, file, {
+    params: { skipInvalid },
+    headers: { 'Content-Type': file.type || 'text/csv' },
+  })
@@ -1,3 +1,4 @@
 export * from './client'
 export * from './scale-plan.api'
 export * from './execution.api'
+export * from './quote.api'
@@ -0,0 +1,15 @@
+import { apiClient } from './client'
+import type { Quote } from '@/interfaces'
+
+const QUOTE_API_URL = '/quotes'
+// Longer lists go in a POST body to stay clear of URL length limits
+const MAX_GET_SYMBOLS = 50
+
+export const getQuotes = (symbols: string[]) => {
+  if (symbols.length > MAX_GET_SYMBOLS) {
+    return apiClient.post<Quote[]>(QUOTE_API_URL, { symbols })
+  }
+  return apiClient.get<Quote[]>(QUOTE_API_URL, {
+    params: { symbols: symbols.join(',') },
+  })
+}
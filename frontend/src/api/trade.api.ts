@@ -1,10 +1,21 @@
-import { apiClient } from './client'
+import axiosInstance, { apiClient } from './client'
 import type { Trade, TradeCreate, TradeUpdate } from '@/interfaces/trade.type.ts'
 
 const TRADE_API_URL = '/trades'
-
-export const getTrades = () => {
-  return apiClient.get<Trade[]>(TRADE_API_URL)
+const TRADE_PAGE_SIZE = 200
+
+export const getTrades = async () => {
+  // The list is paginated; follow X-Next-Cursor until the last page
+  const trades: Trade[] = []
+  let cursor: string | undefined
+  do {
+    const response = await axiosInstance.get<Trade[]>(TRADE_API_URL, {
+      params: { cursor, limit: TRADE_PAGE_SIZE },
+    })
+    trades.push(...response.data)
+    cursor = response.headers['x-next-cursor']
+  } while (cursor)
+  return trades
 }
 
 export const createTrade = (data: TradeCreate) => {
@@ -7,3 +7,4 @@ export * from './useMediaQuery.ts'
 export * from './useTradeMetrics.ts'
 export * from './useTradeService.ts'
 export * from './useTradeActions.ts'
+export * from './useQuoteService.ts'
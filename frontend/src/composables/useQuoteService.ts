@@ -0,0 +1,36 @@
+import type { MaybeRefOrGetter } from 'vue'
+import { useQuery } from '@tanstack/vue-query'
+import { getQuotes } from '@/api/quote.api.ts'
+import type { Quote } from '@/interfaces'
+
+const QUOTE_POLL_INTERVAL = 5000
+
+export const quoteKeys = {
+  all: ['quotes'] as const,
+  list: (symbols: string[]) => [...quoteKeys.all, symbols] as const,
+}
+
+/**
+ * Polls live prices for `symbols` without reloading trades, whose structure
+ * changes rarely and is fetched separately.
+ */
+export const useLiveQuotes = (symbols: MaybeRefOrGetter<string[]>) => {
+  const sortedSymbols = computed(() => [...new Set(toValue(symbols))].sort())
+
+  const quotesQuery = useQuery({
+    queryKey: computed(() => quoteKeys.list(sortedSymbols.value)),
+    queryFn: () => getQuotes(sortedSymbols.value),
+    enabled: computed(() => sortedSymbols.value.length > 0),
+    refetchInterval: QUOTE_POLL_INTERVAL,
+    staleTime: QUOTE_POLL_INTERVAL,
+  })
+
+  const quotesBySymbol = computed(
+    () =>
+      new Map<string, Quote>(
+        (quotesQuery.data.value ?? []).map((quote) => [quote.symbol, quote]),
+      ),
+  )
+
+  return { quotesBySymbol, quotesQuery }
+}
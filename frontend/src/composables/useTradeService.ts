@@ -9,9 +9,10 @@ import {
 import { useMutation, useQuery, useQueryClient } from '@tanstack/vue-query'
 import { toast } from 'vue-sonner'
 import { AxiosError } from 'axios'
-import type { crudType, TradeCreate, TradeUpdate } from '@/interfaces'
+import type { crudType, Quote, Trade, TradeCreate, TradeUpdate } from '@/interfaces'
 import { handleErrorDisplay } from '@/api/api-error.util.ts'
 import { TradeStatusEnum } from '@/enums/trade.enum.ts'
+import { useLiveQuotes } from '@/composables/useQuoteService.ts'
 
 export const liveTradeKeys = {
   all: ['trades'] as const,
@@ -19,6 +20,18 @@ export const liveTradeKeys = {
   detail: (id: string) => [...liveTradeKeys.all, 'detail', id] as const,
 }
 
+const withQuote = (trade: Trade, quote: Quote | undefined): Trade =>
+  quote
+    ? {
+        ...trade,
+        currentPrice: quote.currentPrice,
+        priceChange: quote.change ?? trade.priceChange,
+        percentChange: quote.percentChange ?? trade.percentChange,
+        openPrice: quote.openPrice ?? trade.openPrice,
+        previousClose: quote.previousClose ?? trade.previousClose,
+      }
+    : trade
+
 export const useTradeFetchingService = () => {
   const tradesQuery = useQuery({
     queryKey: liveTradeKeys.list(),
@@ -27,14 +40,32 @@ export const useTradeFetchingService = () => {
     refetchOnWindowFocus: true,
   })
 
-  const liveTrades = computed(
-    () => tradesQuery.data.value?.filter((trade) => trade.status === 'open') ?? [],
+  const activeTrades = computed(
+    () =>
+      tradesQuery.data.value?.filter(
+        (trade) =>
+          trade.status === TradeStatusEnum.enum.OPEN ||
+          trade.status === TradeStatusEnum.enum.WATCHING,
+      ) ?? [],
   )
 
-  const watchlist = computed(
-    () =>
-      tradesQuery.data.value?.filter((trade) => trade.status === TradeStatusEnum.enum.WATCHING) ??
-      [],
+  // Prices are polled on their own; the trades themselves change rarely
+  const { quotesBySymbol } = useLiveQuotes(() =>
+    activeTrades.value.map((trade) => trade.symbol.toUpperCase()),
+  )
+
+  const pricedTrades = computed(() =>
+    activeTrades.value.map((trade) =>
+      withQuote(trade, quotesBySymbol.value.get(trade.symbol.toUpperCase())),
+    ),
+  )
+
+  const liveTrades = computed(() =>
+    pricedTrades.value.filter((trade) => trade.status === TradeStatusEnum.enum.OPEN),
+  )
+
+  const watchlist = computed(() =>
+    pricedTrades.value.filter((trade) => trade.status === TradeStatusEnum.enum.WATCHING),
   )
 
   return {
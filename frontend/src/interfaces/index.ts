@@ -3,3 +3,4 @@ export * from './annotation.type'
 export * from './scale-plan.type'
 export * from './execution.type'
 export * from './shared.type'
+export * from './quote.type'
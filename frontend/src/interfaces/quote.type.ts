@@ -0,0 +1,13 @@
+export interface Quote {
+  symbol: string
+  currentPrice: number
+  change: number | null
+  percentChange: number | null
+  high: number | null
+  low: number | null
+  openPrice: number | null
+  previousClose: number | null
+  timestamp: number
+  asOf: string
+  stale: boolean
+}
@@ -23,6 +23,7 @@ export const ScalePlanSchema = z.object({
   limitPrice: z.number().optional(),
   executions: z.array(ExecutionSchema),
   tradeType: ScaleTradeTypeEnum,
+  filledQty: z.number().optional(),
 })
 
 export const ScalePlanCreateSchema = ScalePlanSchema.omit({
@@ -30,10 +31,12 @@ export const ScalePlanCreateSchema = ScalePlanSchema.omit({
   status: true,
   tradeId: true,
   executions: true,
+  filledQty: true,
 })
 
 export const ScalePlanUpdateSchema = ScalePlanSchema.omit({
   id: true,
   tradeId: true,
   executions: true,
+  filledQty: true,
 }).partial()
@@ -62,6 +62,10 @@ export const TradeSchema = tradeCreateSchema.extend({
   industry: z.string().optional(),
   name: z.string().optional(),
   cap: z.number().optional(),
+  // Position from the executions, maintained by the server
+  netQty: z.number().optional(),
+  avgEntryPrice: z.number().nullable().optional(),
+  realizedPnl: z.number().optional(),
 })
 
 export const LiveTradeUpdateSchema = TradeSchema.omit({
@@ -78,4 +82,7 @@ export const LiveTradeUpdateSchema = TradeSchema.omit({
   name: true,
   industry: true,
   logo: true,
+  netQty: true,
+  avgEntryPrice: true,
+  realizedPnl: true,
 }).partial()